@@ -1,63 +1,120 @@
 """
-app/__init__.py — Application‑Factory der “Familia”‑App
-Vollständig, lauffähig, Juli 2025
+app/__init__.py — Application‑Factory der “Familia”‑App
+Vollständig, lauffähig, Juli 2025
 ────────────────────────────────────────────────────────────
 • JSON‑Logging (structlog)                    • Sentry‑Tracing (optional)
-• Babel 4 Locale‑Selector + Jinja‑Globale     • CSP via Flask‑Talisman
+• Babel 4 Locale‑Selector + Jinja‑Globale     • CSP via Flask‑Talisman
 • Flask‑Limiter, Flask‑Caching                • Health‑Endpoint /ping
 • Registriert alle Blueprints (auth, booking, api)
+• ``create_app(minimal=True)`` (oder ``APP_MINIMAL=1``) für CLI & Skripte:
+  nur Config, DB, Cache (Änderungsmarker!) und CLI-Kommandos –
+  Web-Extensions und Blueprints werden dann gar nicht erst importiert.
+  Flask-Migrate/Alembic wird nur unter der ``flask``-CLI geladen.
 """
 
 from __future__ import annotations
 
+import logging
 import os
+import time
 from datetime import datetime
 from importlib import import_module
 
-from flask import Flask, request, session
-from flask_babel import Babel, get_locale
-from flask_caching import Cache
-from flask_limiter import Limiter
-from flask_limiter.util import get_remote_address
-from flask_talisman import Talisman
-import sentry_sdk
-import structlog
-from flask_wtf import CSRFProtect
-from flask_wtf.csrf import generate_csrf
-from app.context import register_context_processors   # NEU
-
-from .models import db, migrate, login_manager           # SQLAlchemy, Alembic, Login
-from .auth.routes import auth_bp
-from .booking.routes import booking_bp
-from .api.routes import api_bp
+import click
+from flask import Flask, abort
+
+from .models import db, login_manager                    # SQLAlchemy, Login
+
+log = logging.getLogger(__name__)
 
 # ─────────────────────────────────────────────────────────────
-#  E X T E N S I O N S
+#  E X T E N S I O N S
 # ─────────────────────────────────────────────────────────────
-babel   = Babel()
-cache   = Cache()
-limiter = Limiter(
-    key_func=get_remote_address,
-    default_limits=["200/day", "50/hour"],
-    storage_uri=os.getenv("RATELIMIT_STORAGE_URL", "memory://"),   # In‑Memory für Dev
-)
-talisman = Talisman(
-    content_security_policy_nonce_in=["script"],   # ▶ fügt Nonce in <script>
-    force_https=True,
-)
+#  (Instanzen liegen in app/extensions.py – hier nur lazy re-exportiert,
+#   damit ``import app`` Limiter/Talisman/Babel nicht mitlädt)
+def __getattr__(name: str):
+    if name in {"assets", "babel", "cache", "compress", "limiter", "migrate", "talisman"}:
+        return getattr(import_module(".extensions", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # ─────────────────────────────────────────────────────────────
-#  F A C T O R Y
+#  F A C T O R Y
 # ─────────────────────────────────────────────────────────────
-def create_app() -> Flask:
+def create_app(minimal: bool | None = None) -> Flask:
+    t0         = time.perf_counter()
     env        = os.getenv("FLASK_ENV", "production")
     config_map = import_module("config").config_map
+    if minimal is None:
+        minimal = os.getenv("APP_MINIMAL") == "1"
 
     app = Flask(__name__)
-    app.config.from_object(config_map[env])
-    register_context_processors(app)  #  NEU
+    app.config.from_object(config_map[env]())      # Instanz → Properties lazy
 
-    # ── Logging (Structlog → JSON) ───────────────────────────
+    # ── Core‑Extensions ──────────────────────────────────────
+    db.init_app(app)
+    if click.get_current_context(silent=True):     # nur unter der flask-CLI (flask db …)
+        from .extensions import migrate
+        migrate.init_app(app, db)
+    _init_cache(app, env)
+    import_module(".auth.identity", __name__)      # Identity-Invalidierung auch in Skripten
+    import_module(".booking.stats", __name__)      # stay_stats bei jedem Booking-Write
+    import_module(".booking.changelog", __name__)  # Sync-Versionen (?since=)
+
+    # ── CLI (flask bookings …) ───────────────────────────────
+    from .booking.cli import bookings_cli
+    app.cli.add_command(bookings_cli)
+
+    if not minimal:
+        _init_web(app)
+
+    log.info("create_app(%s) in %.1f ms",
+             "minimal" if minimal else "full", (time.perf_counter() - t0) * 1000)
+    return app
+
+
+def _init_cache(app: Flask, env: str) -> None:
+    from .extensions import cache
+
+    # ── Caching (Single‑Node → Simple, Prod → Redis) ─────────
+    cache.init_app(
+        app,
+        config={
+            "CACHE_TYPE": "SimpleCache"
+            if env == "development"
+            else "RedisCache",
+            "CACHE_REDIS_URL": os.getenv(
+                "REDIS_URL", "redis://localhost:6379/0"
+            ),
+            "CACHE_DEFAULT_TIMEOUT": 300,
+        },
+    )
+
+
+def _init_web(app: Flask) -> None:
+    """Alles, was nur ein Web-Worker braucht."""
+    from flask import request, session
+    from flask_babel import get_locale
+    from flask_wtf import CSRFProtect
+    from flask_wtf.csrf import generate_csrf
+    import structlog
+
+    from app.context import register_context_processors   # NEU
+    from app.tiered_cache import tiered
+    from .auth.roster import user_roster
+    from .assets import init_assets
+    from .templating import init_templating
+    from .compression import precompress_command, serve_precompressed
+    from .extensions import babel, compress, limiter, talisman
+    from .ratelimit_storage import storage_url
+    from .auth.routes import auth_bp
+    from .booking.routes import booking_bp
+    from .api.routes import api_bp
+
+    register_context_processors(app)  #  NEU
+    init_templating(app)              #  Bytecode-Cache + {% cache %}-Fragmente
+
+    # ── Logging (Structlog → JSON) ───────────────────────────
     structlog.configure(
         wrapper_class=structlog.make_filtering_bound_logger(
             app.config.get("LOG_LEVEL", "INFO")
@@ -70,16 +127,14 @@ def create_app() -> Flask:
     csrf = CSRFProtect(app)
     app.jinja_env.globals["csrf_token"] = generate_csrf
 
-    # ── Sentry (optional) ────────────────────────────────────
+    # ── Sentry (optional) ────────────────────────────────────
     if (dsn := os.getenv("SENTRY_DSN")):
+        import sentry_sdk                                 # nur wenn genutzt
         sentry_sdk.init(dsn=dsn, traces_sample_rate=0.15)
 
-    # ── Core‑Extensions ──────────────────────────────────────
-    db.init_app(app)
-    migrate.init_app(app, db)
     login_manager.init_app(app)
 
-    # ── Babel 4 Locale‑Selector ──────────────────────────────
+    # ── Babel 4 Locale‑Selector ──────────────────────────────
     babel.init_app(
         app,
         locale_selector=lambda: (
@@ -89,10 +144,11 @@ def create_app() -> Flask:
         ),
     )
 
-    #  Globale Helfer für Templates
+    #  Globale Helfer für Templates
     app.jinja_env.globals.update(
-        get_locale=get_locale,                   #  voller Babel‑Context
-        active_lang=lambda: get_locale().upper(),        #  DE / ES / EN
+        user_roster=user_roster,                 #  Navbar‑Switch (gecacht)
+        get_locale=get_locale,                   #  voller Babel‑Context
+        active_lang=lambda: get_locale().upper(),        #  DE / ES / EN
         supported_languages=[
             ("de", "Deutsch"),
             ("es", "Español"),
@@ -100,22 +156,9 @@ def create_app() -> Flask:
         ],
     )
 
-    # ── Caching (Single‑Node → Simple, Prod → Redis) ─────────
-    cache.init_app(
-        app,
-        config={
-            "CACHE_TYPE": "SimpleCache"
-            if env == "development"
-            else "RedisCache",
-            "CACHE_REDIS_URL": os.getenv(
-                "REDIS_URL", "redis://localhost:6379/0"
-            ),
-            "CACHE_DEFAULT_TIMEOUT": 300,
-        },
-    )
-
     # ── Rate‑Limiting ────────────────────────────────────────
-    limiter.init_app(app)  # storage_uri schon oben gesetzt
+    app.config.setdefault("RATELIMIT_STORAGE_URI", storage_url(app))   # registriert sqlite://
+    limiter.init_app(app)
 
     # ── Content‑Security‑Policy ──────────────────────────────
     CSP = {
@@ -142,6 +185,14 @@ def create_app() -> Flask:
     }
     talisman.init_app(app, content_security_policy=CSP)
 
+    # ── Kompression (br / zstd / gzip) ───────────────────────
+    compress.init_app(app)                 # dynamisch, Feeds gecacht (ETag)
+    serve_precompressed(app)               # static/*.br|.zst|.gz
+
+    # ── CSS/JS-Bundles (minifiziert, gehasht, immutable) ─────
+    init_assets(app)
+    app.cli.add_command(precompress_command)
+
     # ── Blueprints ───────────────────────────────────────────
     for bp in (auth_bp, booking_bp, api_bp):
         app.register_blueprint(bp)
@@ -149,7 +200,21 @@ def create_app() -> Flask:
     # ── Health‑Endpoint ──────────────────────────────────────
     @app.get("/ping")
     def ping():
-        """Kleiner Health‑Check für Load‑Balancers / Uptime‑Robots."""
+        """Kleiner Health‑Check für Load‑Balancers / Uptime‑Robots."""
         return {"status": "ok", "time": datetime.utcnow().isoformat()}
 
-    return app
+    @app.get("/ping/pool")
+    def pool_stats():
+        """Pool-Kennzahlen DIESES Workers (Checkouts, Overflow, Wartezeit); nur mit ``PING_STATS``."""
+        if not app.config["PING_STATS"]:
+            abort(404)
+        pool = db.engine.pool
+        stats = pool.stats() if hasattr(pool, "stats") else {"status": pool.status()}
+        return {"pid": os.getpid(), "pool": type(pool).__name__, **stats}
+
+    @app.get("/ping/cache")
+    def cache_stats():
+        """Trefferquote des Worker-LRU (tiered cache) DIESES Workers; nur mit ``PING_STATS``."""
+        if not app.config["PING_STATS"]:
+            abort(404)
+        return {"pid": os.getpid(), **tiered.stats()}
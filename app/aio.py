@@ -0,0 +1,230 @@
+"""
+app/aio.py  –  Async-Lesepfad: Engine, View-Registry und ASGI-Front
+────────────────────────────────────────────────────────────────────────────
+Die Feeds (``api.events``, ``booking.events``) und ``check_overlap`` warten
+fast nur auf die Remote-MySQL.  Unter Sync-Workern blockiert jeder Poll
+einen ganzen Worker – hier wartet stattdessen eine Coroutine:
+
+• ``async_engine()`` / ``async_session()``: eigene ``AsyncEngine`` auf
+  derselben DB (``ASYNC_DATABASE_URI`` → aiomysql, lokal aiosqlite).
+• ``@async_view("api.events")`` registriert eine Async-Variante zu einem
+  bestehenden Endpoint (definiert neben der Sync-View).
+• ``FeedASGI`` (``asgi.py``) nimmt GET/HEAD auf diese Endpoints selbst an,
+  alles andere geht über ``WsgiToAsgi`` an die unveränderte Flask-App.
+  Der Request läuft im echten Flask-Request-Context: Before-/After-Request
+  (Limiter, Talisman, Kompression), Session, ``current_user``, ETags und
+  Fehlerseiten bleiben identisch.
+• Kurze Sync-Schritte (Cache/Redis, Limiter, Login) laufen per
+  ``run_sync`` in einem Thread – Sekundenbruchteile statt eines Threads pro
+  DB-Roundtrip.
+
+    uvicorn asgi:app --workers 2
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import sys
+from functools import wraps
+from io import BytesIO
+from typing import TYPE_CHECKING, Any, Awaitable, Callable
+from urllib.parse import parse_qsl
+
+from flask import Flask, current_app, request, request_started
+from flask_login import current_user
+from flask_login.config import EXEMPT_METHODS
+from werkzeug.datastructures import MultiDict
+
+from app.models import db
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+log = logging.getLogger(__name__)
+
+AsyncView = Callable[..., Awaitable[Any]]
+
+# Endpoint → (Async-View, ``sync_if(args)``: Request doch über WSGI)
+_VIEWS: dict[str, tuple[AsyncView, Callable[[MultiDict], bool] | None]] = {}
+
+
+async def run_sync(func: Callable, *args, **kwargs):
+    """Blockierenden Aufruf in einem Thread (Request-Context wird mitgegeben)."""
+    return await asyncio.to_thread(func, *args, **kwargs)
+
+
+# ─────────────────────────────────────────────────────────────
+#  Engine / Session
+# ─────────────────────────────────────────────────────────────
+def init_async_db(app: Flask) -> "AsyncEngine":
+    """Legt die Async-Engine für ``app`` an (erst beim ASGI-Start → Sync-Worker importieren aiomysql nie)."""
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    engine = create_async_engine(app.config["ASYNC_DATABASE_URI"],
+                                 **app.config["ASYNC_ENGINE_OPTIONS"])
+    app.extensions["familia.async_engine"] = engine
+    app.extensions["familia.async_sessions"] = async_sessionmaker(engine, expire_on_commit=False)
+    return engine
+
+
+def async_engine() -> "AsyncEngine":
+    return current_app.extensions["familia.async_engine"]
+
+
+def async_session() -> "AsyncSession":
+    """Neue ``AsyncSession`` (``async with async_session() as s: …``)."""
+    return current_app.extensions["familia.async_sessions"]()
+
+
+# ─────────────────────────────────────────────────────────────
+#  Views
+# ─────────────────────────────────────────────────────────────
+def async_view(endpoint: str, *, sync_if: Callable[[MultiDict], bool] | None = None):
+    """
+    Registriert die Async-Variante von ``endpoint``.  ``sync_if(args)``
+    schickt einzelne Requests trotzdem an die Sync-View (z. B. Streams).
+    """
+    def decorator(view: AsyncView) -> AsyncView:
+        _VIEWS[endpoint] = (view, sync_if)
+        return view
+    return decorator
+
+
+def _login_denied():
+    """Wie ``flask_login.login_required`` – Antwort bei fehlendem Login, sonst ``None``."""
+    try:
+        if request.method in EXEMPT_METHODS or current_app.config.get("LOGIN_DISABLED"):
+            return None
+        if not current_user.is_authenticated:
+            return current_app.login_manager.unauthorized()
+        return None
+    finally:
+        db.session.remove()                  # Identity-Miss: Verbindung sofort zurück
+
+
+def login_required_async(view: AsyncView) -> AsyncView:
+    """``@login_required`` für Async-Views (Identity-Cache im Thread)."""
+    @wraps(view)
+    async def wrapper(*args, **kwargs):
+        denied = await run_sync(_login_denied)
+        if denied is not None:
+            return denied
+        return await view(*args, **kwargs)
+    return wrapper
+
+
+# ─────────────────────────────────────────────────────────────
+#  ASGI-Front
+# ─────────────────────────────────────────────────────────────
+def _environ(scope: dict) -> dict:
+    """WSGI-Environ für einen Request ohne Body (GET/HEAD)."""
+    server = scope.get("server") or ("localhost", 80)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", "").encode().decode("latin1"),
+        "PATH_INFO": scope["path"].encode().decode("latin1"),
+        "QUERY_STRING": scope["query_string"].decode("latin1"),
+        "SERVER_NAME": server[0],
+        "SERVER_PORT": str(server[1]),
+        "SERVER_PROTOCOL": f"HTTP/{scope['http_version']}",
+        "REMOTE_ADDR": (scope.get("client") or ("", 0))[0],
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": BytesIO(),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    for raw_name, raw_value in scope["headers"]:
+        name = raw_name.decode("latin1").upper().replace("-", "_")
+        if name not in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+            name = "HTTP_" + name
+        value = raw_value.decode("latin1")
+        environ[name] = f"{environ[name]},{value}" if name in environ else value
+    return environ
+
+
+class FeedASGI:
+    """
+    ASGI-App: Async-Views für registrierte Endpoints, Rest per ``WsgiToAsgi``.
+    Ablauf wie ``Flask.wsgi_app`` / ``full_dispatch_request``.
+    """
+
+    def __init__(self, app: Flask):
+        from asgiref.wsgi import WsgiToAsgi
+
+        self.app = app
+        self.wsgi = WsgiToAsgi(app)
+        self.routes = {rule.rule: rule.endpoint for rule in app.url_map.iter_rules()
+                       if rule.endpoint in _VIEWS}
+        init_async_db(app)
+
+    async def __call__(self, scope: dict, receive, send) -> None:
+        if scope["type"] == "lifespan":
+            return await self._lifespan(receive, send)
+        endpoint = self._route(scope)
+        if endpoint is None:
+            return await self.wsgi(scope, receive, send)
+        await self._handle(_VIEWS[endpoint][0], scope, send)
+
+    def _route(self, scope: dict) -> str | None:
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            return None
+        endpoint = self.routes.get(scope["path"])
+        if endpoint is None:
+            return None
+        sync_if = _VIEWS[endpoint][1]
+        if sync_if and sync_if(MultiDict(parse_qsl(scope["query_string"].decode("latin1"),
+                                                   keep_blank_values=True))):
+            return None
+        return endpoint
+
+    async def _lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.app.extensions["familia.async_engine"].dispose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    # ── Request ──────────────────────────────────────────────
+    def _preprocess(self):
+        request_started.send(self.app, _async_wrapper=self.app.ensure_sync)
+        return self.app.preprocess_request()
+
+    async def _dispatch(self, view: AsyncView):
+        app = self.app
+        try:
+            rv = await run_sync(self._preprocess)
+            if rv is None:
+                if request.routing_exception is not None:
+                    app.raise_routing_exception(request)
+                rv = await view(**request.view_args)
+        except Exception as e:                           # noqa: BLE001
+            rv = await run_sync(app.handle_user_exception, e)
+        return await run_sync(app.finalize_request, rv)
+
+    async def _handle(self, view: AsyncView, scope: dict, send) -> None:
+        app = self.app
+        ctx = app.request_context(_environ(scope))
+        error: BaseException | None = None
+        try:
+            try:
+                ctx.push()
+                response = await self._dispatch(view)
+            except Exception as e:                       # noqa: BLE001
+                error = e
+                response = await run_sync(app.handle_exception, e)
+            body = b"" if scope["method"] == "HEAD" else response.get_data()
+            await send({
+                "type": "http.response.start",
+                "status": response.status_code,
+                "headers": [(k.lower().encode("latin1"), v.encode("latin1"))
+                            for k, v in response.headers.items()],
+            })
+            await send({"type": "http.response.body", "body": body})
+        finally:
+            ctx.pop(error)
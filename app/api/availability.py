@@ -0,0 +1,68 @@
+"""
+app/api/availability.py  –  Belegung & freie Zeitfenster (NumPy)
+────────────────────────────────────────────────────────────────────────────
+• ``load_spans()``     EINE Query: Start/Ende aller Buchungen im Bereich.
+• ``occupancy()``      Belegung pro Tag über ein Differenz-Array
+                       (+1 am Anreisetag, −1 nach dem Abreisetag, cumsum) –
+                       O(Buchungen + Tage), keine Schleife pro Tag.
+• ``free_windows()``   Läufe freier Tage ≥ N Nächte (Flanken via ``np.diff``).
+
+Enddatum ist – wie überall in der App – inklusiv; ein freier Tag ist
+eine freie Nacht (``nights = (end - start).days + 1``).
+
+NumPy wird erst mit diesem Modul geladen (lazy aus ``api.routes``).
+"""
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+import numpy as np
+from sqlalchemy import select
+
+from app.models import Booking, db
+
+MAX_DAYS = 3660                       # ~10 Jahre pro Anfrage
+
+
+def load_spans(date_from: date, date_to: date) -> tuple[np.ndarray, np.ndarray]:
+    """Start/Ende (``datetime64[D]``) aller Buchungen, die den Bereich berühren."""
+    rows = db.session.execute(
+        select(Booking.start_date, Booking.end_date)
+        .where(Booking.end_date >= date_from, Booking.start_date <= date_to)
+    ).all()
+    if not rows:
+        empty = np.empty(0, dtype="datetime64[D]")
+        return empty, empty
+    starts, ends = zip(*rows)
+    return np.array(starts, dtype="datetime64[D]"), np.array(ends, dtype="datetime64[D]")
+
+
+def occupancy(starts: np.ndarray, ends: np.ndarray,
+              date_from: date, date_to: date) -> np.ndarray:
+    """Anzahl Buchungen pro Tag in ``[date_from, date_to]`` (int32-Array)."""
+    n_days = (date_to - date_from).days + 1
+    origin = np.datetime64(date_from, "D")
+    s = np.clip((starts - origin).astype(np.int64), 0, n_days)
+    e = np.clip((ends - origin).astype(np.int64) + 1, 0, n_days)   # exklusiv
+    diff = np.zeros(n_days + 1, dtype=np.int32)
+    np.add.at(diff, s, 1)
+    np.add.at(diff, e, -1)
+    return np.cumsum(diff[:-1], dtype=np.int32)
+
+
+def free_windows(occ: np.ndarray, date_from: date, min_nights: int = 1) -> list[dict]:
+    """Zusammenhängende freie Tage (≥ ``min_nights``) als ``{start, end, nights}``."""
+    free = np.concatenate(([0], (occ == 0).view(np.int8), [0]))
+    edges = np.diff(free)
+    run_starts = np.flatnonzero(edges == 1)
+    run_ends = np.flatnonzero(edges == -1)          # exklusiv
+    lengths = run_ends - run_starts
+    keep = lengths >= min_nights
+    return [
+        {
+            "start": (date_from + timedelta(days=int(s))).isoformat(),
+            "end": (date_from + timedelta(days=int(s + n - 1))).isoformat(),
+            "nights": int(n),
+        }
+        for s, n in zip(run_starts[keep], lengths[keep])
+    ]
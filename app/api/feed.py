@@ -0,0 +1,74 @@
+"""
+app/api/feed.py  –  Projektion + Serialisierung für /api/events
+────────────────────────────────────────────────────────────────────────────
+• ``events_stmt()``  wählt nur die benötigten Spalten (kein ORM-Identity-Map,
+  keine Booking/User-Objekte) – Rows sind schlanke Tupel.
+• ``stream_json()``  serialisiert partitionsweise zu Bytes-Chunks
+  (orjson, falls installiert – sonst stdlib ``json``).
+"""
+from __future__ import annotations
+
+import json
+from datetime import date
+from typing import Iterable, Iterator
+
+from sqlalchemy import Select, select
+
+from app.models import Booking, User
+
+try:                                     # schneller Encoder (optional)
+    import orjson
+
+    def dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:                      # pragma: no cover
+    def dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
+PARTITION = 500
+
+
+def events_stmt(user_id: int | None = None,
+                date_from: date | None = None,
+                date_to: date | None = None) -> Select:
+    """SELECT der Feed-Spalten (JOIN users), nach Start sortiert."""
+    stmt = (
+        select(
+            Booking.id, Booking.start_date, Booking.end_date, Booking.companions,
+            User.first_name, User.last_name, User.color,
+        )
+        .join(User, Booking.user_id == User.id)
+        .order_by(Booking.start_date)
+    )
+    if user_id:
+        stmt = stmt.where(Booking.user_id == user_id)
+    if date_from:
+        stmt = stmt.where(Booking.end_date >= date_from)
+    if date_to:
+        stmt = stmt.where(Booking.start_date <= date_to)
+    return stmt
+
+
+def event_dict(row, today: date) -> dict:
+    """Eine Projektions-Row → Event-Dict (Schema siehe api.events)."""
+    name = f"{row.first_name} {row.last_name}"
+    return {
+        "id": row.id,
+        "title": f"{name}{' – ' + row.companions if row.companions else ''}",
+        "start": row.start_date.isoformat(),
+        "end": row.end_date.isoformat(),
+        "color": row.color,
+        "days_left": max((row.start_date - today).days, 0),
+    }
+
+
+def stream_json(partitions: Iterable[Iterable], today: date) -> Iterator[bytes]:
+    """JSON-Array als Chunks – ein Chunk pro Partition (``Result.partitions``)."""
+    yield b"["
+    sep = b""
+    for part in partitions:
+        chunk = b",".join(dumps(event_dict(r, today)) for r in part)
+        if chunk:
+            yield sep + chunk
+            sep = b","
+    yield b"]"
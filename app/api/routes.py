@@ -3,22 +3,27 @@
 
 from __future__ import annotations
 
-from datetime import date, datetime
-from typing import List
+from datetime import date, datetime, timedelta
 
-from flask import request, jsonify, abort
+from flask import Response, request, jsonify, abort, stream_with_context
 from flask_login import current_user, login_required
-from sqlalchemy.orm import joinedload
-from sqlalchemy import and_
 
 from . import api_bp
-from app.models import db, Booking, User
+from .feed import PARTITION, dumps, event_dict, events_stmt, stream_json
+from sqlalchemy import func, select
+
+from app.aio import async_session, async_view, login_required_async
+from app.booking import changelog
+from app.changes import conditional_feed, conditional_feed_async
+from app.models import Family, StayStat, User, db
+from app.tiered_cache import tiered
 
 # ─────────────────────────────────────────────────────────────
 # /api/events  –  JSON‑Feed für FullCalendar
 # ─────────────────────────────────────────────────────────────
 @api_bp.route("/events")
 @login_required
+@conditional_feed(lambda: (request.query_string, date.today()))   # days_left
 def events() -> "flask.wrappers.Response":
     """
     Liefert alle Buchungen als JSON‑Liste.
@@ -27,6 +32,8 @@ def events() -> "flask.wrappers.Response":
         ?user=<int>             – nur Events dieses Users
         ?from=<YYYY‑MM‑DD>      – Start‑Datum Filter
         ?to=<YYYY‑MM‑DD>        – End‑Datum   Filter
+        ?stream=1               – Chunked JSON (konstanter Speicher, frühes TTFB)
+        ?since=<version>        – nur Änderungen seit ``version`` (s. u.)
 
     Response‑Schema pro Event:
         {
@@ -37,8 +44,93 @@ def events() -> "flask.wrappers.Response":
           "color": "#5ea77a",
           "days_left": 42         # 0, wenn bereits gestartet
         }
+
+    Unveränderte Polls (``If-None-Match``) → 304 ohne DB-Zugriff.
+
+    Inkrementeller Sync: volle Antworten tragen ``X-Sync-Version``; danach
+    liefert ``?since=<version>`` nur Upserts + Tombstones (ohne Filter):
+        {"version": 812, "upserts": [<Event>, …], "deleted": [17, 42]}
+    Kosten ∝ Anzahl Änderungen (Index auf ``booking_changes.version``).
+
+    Async-Variante (ASGI): ``events_async``.
     """
-    # ── Query‑Parameter parsen ───────────────────────────────
+    if "since" in request.args:
+        since = _since_arg()
+        upserts, deleted, high = changelog.changes_since(since)
+        return _since_response(upserts, deleted, high)
+
+    stmt  = events_stmt(*_filter_args())
+    today = date.today()
+
+    # ── Streaming: Spalten-Projektion, Chunks pro Partition ───
+    if request.args.get("stream") == "1":
+        version = changelog.current_version()           # vor dem Feed lesen
+        def generate():
+            result = db.session.execute(stmt.execution_options(yield_per=PARTITION))
+            yield from stream_json(result.partitions(), today)
+        return Response(stream_with_context(generate()), mimetype="application/json",
+                        headers={"X-Sync-Version": str(version)})
+
+    # ── Standard: fertige JSON-Bytes aus dem Zwei-Ebenen-Cache ─
+    def build() -> tuple[int, bytes]:
+        version = changelog.current_version()           # gleicher Snapshot wie der Feed
+        return version, dumps([event_dict(r, today) for r in db.session.execute(stmt)])
+
+    version, payload = tiered.get_or_set(
+        f"api:events:{request.query_string.decode()}:{today}",
+        build, scopes=("bookings", "users"),
+    )
+    return _feed_response(version, payload)
+
+
+@async_view("api.events", sync_if=lambda args: args.get("stream") == "1")
+@login_required_async
+@conditional_feed_async(lambda: (request.query_string, date.today()))
+async def events_async() -> "flask.wrappers.Response":
+    """
+    ``events`` auf der Async-Engine (ASGI, ``asgi.py``) – gleiches Schema,
+    gleicher Cache-Key, gleiche ETags.  ``?stream=1`` bleibt beim Sync-Pfad.
+    """
+    if "since" in request.args:
+        since = _since_arg()
+        async with async_session() as s:
+            upserts, deleted, high = await changelog.changes_since_async(s, since)
+        return _since_response(upserts, deleted, high)
+
+    stmt  = events_stmt(*_filter_args())
+    today = date.today()
+
+    async def build() -> tuple[int, bytes]:
+        async with async_session() as s:
+            version = await changelog.current_version_async(s)
+            rows    = (await s.execute(stmt)).all()
+        return version, dumps([event_dict(r, today) for r in rows])
+
+    version, payload = await tiered.get_or_set_async(
+        f"api:events:{request.query_string.decode()}:{today}",
+        build, scopes=("bookings", "users"),
+    )
+    return _feed_response(version, payload)
+
+
+def _since_arg() -> int:
+    since = request.args.get("since", type=int)
+    if since is None or since < 0:
+        abort(400, "'since' muss eine Version ≥ 0 sein")
+    return since
+
+
+def _since_response(upserts: list, deleted: list[int], high: int):
+    today = date.today()
+    return jsonify({
+        "version": high,
+        "upserts": [event_dict(r, today) for r in upserts],
+        "deleted": deleted,
+    })
+
+
+def _filter_args() -> tuple[int | None, date | None, date | None]:
+    """``?user``, ``?from``, ``?to`` (400 bei falschem Datumsformat)."""
     try:
         user_id: int | None = request.args.get("user", type=int)
         date_from: date | None = (
@@ -53,35 +145,138 @@ def events() -> "flask.wrappers.Response":
         )
     except ValueError:
         abort(400, "Ungültiges Datumsformat; erwartet YYYY‑MM‑DD")
+    return user_id, date_from, date_to
 
-    # ── Basiskriterium: sichtbare Buchungen ──────────────────
-    filters: List = []
-    if user_id:
-        filters.append(Booking.user_id == user_id)
-    if date_from:
-        filters.append(Booking.end_date >= date_from)
-    if date_to:
-        filters.append(Booking.start_date <= date_to)
-
-    # ── Performante Abfrage mit eager‑Loaded User ────────────
-    bookings = (
-        Booking.query.options(joinedload(Booking.user))
-        .filter(*filters)
-        .order_by(Booking.start_date)
-        .all()
-    )
 
-    today = date.today()
-    data = [
+def _feed_response(version: int, payload: bytes) -> Response:
+    return Response(payload, mimetype="application/json",
+                    headers={"X-Sync-Version": str(version)})
+
+
+# ─────────────────────────────────────────────────────────────
+# /api/availability  –  Belegung & freie Fenster (NumPy)
+# ─────────────────────────────────────────────────────────────
+@api_bp.route("/availability")
+@login_required
+@conditional_feed(lambda: (request.query_string, date.today()))   # Default from=heute
+def availability() -> "flask.wrappers.Response":
+    """
+    Freie Zeitfenster und Belegung pro Tag – eine Query, Rest vektorisiert.
+
+    Query‑Parameter:
+        ?from=<YYYY‑MM‑DD>      – Beginn (Default: heute)
+        ?to=<YYYY‑MM‑DD>        – Ende, inklusiv (Default: from + 365 Tage)
+        ?nights=<int>           – Mindestlänge eines freien Fensters (Default 1)
+        ?occupancy=0            – Tages‑Array weglassen (große Bereiche)
+
+    Response:
         {
-            "id": b.id,
-            "title": f"{b.user.name}"
-                     f"{' – ' + b.companions if b.companions else ''}",
-            "start": b.start_date.isoformat(),
-            "end": b.end_date.isoformat(),
-            "color": b.user.color,
-            "days_left": max((b.start_date - today).days, 0),
+          "from": "2025-08-01", "to": "2025-08-31", "nights": 10,
+          "free_windows": [{"start": "2025-08-12", "end": "2025-08-24", "nights": 13}],
+          "occupancy": [1, 1, 0, …]      # Buchungen pro Tag ab "from"
         }
-        for b in bookings
-    ]
-    return jsonify(data)
+    """
+    try:
+        date_from = (
+            date.fromisoformat(request.args["from"]) if "from" in request.args else date.today()
+        )
+        date_to = (
+            date.fromisoformat(request.args["to"]) if "to" in request.args
+            else date_from + timedelta(days=365)
+        )
+    except ValueError:
+        abort(400, "Ungültiges Datumsformat; erwartet YYYY‑MM‑DD")
+    nights = request.args.get("nights", 1, type=int)
+
+    from . import availability as av                # NumPy erst beim ersten Aufruf
+
+    if date_to < date_from:
+        abort(400, "'to' liegt vor 'from'")
+    if (date_to - date_from).days + 1 > av.MAX_DAYS:
+        abort(400, f"Bereich zu groß (max. {av.MAX_DAYS} Tage)")
+    if nights < 1:
+        abort(400, "'nights' muss ≥ 1 sein")
+
+    starts, ends = av.load_spans(date_from, date_to)
+    occ = av.occupancy(starts, ends, date_from, date_to)
+
+    payload = {
+        "from": date_from.isoformat(),
+        "to": date_to.isoformat(),
+        "nights": nights,
+        "free_windows": av.free_windows(occ, date_from, nights),
+    }
+    if request.args.get("occupancy") != "0":
+        payload["occupancy"] = occ.tolist()
+    return jsonify(payload)
+
+
+# ─────────────────────────────────────────────────────────────
+# /api/stats/…  –  Nächte pro Familie / User (vorberechnet)
+# ─────────────────────────────────────────────────────────────
+def _stats_join(year: int | None):
+    """JOIN-Bedingung User → StayStat, optional auf ein Jahr eingeschränkt."""
+    cond = StayStat.user_id == User.id
+    return cond & (StayStat.year == year) if year else cond
+
+
+@api_bp.route("/stats/families")
+@login_required
+@conditional_feed(lambda: request.query_string)
+def stats_families() -> "flask.wrappers.Response":
+    """
+    Nächte & Buchungen pro Familie aus ``stay_stats`` (kein Scan über bookings).
+
+        ?year=<int>   – nur dieses Anreisejahr (Default: alle Jahre)
+
+    → {"year": 2025, "families": [{"id": 1, "name": "Tonev", "nights": 42, "bookings": 5}, …]}
+    """
+    year = request.args.get("year", type=int)
+    nights = func.coalesce(func.sum(StayStat.nights), 0).label("nights")
+    stmt = (
+        select(Family.id, Family.name, nights,
+               func.coalesce(func.sum(StayStat.bookings), 0).label("bookings"))
+        .outerjoin(User, User.family_id == Family.id)
+        .outerjoin(StayStat, _stats_join(year))
+        .group_by(Family.id, Family.name)
+        .order_by(nights.desc(), Family.name)
+    )
+    return jsonify({
+        "year": year,
+        "families": [r._asdict() for r in db.session.execute(stmt)],
+    })
+
+
+@api_bp.route("/stats/users")
+@login_required
+@conditional_feed(lambda: request.query_string)
+def stats_users() -> "flask.wrappers.Response":
+    """
+    Nächte & Buchungen pro User aus ``stay_stats``.
+
+        ?year=<int>     – nur dieses Anreisejahr
+        ?family=<int>   – nur Mitglieder dieser Familie
+
+    → {"year": null, "users": [{"id": 3, "name": "Silvia Habegger", "family_id": 1,
+                                "nights": 12, "bookings": 2}, …]}
+    """
+    year = request.args.get("year", type=int)
+    family_id = request.args.get("family", type=int)
+    nights = func.coalesce(func.sum(StayStat.nights), 0).label("nights")
+    stmt = (
+        select(User.id, User.first_name, User.last_name, User.family_id, nights,
+               func.coalesce(func.sum(StayStat.bookings), 0).label("bookings"))
+        .outerjoin(StayStat, _stats_join(year))
+        .group_by(User.id, User.first_name, User.last_name, User.family_id)
+        .order_by(nights.desc(), User.last_name, User.first_name)
+    )
+    if family_id:
+        stmt = stmt.where(User.family_id == family_id)
+    return jsonify({
+        "year": year,
+        "users": [
+            {"id": r.id, "name": f"{r.first_name} {r.last_name}", "family_id": r.family_id,
+             "nights": r.nights, "bookings": r.bookings}
+            for r in db.session.execute(stmt)
+        ],
+    })
@@ -0,0 +1,76 @@
+"""
+app/assets.py  –  CSS/JS-Bundles (Flask-Assets / webassets)
+────────────────────────────────────────────────────────────────────────────
+• Eigene Stylesheets & Skripte werden je Seite zu EINER Datei gebündelt,
+  minifiziert (rcssmin / rjsmin) und mit Inhalts-Hash benannt:
+
+      static/gen/site.3f9a1c2e.css
+
+• ``gen/…`` ändert sich mit jedem Inhalt → ``Cache-Control: public,
+  max-age=1 Jahr, immutable``: Wiederbesuche laden ohne Revalidierung.
+• Gebaut wird einmal beim Start (``init_assets``) bzw. vorab per
+
+      flask assets build
+
+  In der Entwicklung (``ASSETS_AUTO_BUILD``) bei jeder Quelländerung.
+• Vorkomprimierte ``.br/.zst/.gz`` entstehen wie für alle Static-Dateien
+  (``app.compression``).
+
+Templates:  ``{% assets "css_site" %}<link href="{{ ASSET_URL }}">{% endassets %}``
+"""
+from __future__ import annotations
+
+import logging
+
+from flask import Flask, request
+from webassets import Bundle
+
+log = logging.getLogger(__name__)
+
+BUNDLE_DIR = "gen/"
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+# Reihenfolge = frühere <link>-Reihenfolge (Kaskade bleibt gleich)
+BUNDLES = {
+    "css_site": Bundle(
+        "css/cl-modal.css", "css/app.css", "css/bookingModal.css",
+        "css/visitButton.css", "css/navbar.css", "css/login.css",
+        filters="rcssmin", output=BUNDLE_DIR + "site.%(version)s.css",
+    ),
+    "css_calendar": Bundle(
+        "css/calendar.css",
+        filters="rcssmin", output=BUNDLE_DIR + "calendar.%(version)s.css",
+    ),
+    "js_site": Bundle(
+        "js/site.js", filters="rjsmin", output=BUNDLE_DIR + "site.%(version)s.js",
+    ),
+    "js_calendar": Bundle(
+        "js/calendar.js", filters="rjsmin", output=BUNDLE_DIR + "calendar.%(version)s.js",
+    ),
+    "js_login": Bundle(
+        "js/login-modal.js", filters="rjsmin", output=BUNDLE_DIR + "login.%(version)s.js",
+    ),
+}
+
+
+def init_assets(app: Flask) -> None:
+    """Bundles registrieren, einmal bauen, ``gen/`` als immutable ausliefern."""
+    from .extensions import assets
+
+    assets.init_app(app)
+    for name, bundle in BUNDLES.items():
+        assets.register(name, bundle)
+
+    with app.app_context():
+        for bundle in BUNDLES.values():
+            bundle.build()                       # nur wenn Quellen neuer (Updater)
+
+    @app.after_request
+    def _immutable_bundles(response):
+        if (request.endpoint == "static" and response.status_code in (200, 206, 304)
+                and request.view_args.get("filename", "").startswith(BUNDLE_DIR)):
+            response.cache_control.public = True
+            response.cache_control.max_age = IMMUTABLE_MAX_AGE
+            response.cache_control.immutable = True
+            response.cache_control.no_cache = None
+        return response
@@ -3,11 +3,17 @@ app/auth/forms.py  –  WTForms für den passwort­losen Familien‑Login
 """
 
 from flask_wtf import FlaskForm
-from wtforms import SelectField, SubmitField
-from wtforms.validators import DataRequired
+from wtforms import IntegerField, SearchField
+from wtforms.validators import DataRequired, ValidationError
+
+from .roster import is_known
 
 
 class LoginForm(FlaskForm):
-    """Bietet ein Dropdown aller registrierten Nutzer."""
-    user   = SelectField("Ich bin", coerce=int, validators=[DataRequired()])
-    submit = SubmitField("Einloggen")
+    """Namenssuche + Vorschlags‑Buttons (jeder Button sendet ``user=<id>``)."""
+    q    = SearchField("Ich bin")
+    user = IntegerField(validators=[DataRequired()])
+
+    def validate_user(self, field):
+        if not is_known(field.data):
+            raise ValidationError("Unbekannter Benutzer")
@@ -0,0 +1,76 @@
+"""
+app/auth/identity.py  –  Gecachte Identität für den Flask‑Login user_loader
+-------------------------------------------------------------------------
+• Profilfelder (Name, Farbe, family_id …) liegen kurz (TTL) im ``cache``
+  (SimpleCache/Redis) → der übliche Request spart ``SELECT users``.
+• Treffer werden per ``merge(load=False)`` als persistenter ``User`` an die
+  Session gehängt: kein SELECT, Relationships/fehlende Spalten laden lazy.
+• Explizite Invalidierung bei jedem UPDATE/DELETE eines Users (Mapper-Events);
+  Bulk-Updates ohne Events (utils/fill_colors.py) rufen ``invalidate_identity``.
+• Jeder User-Write (auch INSERT) bumpt nach dem Commit den ``users``-Marker
+  → Roster & Feeds im ``tiered``-Cache werden neu gebaut.
+"""
+
+from __future__ import annotations
+
+import logging
+
+from sqlalchemy import event
+from sqlalchemy.orm import make_transient_to_detached, object_session
+
+from app.changes import touch_after_commit
+from app.extensions import cache
+from app.models import db, User
+
+log = logging.getLogger(__name__)
+
+IDENTITY_TTL    = 60                # Sekunden
+IDENTITY_FIELDS = ("id", "username", "first_name", "last_name", "color", "family_id")
+
+
+def _key(user_id: int) -> str:
+    return f"familia:identity:{user_id}"
+
+
+def load_identity(user_id: int) -> User | None:
+    """``User`` aus dem Cache (ohne Query) oder – bei Miss – aus der DB."""
+    try:
+        fields = cache.get(_key(user_id))
+    except Exception:                                    # noqa: BLE001
+        log.warning("Identity-Cache nicht lesbar", exc_info=True)
+        fields = None
+
+    if fields:
+        user = User(**fields)
+        make_transient_to_detached(user)
+        return db.session.merge(user, load=False)
+
+    user = db.session.get(User, user_id)
+    if user is not None:
+        try:
+            cache.set(_key(user_id),
+                      {f: getattr(user, f) for f in IDENTITY_FIELDS},
+                      timeout=IDENTITY_TTL)
+        except Exception:                                # noqa: BLE001
+            log.warning("Identity-Cache nicht schreibbar", exc_info=True)
+    return user
+
+
+def invalidate_identity(*user_ids: int) -> None:
+    """Entfernt gecachte Identitäten (nach Änderungen an ``users``)."""
+    try:
+        cache.delete_many(*(_key(uid) for uid in user_ids))
+    except Exception:                                    # noqa: BLE001
+        log.warning("Identity-Cache nicht invalidierbar", exc_info=True)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _user_changed(mapper, connection, target: User) -> None:   # noqa: ARG001
+    invalidate_identity(target.id)
+    touch_after_commit(object_session(target), "users")
+
+
+@event.listens_for(User, "after_insert")
+def _user_added(mapper, connection, target: User) -> None:     # noqa: ARG001
+    touch_after_commit(object_session(target), "users")
@@ -0,0 +1,98 @@
+"""
+app/auth/roster.py  –  Gecachte User-Liste (Login, Navbar-Switch, Suche)
+-------------------------------------------------------------------------
+``user_roster()`` liefert ``[(id, "Vorname Nachname"), …]`` sortiert nach
+Nachname/Vorname aus dem ``tiered``-Cache (Scope ``users``) – der übliche
+Seitenaufruf liest die Liste aus dem Worker-Speicher statt ``SELECT users``.
+
+``search(prefix)`` sucht per ``bisect`` in einem sortierten Namens-Index
+(Vorname, Nachname, voller Name; ohne Groß-/Kleinschreibung & Akzente).
+Der Index wird pro Worker aus dem Roster gebaut und neu aufgebaut, sobald
+der Cache einen anderen Roster liefert (User-Marker gebumpt).
+"""
+
+from __future__ import annotations
+
+import unicodedata
+from bisect import bisect_left
+from typing import NamedTuple
+
+from sqlalchemy import select
+
+from app.models import db, User
+from app.tiered_cache import tiered
+
+ROSTER_TTL = 3600                   # Sekunden (Invalidierung über den Marker)
+TOP_MATCHES = 8                     # Login-Modal: so viele Vorschläge
+
+
+def _load() -> list[tuple[int, str]]:
+    rows = db.session.execute(
+        select(User.id, User.first_name, User.last_name)
+        .order_by(User.last_name, User.first_name)
+    )
+    return [(r.id, f"{r.first_name} {r.last_name}") for r in rows]
+
+
+def user_roster() -> list[tuple[int, str]]:
+    """Alle User als ``(id, name)`` – geteilt, nicht mutieren."""
+    return tiered.get_or_set("auth:roster", _load, scopes=("users",), timeout=ROSTER_TTL)
+
+
+# ─────────────────────────────────────────────────────────────
+#  Präfix-Index
+# ─────────────────────────────────────────────────────────────
+def fold(text: str) -> str:
+    """``"Ángel "`` → ``"angel"`` (Vergleichsform für die Suche)."""
+    decomposed = unicodedata.normalize("NFKD", text.strip())
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+class _Index(NamedTuple):
+    roster: list[tuple[int, str]]        # Quelle (Identität = Gültigkeit)
+    keys:   list[str]                    # sortiert, für bisect
+    rank:   list[int]                    # parallel: Position im Roster
+    ids:    frozenset[int]
+
+
+_index: _Index | None = None
+
+
+def _build(roster: list[tuple[int, str]]) -> _Index:
+    entries = set()
+    for pos, (_, name) in enumerate(roster):
+        folded = fold(name)
+        entries.add((folded, pos))                       # "ana maria lopez"
+        for i, ch in enumerate(folded):
+            if ch == " ":
+                entries.add((folded[i + 1:], pos))       # "maria lopez", "lopez"
+    ordered = sorted(entries)
+    return _Index(roster, [k for k, _ in ordered], [p for _, p in ordered],
+                  frozenset(uid for uid, _ in roster))
+
+
+def _current() -> _Index:
+    global _index
+    roster = user_roster()
+    index = _index
+    if index is None or index.roster is not roster:
+        index = _index = _build(roster)                  # Tupel-Tausch ist atomar
+    return index
+
+
+def search(prefix: str, limit: int = TOP_MATCHES) -> list[tuple[int, str]]:
+    """Bis zu ``limit`` User, deren Vor-/Nach-/voller Name mit ``prefix`` beginnt."""
+    index = _current()
+    needle = fold(prefix)
+    if not needle:
+        return index.roster[:limit]
+    hits: set[int] = set()
+    for i in range(bisect_left(index.keys, needle), len(index.keys)):
+        if not index.keys[i].startswith(needle):
+            break
+        hits.add(index.rank[i])
+    return [index.roster[pos] for pos in sorted(hits)[:limit]]   # Roster-Reihenfolge
+
+
+def is_known(user_id: int) -> bool:
+    return user_id in _current().ids
@@ -3,6 +3,7 @@ app/auth/routes.py  –  Login‑, Logout‑ und Benutzer‑Wechsel‑Routen
 ------------------------------------------------------------------
 • Pass­wortloser Login via Dropdown/Modal
 • Optionale Switch‑Route  /auth/switch/<id>  (bequem per Dropdown)
+• Namens‑Autocomplete     /auth/users?q=<präfix>  (JSON, Top‑Treffer)
 • Flash‑Feedback & CSRF‑geschützt
 """
 
@@ -14,7 +15,7 @@ from flask import (
     url_for,
     flash,
     request,
-    abort, session,
+    abort, session, jsonify,
 )
 from flask_login import (
     login_user,
@@ -22,10 +23,12 @@ from flask_login import (
     current_user,
     login_required,
 )
-from sqlalchemy import select
+from app.extensions import limiter
 from app.models import db, User, login_manager
 from . import auth_bp
 from .forms import LoginForm
+from .identity import load_identity
+from .roster import TOP_MATCHES, search
 
 
 # ─────────────────────────────────────────────────────────────
@@ -33,8 +36,8 @@ from .forms import LoginForm
 # ─────────────────────────────────────────────────────────────
 @login_manager.user_loader
 def load_user(user_id: str) -> User | None:          # noqa: D401
-    """Lädt User‑Objekt für Flask‑Login‑Session‑Cookie."""
-    return db.session.get(User, int(user_id))
+    """Lädt User‑Objekt für Flask‑Login‑Session‑Cookie (gecacht, kurze TTL)."""
+    return load_identity(int(user_id))
 
 
 # ─────────────────────────────────────────────────────────────
@@ -62,14 +65,8 @@ def login():                                         # noqa: D401
         flash(f"Eingeloggt als {target.name}", "success")
         return redirect(url_for("booking.calendar"))
 
-    # 3️⃣  Klassischer Formular‑Login (Dropdown)
+    # 3️⃣  Formular‑Login (Suchfeld + Vorschläge)
     form = LoginForm()
-    form.user.choices = [
-        (u.id, f"{u.first_name} {u.last_name}")
-        for u in db.session.scalars(
-            select(User).order_by(User.last_name, User.first_name)
-        )
-    ]
 
     if form.validate_on_submit():
         user = db.session.get(User, form.user.data)
@@ -77,7 +74,21 @@ def login():                                         # noqa: D401
         flash(f"Willkommen {user.first_name}!", "success")
         return redirect(url_for("booking.calendar"))
 
-    return render_template("auth/login.html", form=form)
+    # nur die Top‑Treffer rendern (?q= ohne JS, sonst lädt das Modal nach)
+    matches = search(request.args.get("q", ""))      # Index aus gecachtem Roster
+    return render_template("auth/login.html", form=form, matches=matches)
+
+
+@auth_bp.get("/users")
+@limiter.limit("120/minute")                         # Tippen statt 50/hour-Default
+def user_search():                                   # noqa: D401
+    """Präfix‑Suche für das Login‑Autocomplete:  ?q=<präfix>&limit=<n≤20>."""
+    limit = min(request.args.get("limit", TOP_MATCHES, type=int), 20)
+    users = search(request.args.get("q", ""), max(limit, 1))
+    rv = jsonify([{"id": uid, "name": name} for uid, name in users])
+    rv.cache_control.private = True
+    rv.cache_control.max_age = 30
+    return rv
 
 
 @auth_bp.route("/logout")
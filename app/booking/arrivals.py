@@ -0,0 +1,55 @@
+"""
+app/booking/arrivals.py  –  "Nächste Anreise" als gecachter Service
+────────────────────────────────────────────────────────────────────────────
+• Eine Query (JOIN auf User) statt zweier Queries + Lazy-Load.
+• Cache-Schlüssel pro User (bzw. global) und Tag; der Booking-Marker
+  steckt im Schlüssel → jeder Schreibpfad invalidiert automatisch.
+"""
+from __future__ import annotations
+
+from datetime import date
+from typing import NamedTuple
+
+from sqlalchemy import select
+
+from app.changes import booking_marker
+from app.extensions import cache
+from app.models import db, Booking, User
+
+CACHE_TIMEOUT = 24 * 3600
+
+
+class Arrival(NamedTuple):
+    start_date: date
+    user_name: str
+
+
+def _query(user_id: int | None, today: date) -> Arrival | None:
+    stmt = (
+        select(Booking.start_date, User.first_name, User.last_name)
+        .join(User, Booking.user_id == User.id)
+        .where(Booking.start_date >= today)
+        .order_by(Booking.start_date)
+        .limit(1)
+    )
+    if user_id is not None:
+        stmt = stmt.where(Booking.user_id == user_id)
+    row = db.session.execute(stmt).first()
+    return Arrival(row.start_date, f"{row.first_name} {row.last_name}") if row else None
+
+
+def next_arrival(user_id: int | None = None) -> Arrival | None:
+    """Nächste Anreise ab heute – global (``None``) oder eines Users."""
+    today  = date.today()
+    marker = booking_marker()
+    if marker is None:
+        return _query(user_id, today)
+
+    key = f"familia:arrival:{user_id or 'all'}:{today.isoformat()}:{marker}"
+    hit = cache.get(key)
+    if hit is not None:
+        return Arrival(*hit) if hit else None
+
+    arrival = _query(user_id, today)
+    cache.set(key, tuple(arrival) if arrival else (), timeout=CACHE_TIMEOUT)
+    return arrival
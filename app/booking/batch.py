@@ -0,0 +1,214 @@
+"""
+app/booking/batch.py  –  Mehrere Buchungs-Änderungen in EINER Transaktion
+────────────────────────────────────────────────────────────────────────────
+``POST /booking/batch``  (JSON, ``X-CSRFToken``)::
+
+    {"force": false,
+     "ops": [{"op": "create", "start_date": "2025-08-01", "end_date": "2025-08-05"},
+             {"op": "update", "id": 17, "version": 3, "start_date": …, "end_date": …},
+             {"op": "delete", "id": 18}]}
+
+• Eigene Session (eigene Verbindung + Transaktion – die Request-Session
+  bleibt unberührt); erstes Statement ist die Schreibsperre
+  (``changelog.next_version``): Prüfungen und Writes paralleler
+  Batches/Bucher laufen nacheinander, und die Prüfungen lesen einen
+  Snapshot von NACH der Sperre.
+• Validierung wie ``BookingForm`` (``check_stay``), Owner-Check für ALLE
+  referenzierten IDs mit EINER Query (``IN``).
+• Überschneidungen in einem sortierten Durchlauf wie beim Import:
+  bestehende Buchungen im Fenster (ohne die im Batch bewegten/gelöschten)
+  als ``IntervalIndex`` + bereits akzeptierte Einträge des Batches.
+  Wird ein Update abgelehnt, bleibt sein altes Intervall belegt → der
+  Durchlauf wiederholt sich mit diesem Intervall (selten, max. #Updates).
+• ``version`` (optional, wie If-Match) muss der gespeicherten entsprechen.
+• Schreiben über das ORM (Stats/Änderungs-Log per Mapper-Events, Version
+  per ``version_id_col``), EIN Commit; Ergebnis pro Eintrag mit
+  HTTP-artigem Status und neuer ``version``:
+
+    201 angelegt · 200 geändert · 204 gelöscht
+    400 ungültig · 403 fremd · 404 unbekannt · 409 Überschneidung
+    412 Version veraltet
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from wtforms.validators import ValidationError
+
+from app.models import db, Booking
+from . import changelog, push
+from .forms import check_stay
+from .intervals import IntervalIndex
+
+MAX_OPS = 200
+OPS = ("create", "update", "delete")
+PUSH_OPS = {"create": "created", "update": "updated", "delete": "deleted"}
+
+
+@dataclass
+class BatchItem:
+    index: int
+    op: str
+    id: int | None = None
+    start: date | None = None
+    end: date | None = None
+    companions: str | None = None
+    has_companions: bool = False
+    force: bool = False
+    version: int | None = None           # erwartet (Eingabe) bzw. neu (Ergebnis)
+    booking: Booking | None = None
+    event: dict | None = None            # Push-Payload (vor dem Commit gebaut)
+    status: int = 0
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+    def fail(self, status: int, error: str) -> None:
+        self.status, self.error = status, error
+
+    def as_dict(self) -> dict:
+        out = {"index": self.index, "op": self.op, "status": self.status, "id": self.id}
+        if self.ok and self.op != "delete":
+            out["version"] = self.version
+        if self.error:
+            out["error"] = self.error
+        return out
+
+
+# ───────── Parsing ─────────
+def _parse(index: int, raw, force: bool) -> BatchItem:
+    if not isinstance(raw, dict) or raw.get("op") not in OPS:
+        item = BatchItem(index, str(raw.get("op")) if isinstance(raw, dict) else "?")
+        item.fail(400, "Unbekannte Operation")
+        return item
+
+    item = BatchItem(index, raw["op"], force=force or bool(raw.get("force")))
+    if item.op != "create":
+        if not isinstance(raw.get("id"), int):
+            item.fail(400, "id fehlt")
+            return item
+        item.id = raw["id"]
+        if raw.get("version") is not None:
+            if not isinstance(raw["version"], int):
+                item.fail(400, "version ungültig")
+                return item
+            item.version = raw["version"]
+    if item.op == "delete":
+        return item
+
+    try:
+        item.start = date.fromisoformat(raw["start_date"])
+        item.end   = date.fromisoformat(raw["end_date"])
+        item.has_companions = "companions" in raw or item.op == "create"
+        item.companions = (raw.get("companions") or "").strip() or None
+        check_stay(item.start, item.end, item.companions)
+    except ValidationError as exc:
+        item.fail(400, str(exc))
+    except (KeyError, TypeError, ValueError):
+        item.fail(400, "Datum nicht im Format YYYY-MM-DD")
+    return item
+
+
+# ───────── Prüfungen ─────────
+def _check_owner(session: Session, items: list[BatchItem], user_id: int) -> None:
+    ids = {it.id for it in items if it.id is not None}
+    rows = {b.id: b for b in session.scalars(
+        select(Booking).where(Booking.id.in_(ids)))} if ids else {}
+    seen: set[int] = set()
+    for it in items:
+        if it.id is None:
+            continue
+        b = rows.get(it.id)
+        if it.id in seen:
+            it.fail(400, "Buchung mehrfach im Batch")
+        elif b is None:
+            it.fail(404, "Buchung nicht gefunden")
+        elif b.user_id != user_id:
+            it.fail(403, "Nur eigene Buchungen")
+        elif it.version is not None and b.version != it.version:
+            it.fail(412, "Version veraltet")
+        else:
+            it.booking = b
+        seen.add(it.id)
+
+
+def _check_overlaps(session: Session, items: list[BatchItem]) -> None:
+    writes = [it for it in items if it.op != "delete"]
+    if not writes:
+        return
+    touched = {it.id for it in items if it.id is not None}
+    lo, hi = min(it.start for it in writes), max(it.end for it in writes)
+    existing = [
+        (r.id, r.start_date, r.end_date)
+        for r in session.execute(
+            select(Booking.id, Booking.start_date, Booking.end_date)
+            .where(Booking.start_date <= hi, Booking.end_date >= lo))
+        if r.id not in touched
+    ]
+    forced = [(it.id or 0, it.start, it.end) for it in writes if it.force]
+    checked = sorted((it for it in writes if not it.force), key=lambda it: (it.start, it.end))
+
+    kept: dict[int, tuple] = {}          # alte Intervalle abgelehnter Updates
+    while True:
+        index = IntervalIndex([*existing, *forced, *kept.values()])
+        reach, rejected = date.min, []
+        for it in checked:
+            if it.start <= reach or index.overlaps(it.start, it.end):
+                rejected.append(it)
+            else:
+                reach = max(reach, it.end)
+        grown = {it.id: (it.id, it.booking.start_date, it.booking.end_date)
+                 for it in rejected if it.op == "update" and it.id not in kept}
+        if not grown:
+            break
+        kept.update(grown)
+
+    for it in rejected:
+        it.fail(409, "Überschneidung")
+
+
+# ───────── Ausführen ─────────
+def apply_batch(raw_ops: list, user_id: int, force: bool = False) -> list[BatchItem]:
+    """Prüft und schreibt alle Einträge; EIN Commit.  Ergebnis in Eingabe-Reihenfolge."""
+    items = [_parse(i, raw, force) for i, raw in enumerate(raw_ops)]
+    if all(it.status for it in items):
+        return items
+    with Session(db.engine, expire_on_commit=False) as session:
+        changelog.next_version(session.connection())        # Schreibsperre vor den Prüfungen
+        _check_owner(session, [it for it in items if not it.status], user_id)
+        _check_overlaps(session, [it for it in items if not it.status])
+
+        live = [it for it in items if not it.status]
+        if not live:
+            session.rollback()                               # Sperre freigeben
+            return items
+        try:
+            for it in live:
+                if it.op == "create":
+                    it.booking = Booking(user_id=user_id, start_date=it.start,
+                                         end_date=it.end, companions=it.companions)
+                    session.add(it.booking)
+                    it.status = 201
+                elif it.op == "update":
+                    it.booking.start_date, it.booking.end_date = it.start, it.end
+                    if it.has_companions:
+                        it.booking.companions = it.companions
+                    it.status = 200
+                else:
+                    session.delete(it.booking)
+                    it.status = 204
+            session.flush()
+            for it in live:                # vor dem Commit: kein Refresh je Objekt
+                if it.op != "delete":
+                    it.id, it.version = it.booking.id, it.booking.version
+                    it.event = push.event_payload(it.booking)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+    return items
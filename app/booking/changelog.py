@@ -0,0 +1,162 @@
+"""
+app/booking/changelog.py  –  Versioniertes Änderungs-Log für Sync-Clients
+────────────────────────────────────────────────────────────────────────────
+• Jeder Buchungs-Write (Mapper-Events insert / update / delete) zieht in
+  DERSELBEN Transaktion eine neue Version aus ``sync_counters`` und setzt
+  die Log-Zeile der Buchung auf ``(version, op)``.
+• Das ``UPDATE sync_counters …`` sperrt die Zähler-Zeile bis zum Commit:
+  Writer serialisieren sich dort, Versionen werden also in Commit-
+  Reihenfolge sichtbar – ein Client mit Hochwassermarke V verpasst nie
+  eine später committete Version ≤ V.
+• ``next_version()`` ZUERST aufgerufen ist zugleich die Schreibsperre der
+  Booking-Writer.  Die Sperre allein macht Prüfungen nicht aktuell: unter
+  REPEATABLE READ gilt der Snapshot des ERSTEN Reads der Transaktion (etwa
+  ``load_identity``), und der kann vor der Sperre liegen.
+  – ``writes.py``: die Guards stecken im INSERT … SELECT / UPDATE – InnoDB
+    liest dort per Locking Read den committeten Stand, kein Snapshot.
+  – Prüfen-dann-Schreiben (Batch, Import): eigene Transaktion auf eigener
+    Verbindung, ``next_version()`` als ERSTES Statement → der Snapshot
+    entsteht danach; die Session des Requests bleibt unberührt.
+• ``record()``       für Core-Writes, ``record_bulk()`` für den Importer (nur dessen IDs).
+• ``changes_since()`` liefert Upserts (Feed-Projektion) + Tombstones
+  (``…_async``-Varianten für den ASGI-Pfad, gleiche Statements).
+
+Buchungen, die älter als das Log sind, haben keine Zeile → Erst-Sync über
+den vollen Feed (``X-Sync-Version``-Header), danach nur noch ``?since=``.
+Namens-/Farbänderungen eines Users erzeugen KEINE Log-Zeilen (seltene
+Stammdaten) – dafür gibt es den vollen Feed.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from sqlalchemy import (
+    Connection, delete, event, func, insert, inspect, select, update,
+)
+
+from app.models import Booking, BookingChange, SyncCounter, User, db
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+COUNTER = "bookings"
+_VISIBLE = ("user_id", "start_date", "end_date", "companions")   # Feed-relevant
+
+
+# ─────────────────────────────────────────────────────────────
+#  Versionen
+# ─────────────────────────────────────────────────────────────
+def next_version(conn: Connection) -> int:
+    """Zähler +1 (sperrt die Zeile bis zum Commit) und neuen Wert liefern."""
+    table = SyncCounter.__table__
+    res = conn.execute(
+        update(table).where(table.c.name == COUNTER).values(value=table.c.value + 1)
+    )
+    if res.rowcount == 0:
+        conn.execute(insert(table).values(name=COUNTER, value=1))
+    return conn.scalar(select(table.c.value).where(table.c.name == COUNTER))
+
+
+def _version_stmt():
+    return select(func.coalesce(func.max(BookingChange.version), 0))
+
+
+def current_version(conn: Connection | None = None) -> int:
+    """Höchste vergebene Version im Log (0 = leer)."""
+    return (conn or db.session).scalar(_version_stmt())
+
+
+async def current_version_async(session: "AsyncSession") -> int:
+    """``current_version`` auf der Async-Engine (``app.aio``)."""
+    return await session.scalar(_version_stmt())
+
+
+def record(conn: Connection, booking_id: int, op: str, version: int | None = None) -> None:
+    """Log-Zeile der Buchung auf ``(version, op)`` setzen (neue Version, wenn ``None``)."""
+    table = BookingChange.__table__
+    row = {"booking_id": booking_id, "version": version or next_version(conn),
+           "op": op, "changed_at": datetime.utcnow()}
+    res = conn.execute(
+        update(table).where(table.c.booking_id == booking_id)
+        .values(version=row["version"], op=op, changed_at=row["changed_at"])
+    )
+    if res.rowcount == 0:
+        conn.execute(insert(table).values(**row))
+
+
+# ─────────────────────────────────────────────────────────────
+#  Mapper-Events
+# ─────────────────────────────────────────────────────────────
+@event.listens_for(Booking, "after_insert")
+def _booking_inserted(mapper, connection, target: Booking) -> None:   # noqa: ARG001
+    record(connection, target.id, "upsert")
+
+
+@event.listens_for(Booking, "after_update")
+def _booking_updated(mapper, connection, target: Booking) -> None:    # noqa: ARG001
+    state = inspect(target)
+    if any(state.attrs[a].history.has_changes() for a in _VISIBLE):
+        record(connection, target.id, "upsert")
+
+
+@event.listens_for(Booking, "after_delete")
+def _booking_deleted(mapper, connection, target: Booking) -> None:    # noqa: ARG001
+    record(connection, target.id, "delete")
+
+
+def record_bulk(conn: Connection, booking_ids: list[int], version: int) -> None:
+    """Genau ``booking_ids`` (Import) als Upsert der Version ``version`` loggen."""
+    if not booking_ids:
+        return
+    table = BookingChange.__table__
+    now = datetime.utcnow()
+    conn.execute(delete(table).where(table.c.booking_id.in_(booking_ids)))   # wiederverwendete IDs
+    conn.execute(insert(table), [
+        {"booking_id": bid, "version": version, "op": "upsert", "changed_at": now}
+        for bid in booking_ids
+    ])
+
+
+# ─────────────────────────────────────────────────────────────
+#  Lesen
+# ─────────────────────────────────────────────────────────────
+def _since_stmts(since: int):
+    upserts = (
+        select(
+            Booking.id, Booking.start_date, Booking.end_date, Booking.companions,
+            User.first_name, User.last_name, User.color, BookingChange.version,
+        )
+        .select_from(BookingChange)
+        .join(Booking, Booking.id == BookingChange.booking_id)
+        .join(User, Booking.user_id == User.id)
+        .where(BookingChange.version > since, BookingChange.op == "upsert")
+        .order_by(BookingChange.version)
+    )
+    deleted = (
+        select(BookingChange.booking_id, BookingChange.version)
+        .where(BookingChange.version > since, BookingChange.op == "delete")
+    )
+    return upserts, deleted
+
+
+def _since_result(since: int, upserts: list, deleted: list) -> tuple[list, list[int], int]:
+    high = max([since, *(r.version for r in upserts), *(r.version for r in deleted)])
+    return upserts, [r.booking_id for r in deleted], high
+
+
+def changes_since(since: int) -> tuple[list, list[int], int]:
+    """
+    ``(upsert_rows, deleted_ids, high_water)`` für alle Versionen > ``since``.
+    Upsert-Rows haben die Spalten von ``api.feed.events_stmt``.
+    """
+    upserts, deleted = _since_stmts(since)
+    return _since_result(since, db.session.execute(upserts).all(),
+                         db.session.execute(deleted).all())
+
+
+async def changes_since_async(session: "AsyncSession", since: int) -> tuple[list, list[int], int]:
+    """``changes_since`` auf der Async-Engine (``app.aio``)."""
+    upserts, deleted = _since_stmts(since)
+    return _since_result(since, (await session.execute(upserts)).all(),
+                         (await session.execute(deleted)).all())
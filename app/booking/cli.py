@@ -0,0 +1,61 @@
+"""
+app/booking/cli.py  –  ``flask bookings …``  Kommandos
+────────────────────────────────────────────────────────────
+    flask bookings import saison.csv --user silvia.habegger
+    flask bookings import export.ndjson --dry-run
+    flask bookings rebuild-stats
+"""
+from __future__ import annotations
+
+import json
+
+import click
+from flask.cli import AppGroup
+
+from app.models import db, User
+
+bookings_cli = AppGroup("bookings", help="Buchungen verwalten (Import, Statistik …).")
+
+
+@bookings_cli.command("import")
+@click.argument("source", type=click.File("rb"))
+@click.option("--format", "fmt", type=click.Choice(["csv", "ndjson"]),
+              help="Standard: aus der Datei-Endung.")
+@click.option("--user", "username", help="User für Zeilen ohne username/user_id.")
+@click.option("--force", is_flag=True, help="Überschneidungen nicht prüfen.")
+@click.option("--dry-run", is_flag=True, help="Nur prüfen, nichts schreiben.")
+@click.option("--chunk-size", default=1000, show_default=True)
+def import_command(source, fmt, username, force, dry_run, chunk_size):
+    """Importiert Buchungen aus CSV oder NDJSON (``-`` = stdin)."""
+    from .importer import ImportFormatError, detect_format, import_bookings
+
+    default_user_id = None
+    if username:
+        user = db.session.scalar(db.select(User).filter_by(username=username))
+        if user is None:
+            raise click.BadParameter(f"User '{username}' unbekannt", param_hint="--user")
+        default_user_id = user.id
+
+    try:
+        report = import_bookings(
+            source,
+            fmt=fmt or detect_format(source.name),
+            default_user_id=default_user_id,
+            force=force,
+            dry_run=dry_run,
+            chunk_size=chunk_size,
+        )
+    except ImportFormatError as exc:
+        raise click.ClickException(str(exc)) from exc
+
+    click.echo(json.dumps(report.as_dict(), indent=2, ensure_ascii=False))
+    if report.error_count or report.conflict_count:
+        raise SystemExit(1)
+
+
+@bookings_cli.command("rebuild-stats")
+def rebuild_stats_command():
+    """Korrigiert ``bookings.nights`` und baut ``stay_stats`` neu auf."""
+    from .stats import rebuild
+
+    click.echo(json.dumps(rebuild()))
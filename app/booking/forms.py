@@ -1,17 +1,33 @@
 """
  Vollständiges WTForms‑Modul für Buchungen.
 """
+from datetime import date
+
 from flask_wtf import FlaskForm
 from wtforms import DateField, StringField, SubmitField
 from wtforms.validators import DataRequired, Length, ValidationError
 
+COMPANIONS_MAX = 255
+
+
+def check_stay(start: date | None, end: date | None, companions: str | None = None) -> None:
+    """
+    Die Regeln von ``BookingForm`` ohne Formular (Import, Batch, API).
+    Wirft ``ValidationError`` mit derselben Meldung wie das Formular.
+    """
+    if start is None or end is None:
+        raise ValidationError("Von und Bis sind Pflichtfelder.")
+    if end < start:
+        raise ValidationError("Enddatum liegt vor dem Startdatum.")
+    if companions and len(companions) > COMPANIONS_MAX:
+        raise ValidationError(f"Begleitung länger als {COMPANIONS_MAX} Zeichen.")
+
 
 class BookingForm(FlaskForm):
     start_date  = DateField("Von", validators=[DataRequired()])
     end_date    = DateField("Bis",  validators=[DataRequired()])
-    companions  = StringField("Begleitung (optional)", validators=[Length(max=255)])
+    companions  = StringField("Begleitung (optional)", validators=[Length(max=COMPANIONS_MAX)])
     submit      = SubmitField("Speichern")
 
     def validate_end_date(self, field):
-        if field.data < self.start_date.data:
-            raise ValidationError("Enddatum liegt vor dem Startdatum.")
+        check_stay(self.start_date.data, field.data)
@@ -0,0 +1,301 @@
+"""
+app/booking/importer.py  –  Massen-Import von Buchungen (CSV / NDJSON)
+────────────────────────────────────────────────────────────────────────────
+• Liest die Datei zeilenweise (Stream) → keine ORM-Objekte, nur kompakte
+  Tupel pro Zeile; Datums-Regeln identisch zu ``BookingForm`` (check_stay).
+• Speicher begrenzt (O(``chunk_size``), nicht O(Datei)): je ``chunk_size``
+  gültige Zeilen werden sortiert in eine Temp-Datei geschrieben, danach per
+  ``heapq.merge`` nach Start zusammengeführt und chunkweise verarbeitet.
+• Konflikte in EINEM sortierten Durchlauf: je Chunk die bestehenden
+  Buchungen in seinem Fenster als ``IntervalIndex`` – eine Zeile kollidiert,
+  wenn sie eine bestehende oder eine bereits akzeptierte eingehende Buchung
+  schneidet (``force`` schaltet die Prüfung ab).
+• Sweep und Insert laufen in EINER eigenen Transaktion auf eigener
+  Verbindung; erstes Statement ist die Schreibsperre
+  (``changelog.next_version``), die Session des Aufrufers bleibt unberührt.
+  ``stay_stats`` + Änderungs-Log der eingefügten IDs im selben Commit
+  (Core umgeht Mapper-Events).
+
+Spalten:  start_date, end_date [, companions] [, username | user_id]
+CSV-Trenner (``,`` ``;`` Tab) wird aus der Kopfzeile erkannt.
+"""
+from __future__ import annotations
+
+import csv
+import heapq
+import io
+import json
+import tempfile
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from itertools import islice
+from typing import IO, Iterator, NamedTuple
+
+from sqlalchemy import Connection, func, insert, select
+from wtforms.validators import ValidationError
+
+from app.changes import touch_bookings
+from app.models import db, Booking, User
+from . import changelog, stats
+from .forms import check_stay
+from .intervals import IntervalIndex
+
+CHUNK_SIZE   = 1000
+REPORT_LIMIT = 100          # max. Einträge pro Fehler-/Konfliktliste im Report
+
+
+class ImportFormatError(ValueError):
+    """Datei als Ganzes unbrauchbar (Format, Kopfzeile …)."""
+
+
+class _Row(NamedTuple):
+    start: date
+    end: date
+    line: int
+    user_id: int
+    companions: str | None
+
+
+@dataclass
+class ImportReport:
+    rows: int = 0
+    imported: int = 0
+    conflict_count: int = 0
+    error_count: int = 0
+    conflicts: list[dict] = field(default_factory=list)
+    errors: list[dict] = field(default_factory=list)
+    dry_run: bool = False
+
+    def error(self, line: int, msg: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < REPORT_LIMIT:
+            self.errors.append({"line": line, "error": msg})
+
+    def conflict(self, row: _Row) -> None:
+        self.conflict_count += 1
+        if len(self.conflicts) < REPORT_LIMIT:
+            self.conflicts.append({
+                "line": row.line,
+                "start_date": row.start.isoformat(),
+                "end_date": row.end.isoformat(),
+            })
+
+    def as_dict(self) -> dict:
+        return self.__dict__.copy()
+
+
+# ───────── Parsing ─────────
+def _records(stream: IO[str], fmt: str) -> Iterator[tuple[int, dict]]:
+    """(Zeilennummer, Roh-Dict) – CSV oder NDJSON, streamend."""
+    if fmt == "ndjson":
+        for no, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                yield no, {"_error": "kein gültiges JSON"}
+                continue
+            yield no, rec if isinstance(rec, dict) else {"_error": "kein JSON-Objekt"}
+        return
+
+    header = stream.readline()
+    if not header.strip():
+        raise ImportFormatError("Leere Datei oder fehlende Kopfzeile.")
+    delim  = max(",;\t", key=header.count)
+    fields = [h.strip().lower() for h in next(csv.reader([header], delimiter=delim))]
+    if not {"start_date", "end_date"} <= set(fields):
+        raise ImportFormatError("Kopfzeile braucht start_date und end_date.")
+    reader = csv.DictReader(stream, fieldnames=fields, delimiter=delim)
+    for rec in reader:
+        yield reader.line_num + 1, rec
+
+
+def _day(raw) -> date | None:
+    """``YYYY-MM-DD`` (wie ``DateField``) – strikt, aber ohne ``strptime``."""
+    raw = (raw or "").strip() if isinstance(raw, str) else raw
+    if not raw:
+        return None
+    if len(raw) != 10 or raw[4] != "-" or raw[7] != "-":
+        raise ValueError(raw)
+    return date.fromisoformat(raw)
+
+
+def detect_format(filename: str | None, mimetype: str | None = None) -> str:
+    name = (filename or "").lower()
+    if name.endswith((".ndjson", ".jsonl")) or "ndjson" in (mimetype or ""):
+        return "ndjson"
+    return "csv"
+
+
+# ───────── Import ─────────
+def import_bookings(
+    stream: IO[str] | IO[bytes],
+    *,
+    fmt: str = "csv",
+    default_user_id: int | None = None,
+    restrict_user_id: int | None = None,
+    force: bool = False,
+    dry_run: bool = False,
+    chunk_size: int = CHUNK_SIZE,
+) -> ImportReport:
+    """
+    Importiert Buchungen aus ``stream``.
+
+    default_user_id   – für Zeilen ohne username/user_id
+    restrict_user_id  – nur Zeilen dieses Users zulassen (Web-Endpoint)
+    """
+    if not isinstance(stream, io.TextIOBase):
+        if isinstance(stream, io.RawIOBase):           # z. B. request.stream
+            stream = io.BufferedReader(stream)
+        stream = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+
+    report = ImportReport(dry_run=dry_run)
+    users  = {u.lower(): i for i, u in db.session.execute(select(User.id, User.username))}
+    known  = set(users.values())
+
+    runs: list[IO[str]] = []                   # sortierte Läufe auf Platte
+    buffer: list[_Row] = []
+    try:
+        for line, rec in _records(stream, fmt):
+            report.rows += 1
+            if "_error" in rec:
+                report.error(line, rec["_error"]); continue
+            try:
+                start, end = _day(rec.get("start_date")), _day(rec.get("end_date"))
+                companions = (rec.get("companions") or "").strip() or None
+                check_stay(start, end, companions)
+            except ValidationError as exc:      # (Unterklasse von ValueError)
+                report.error(line, str(exc)); continue
+            except (ValueError, TypeError):
+                report.error(line, "Datum nicht im Format YYYY-MM-DD"); continue
+
+            if rec.get("username"):
+                user_id = users.get(str(rec["username"]).strip().lower())
+            elif rec.get("user_id"):
+                user_id = int(rec["user_id"]) if str(rec["user_id"]).strip().isdigit() else None
+                user_id = user_id if user_id in known else None
+            else:
+                user_id = default_user_id
+            if user_id is None:
+                report.error(line, "Unbekannter oder fehlender User"); continue
+            if restrict_user_id is not None and user_id != restrict_user_id:
+                report.error(line, "Nur eigene Buchungen importierbar"); continue
+
+            buffer.append(_Row(start, end, line, user_id, companions))
+            if len(buffer) >= chunk_size:
+                runs.append(_spill(buffer))
+                buffer = []
+
+        if not runs and not buffer:
+            return report
+        buffer.sort()
+        merged = heapq.merge(*map(_replay, runs), buffer)   # nach Start sortiert
+        _write(merged, report, force=force, dry_run=dry_run, chunk_size=chunk_size)
+    finally:
+        for run in runs:
+            run.close()
+    if report.imported and not dry_run:
+        touch_bookings()
+    return report
+
+
+def _spill(run: list[_Row]) -> IO[str]:
+    """Lauf sortieren und als JSON-Zeilen in eine Temp-Datei schreiben."""
+    run.sort()
+    f = tempfile.TemporaryFile("w+", encoding="utf-8")
+    for r in run:
+        f.write(json.dumps([r.start.toordinal(), r.end.toordinal(), r.line,
+                            r.user_id, r.companions]) + "\n")
+    f.seek(0)
+    return f
+
+
+def _replay(f: IO[str]) -> Iterator[_Row]:
+    for raw in f:
+        start, end, line, user_id, companions = json.loads(raw)
+        yield _Row(date.fromordinal(start), date.fromordinal(end), line, user_id, companions)
+
+
+def _write(rows: Iterator[_Row], report: ImportReport, *, force: bool, dry_run: bool,
+           chunk_size: int) -> None:
+    """
+    Sweep + Insert chunkweise in EINER eigenen Transaktion (eigene Verbindung –
+    die Session des Aufrufers bleibt unberührt).  Erstes Statement ist die
+    Schreibsperre (``changelog.next_version``) → der Snapshot entsteht danach.
+    """
+    now = datetime.utcnow().replace(microsecond=0)   # = gespeicherter Wert (DATETIME)
+    with db.engine.connect() as conn:
+        version = None if dry_run else changelog.next_version(conn)
+        last_id = conn.scalar(select(func.coalesce(func.max(Booking.id), 0)))
+        reach = date.min                       # größtes Ende der akzeptierten
+        for chunk in _chunks(rows, chunk_size):
+            if force:
+                accepted = chunk
+            else:
+                accepted, reach = _sweep(conn, chunk, reach, report)
+            report.imported += len(accepted)
+            if dry_run or not accepted:
+                continue
+            conn.execute(insert(Booking.__table__), [
+                {
+                    "user_id": r.user_id,
+                    "start_date": r.start,
+                    "end_date": r.end,
+                    "companions": r.companions,
+                    "nights": (r.end - r.start).days + 1,
+                    "created_at": now,
+                }
+                for r in accepted
+            ])
+            stats.apply_deltas(conn, stats.deltas_for(accepted))
+        if dry_run or not report.imported:
+            conn.rollback()                    # Sperre freigeben, keine Version verbraucht
+            return
+        _log_inserted(conn, last_id, now, version, chunk_size)
+        conn.commit()
+
+
+def _chunks(rows: Iterator[_Row], size: int) -> Iterator[list[_Row]]:
+    it = iter(rows)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+def _sweep(conn: Connection, chunk: list[_Row], reach: date,
+           report: ImportReport) -> tuple[list[_Row], date]:
+    """
+    Sortierter Sweep über einen Chunk: bestehende Buchungen im Fenster des
+    Chunks (inkl. der bereits eingefügten) als ``IntervalIndex``, ``reach`` =
+    größtes Ende der bisher akzeptierten Zeilen.
+    """
+    lo, hi = chunk[0].start, max(r.end for r in chunk)
+    existing = IntervalIndex(conn.execute(
+        select(Booking.id, Booking.start_date, Booking.end_date)
+        .where(Booking.start_date <= hi, Booking.end_date >= lo)
+    ))
+    accepted: list[_Row] = []
+    for row in chunk:
+        if row.start <= reach or existing.overlaps(row.start, row.end):
+            report.conflict(row)
+            continue
+        accepted.append(row)
+        reach = max(reach, row.end)
+    return accepted, reach
+
+
+def _log_inserted(conn: Connection, last_id: int, now: datetime, version: int,
+                  page: int) -> None:
+    """
+    Änderungs-Log nur für die eigenen Zeilen (kein RETURNING unter MySQL):
+    neuer als ``last_id`` UND mit dem ``created_at`` dieses Imports –
+    seitenweise per Keyset statt alle IDs auf einmal.
+    """
+    cursor = last_id
+    while ids := conn.scalars(
+        select(Booking.id)
+        .where(Booking.id > cursor, Booking.created_at == now)
+        .order_by(Booking.id).limit(page)
+    ).all():
+        changelog.record_bulk(conn, ids, version)
+        cursor = ids[-1]
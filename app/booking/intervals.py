@@ -0,0 +1,146 @@
+"""
+app/booking/intervals.py  –  Prozess-lokaler Intervall-Index für Überschneidungen
+────────────────────────────────────────────────────────────────────────────
+• Alle Buchungen als geschlossene Intervalle [start, end] (Ordinal-Tage),
+  sortiert nach Start.  Pro Präfix werden die zwei größten End-Tage (mit
+  der Buchungs-ID des größten) gehalten → ``overlaps()`` ist ein einziges
+  ``bisect`` = O(log n), auch mit ``exclude_id``.
+• Gültig, solange der Booking-Marker (app.changes) unverändert ist; jeder
+  Schreibpfad ruft ``touch_bookings()`` → Index in ALLEN Workern veraltet.
+• Den Marker liest der Check aus der prozess-lokalen Kopie
+  (``cached_markers``), erst wenn sie älter als ``MARKER_MAX_AGE`` ist, aus
+  dem geteilten Cache (Redis) – im Normalfall also kein Netzwerk-Hop.
+  Eigene Writes sieht der Index sofort, fremde Worker spätestens nach
+  ``MARKER_MAX_AGE``; verbindlich sind ohnehin die Guards in ``writes.py``.
+• Veraltet → lazy Neuaufbau (eine Query, eigene Verbindung);  baut gerade
+  ein anderer Thread neu oder ist der Marker nicht lesbar → SQL-Pfad.
+• ``overlap_async()``: gleicher Index, Neuaufbau/SQL auf der Async-Engine.
+"""
+from __future__ import annotations
+
+import threading
+from array import array
+from bisect import bisect_right
+from datetime import date
+from typing import Iterable, Tuple
+
+from sqlalchemy import exists, select
+
+from app.aio import async_engine, run_sync
+from app.changes import booking_marker, cached_markers
+from app.models import db, Booking
+
+
+class IntervalIndex:
+    """Unveränderlicher Index über ``(id, start, end)``-Tupel."""
+
+    __slots__ = ("marker", "_starts", "_max1", "_max1_id", "_max2")
+
+    def __init__(self, rows: Iterable[Tuple[int, date, date]],
+                 marker: int | None = None) -> None:
+        self.marker   = marker
+        self._starts  = array("l")
+        self._max1    = array("l")      # größtes Ende im Präfix
+        self._max1_id = array("q")      # … und dessen Buchungs-ID
+        self._max2    = array("l")      # zweitgrößtes Ende im Präfix
+
+        m1 = m2 = -1
+        m1_id = 0
+        for bid, start, end in sorted(rows, key=lambda r: r[1]):
+            e = end.toordinal()
+            if e > m1:
+                m1, m2, m1_id = e, m1, bid
+            elif e > m2:
+                m2 = e
+            self._starts.append(start.toordinal())
+            self._max1.append(m1)
+            self._max1_id.append(m1_id)
+            self._max2.append(m2)
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def overlaps(self, start: date, end: date, exclude: int | None = None) -> bool:
+        """True, wenn eine Buchung (außer ``exclude``) [start, end] schneidet."""
+        k = bisect_right(self._starts, end.toordinal())   # alle mit start <= end
+        if not k:
+            return False
+        i = k - 1
+        reach = self._max2[i] if self._max1_id[i] == exclude else self._max1[i]
+        return reach >= start.toordinal()
+
+
+# ───────── Prozess-Zustand ─────────
+MARKER_MAX_AGE = 0.25            # s – so alt darf der lokale Booking-Marker sein
+_index: IntervalIndex | None = None
+_rebuild_lock = threading.Lock()
+
+
+_ALL = select(Booking.id, Booking.start_date, Booking.end_date)
+
+
+def _overlap_stmt(start: date, end: date, exclude: int | None = None):
+    cond = [Booking.start_date <= end, Booking.end_date >= start]
+    if exclude:
+        cond.append(Booking.id != exclude)
+    return select(exists().where(*cond))
+
+
+def _sql_overlap(start: date, end: date, exclude: int | None = None) -> bool:
+    return db.session.scalar(_overlap_stmt(start, end, exclude))
+
+
+def _rebuild(marker: int) -> IntervalIndex:
+    """Liest alle Intervalle über eine frische Verbindung (eigener Snapshot)."""
+    global _index
+    with db.engine.connect() as conn:
+        _index = IntervalIndex(conn.execute(_ALL), marker)
+    return _index
+
+
+def invalidate() -> None:
+    """Verwirft den Index dieses Prozesses (z. B. nach Bulk-Writes)."""
+    global _index
+    _index = None
+
+
+def _local_marker() -> int | None:
+    local = cached_markers(MARKER_MAX_AGE)
+    return local["bookings"] if local else None
+
+
+def overlap(start: date, end: date, exclude: int | None = None) -> bool:
+    """Überschneidungs-Check: Index, wenn aktuell – sonst SQL-Fallback."""
+    marker = _local_marker() or booking_marker()
+    if marker is None:
+        return _sql_overlap(start, end, exclude)
+
+    idx = _index
+    if idx is not None and idx.marker == marker:
+        return idx.overlaps(start, end, exclude)
+
+    if _rebuild_lock.acquire(blocking=False):
+        try:
+            return _rebuild(marker).overlaps(start, end, exclude)
+        finally:
+            _rebuild_lock.release()
+    return _sql_overlap(start, end, exclude)
+
+
+async def overlap_async(start: date, end: date, exclude: int | None = None) -> bool:
+    """``overlap`` für den ASGI-Pfad: Marker im Thread, SQL auf der Async-Engine."""
+    global _index
+    marker = _local_marker() or await run_sync(booking_marker)
+    if marker is not None:
+        idx = _index
+        if idx is not None and idx.marker == marker:
+            return idx.overlaps(start, end, exclude)
+        if _rebuild_lock.acquire(blocking=False):
+            try:
+                async with async_engine().connect() as conn:
+                    _index = IntervalIndex(await conn.execute(_ALL), marker)
+                return _index.overlaps(start, end, exclude)
+            finally:
+                _rebuild_lock.release()
+    async with async_engine().connect() as conn:
+        return await conn.scalar(_overlap_stmt(start, end, exclude))
@@ -0,0 +1,189 @@
+"""
+app/booking/push.py  –  Server-Sent Events für Buchungsänderungen
+────────────────────────────────────────────────────────────────────────────
+• ``notify()``   ersetzt in den Schreibrouten ``touch_bookings()`` (NACH dem
+  Commit): bumpt den Marker und verteilt eine kleine Nachricht an alle
+  Streams DIESES Workers (In-Process-Pub/Sub, je Abonnent eine begrenzte
+  Queue).  Die Nachricht trägt auch den VORHERIGEN Marker – passt er nicht
+  zum zuletzt gesehenen, hat dazwischen ein anderer Worker geschrieben.
+• ``stream()``   erzeugt den SSE-Body.  Zwischen den Nachrichten wird alle
+  ``POLL_SECONDS`` der geteilte Booking-Marker gelesen: hat ein ANDERER
+  Worker (oder der Importer) geschrieben, geht ``event: stale`` raus und
+  der Client lädt nur sein sichtbares Fenster neu (ETag → meist 304).
+• Ein Stream belegt für seine Dauer einen ganzen Thread.  ``available()``
+  erlaubt ihn daher nur auf Thread-Workern (``wsgi.multithread``, Gunicorn
+  ``gthread``) und höchstens ``SSE_MAX_STREAMS`` gleichzeitig pro Worker –
+  sonst (Sync-Worker, ``WsgiToAsgi`` mit nur einem WSGI-Thread, Limit
+  erreicht) bleibt der Kalender beim ETag-Polling.
+• Streams enden nach ``MAX_SECONDS`` (unter dem Worker-Timeout von
+  ``gunicorn.conf.py``) – der Browser verbindet sich per ``retry`` neu und
+  schickt ``Last-Event-ID`` (= letzter Marker) mit.
+
+    event: booking
+    id: 1721380000000000000
+    data: {"op": "updated", "id": 17, "event": {…}}
+"""
+from __future__ import annotations
+
+import json
+import logging
+import queue
+import threading
+import time
+from datetime import date, timedelta
+from typing import Iterator
+
+from flask import current_app, request
+
+from app.changes import booking_marker, touch_bookings
+from app.models import Booking
+
+log = logging.getLogger(__name__)
+
+POLL_SECONDS   = 3              # Marker-Check (Fallback zwischen Workern)
+HEARTBEAT      = 15             # Kommentarzeile gegen Proxy-Timeouts
+MAX_SECONDS    = 25             # danach reconnect (retry); < Worker-Timeout
+RETRY_MS       = 2000
+QUEUE_SIZE     = 64
+
+
+# ─────────────────────────────────────────────────────────────
+#  Pub/Sub (pro Worker-Prozess)
+# ─────────────────────────────────────────────────────────────
+class Broker:
+    def __init__(self):
+        self._subs: set[queue.Queue] = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self) -> queue.Queue:
+        q: queue.Queue = queue.Queue(maxsize=QUEUE_SIZE)
+        with self._lock:
+            self._subs.add(q)
+        return q
+
+    def unsubscribe(self, q: queue.Queue) -> None:
+        with self._lock:
+            self._subs.discard(q)
+
+    def publish(self, message: dict) -> None:
+        with self._lock:
+            subs = list(self._subs)
+        for q in subs:
+            try:
+                q.put_nowait(message)
+            except queue.Full:                  # langsamer Client → Resync
+                with q.mutex:
+                    q.queue.clear()
+                q.put_nowait({"op": "stale", "marker": message["marker"]})
+
+    def __len__(self) -> int:
+        return len(self._subs)
+
+
+broker = Broker()
+
+
+def event_payload(b: Booking) -> dict:
+    """Betrachter-neutrales FullCalendar-Event (``canEdit`` setzt der Client)."""
+    return payload(b.id, b.user, b.start_date, b.end_date, b.companions, b.version)
+
+
+def payload(booking_id: int, user, start: date, end: date, companions: str | None,
+            version: int = 1) -> dict:
+    """Wie ``event_payload`` aus Einzelwerten (Core-Writes ohne ORM-Objekt)."""
+    return {
+        "id":         booking_id,
+        "user_id":    user.id,
+        "title":      f"{user.name}{' – ' + companions if companions else ''}",
+        "start":      start.isoformat(),
+        "end":        (end + timedelta(days=1)).isoformat(),   # exklusiv
+        "allDay":     True,
+        "companions": companions,
+        "color":      user.color,
+        "version":    version,                                 # → If-Match
+    }
+
+
+def notify(op: str, booking: Booking | None = None, booking_id: int | None = None,
+           event: dict | None = None) -> int:
+    """
+    Nach dem Commit: Marker bumpen + ``op`` (created / updated / deleted)
+    an die lokalen Streams schicken.  Gibt den neuen Marker zurück.
+    Ohne ``booking``/``event`` lädt der Client sein Fenster neu.
+    """
+    if booking is not None:
+        booking_id = booking.id
+        try:
+            event = event_payload(booking)
+        except Exception:                       # noqa: BLE001 – Push ist Best-Effort
+            log.warning("Push-Payload fehlgeschlagen", exc_info=True)
+    return notify_many([(op, booking_id, event)])
+
+
+def notify_many(changes: list[tuple[str, int | None, dict | None]]) -> int:
+    """
+    Wie ``notify`` für mehrere Änderungen EINES Commits (Batch): ein
+    Marker-Bump, je ``(op, id, event)`` eine Nachricht.  Ab der zweiten ist
+    ``prev`` der neue Marker selbst – Streams sehen die Folge als lückenlos.
+    """
+    previous = booking_marker(fresh=True)
+    marker = touch_bookings()
+    try:
+        for op, booking_id, event in changes:
+            message = {"op": op, "marker": marker, "prev": previous, "id": booking_id}
+            if event is not None:
+                message["event"] = event
+            broker.publish(message)
+            previous = marker
+    except Exception:                           # noqa: BLE001 – Push ist Best-Effort
+        log.warning("Push fehlgeschlagen", exc_info=True)
+    return marker
+
+
+# ─────────────────────────────────────────────────────────────
+#  SSE-Stream
+# ─────────────────────────────────────────────────────────────
+def available() -> bool:
+    """Darf DIESER Request einen Stream öffnen?  Sonst pollt der Kalender."""
+    limit = current_app.config.get("SSE_MAX_STREAMS", 0)
+    return bool(request.environ.get("wsgi.multithread")) and len(broker) < limit
+
+
+def _frame(event: str, data: dict, marker: int | None = None) -> str:
+    head = f"event: {event}\n" + (f"id: {marker}\n" if marker else "")
+    return f"{head}data: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+def stream(last_event_id: str | None) -> Iterator[str]:
+    """SSE-Body; ``last_event_id`` = Marker, den der Client zuletzt gesehen hat."""
+    q = broker.subscribe()
+    try:
+        seen = booking_marker(fresh=True)
+        yield f"retry: {RETRY_MS}\n"
+        if last_event_id and seen and last_event_id != str(seen):
+            yield _frame("stale", {}, seen)     # verpasst während Reconnect
+        else:
+            yield _frame("hello", {}, seen)
+
+        started = last_beat = time.monotonic()
+        while time.monotonic() - started < MAX_SECONDS:
+            try:
+                message = q.get(timeout=POLL_SECONDS)
+            except queue.Empty:
+                current = booking_marker(fresh=True)
+                if current and current != seen:
+                    seen = current
+                    yield _frame("stale", {}, current)
+                elif time.monotonic() - last_beat >= HEARTBEAT:
+                    last_beat = time.monotonic()
+                    yield ": ping\n\n"
+                continue
+
+            if message["op"] != "stale":
+                yield _frame("booking", {k: message[k] for k in ("op", "id", "event")
+                                         if k in message}, message["marker"])
+            if message["op"] == "stale" or message.get("prev") != seen:
+                yield _frame("stale", {}, message["marker"])   # fremde Writes dazwischen
+            seen = message["marker"]
+    finally:
+        broker.unsubscribe(q)
@@ -5,14 +5,22 @@ from __future__ import annotations
 from datetime import date, datetime, timedelta, timezone
 from typing import Dict
 from flask import (
-    Blueprint, jsonify, redirect, render_template, url_for, flash,
-    request, abort
+    Blueprint, Response, jsonify, redirect, render_template, url_for, flash,
+    request, abort, stream_with_context
 )
 from flask_login import login_required, current_user
 from flask_wtf import csrf
-from sqlalchemy import and_
+from sqlalchemy import and_, select
+from sqlalchemy.orm import joinedload
+from app.aio import async_session, async_view, login_required_async
+from app.changes import conditional_feed, conditional_feed_async
+from app.extensions import limiter
 from app.models import db, Booking
-from .forms import BookingForm
+from app.tiered_cache import tiered
+from . import arrivals, intervals, push, writes
+from .batch import MAX_OPS, PUSH_OPS, apply_batch
+from .importer import ImportFormatError, detect_format, import_bookings
+from .forms import BookingForm, check_stay
 
 booking_bp = Blueprint("booking", __name__, template_folder="../templates/booking")
 
@@ -28,97 +36,270 @@ def _countdown(target: date) -> Dict[str, int]:
     m     = s // 60
     return {"days":d,"hours":h,"minutes":m}
 
+def _window_day(raw: str|None) -> date|None:
+    """FullCalendar-Grenze (``2025-06-30T00:00:00+02:00``) → ``date``."""
+    return date.fromisoformat(raw[:10]) if raw else None
+
 def _overlap(start: date, end: date, exclude: int|None=None) -> bool:
-    q = Booking.query.filter(Booking.start_date<=end, Booking.end_date>=start)
-    if exclude: q = q.filter(Booking.id!=exclude)
-    return db.session.query(q.exists()).scalar()
+    return intervals.overlap(start, end, exclude)   # In-Memory-Index, SQL-Fallback
 
 # ───────── Routes ─────────
 @booking_bp.route("/")
 @login_required
 def calendar():
-    next_own = (
-        Booking.query.filter(Booking.user_id==current_user.id,
-                             Booking.start_date>=date.today())
-        .order_by(Booking.start_date).first()
-    )
+    next_own = arrivals.next_arrival(current_user.id)   # gecacht (pro User & Tag)
     return render_template(
         "booking/calendar.html",
         form=BookingForm(),
         next_arrival=next_own.start_date if next_own else None,
+        stream_url=url_for("booking.stream") if push.available() else None,
     )
 
 @booking_bp.get("/events")
 @login_required
+@conditional_feed(lambda: (current_user.id, request.query_string))
 def events():
+    """
+    FullCalendar-Feed.  FullCalendar schickt bei jedem Fetch ``start`` und
+    ``end`` (exklusiv) mit → nur dieses Fenster wird geladen (nutzt
+    ``ix_booking_timerange``), User per JOIN → genau eine Query – und die
+    nur, wenn Worker-LRU und geteilter Cache die Version noch nicht kennen.
+    """
+    try:
+        win_start = _window_day(request.args.get("start"))
+        win_end   = _window_day(request.args.get("end"))
+    except ValueError:
+        return jsonify({"error":"bad date"}),400
+
+    def build() -> list[dict]:
+        return _calendar_events(db.session.scalars(_window_stmt(win_start, win_end)))
+
+    data = tiered.get_or_set(                    # Worker-LRU → Cache → DB
+        f"booking:events:{current_user.id}:{request.query_string.decode()}",
+        build, scopes=("bookings", "users"),
+    )
+    return jsonify(data)
+
+@async_view("booking.events")
+@login_required_async
+@conditional_feed_async(lambda: (current_user.id, request.query_string))
+async def events_async():
+    """``events`` auf der Async-Engine (ASGI, ``asgi.py``) – gleicher Cache-Key & ETag."""
+    try:
+        win_start = _window_day(request.args.get("start"))
+        win_end   = _window_day(request.args.get("end"))
+    except ValueError:
+        return jsonify({"error":"bad date"}),400
+
+    async def build() -> list[dict]:
+        async with async_session() as s:
+            return _calendar_events(await s.scalars(_window_stmt(win_start, win_end)))
+
+    data = await tiered.get_or_set_async(
+        f"booking:events:{current_user.id}:{request.query_string.decode()}",
+        build, scopes=("bookings", "users"),
+    )
+    return jsonify(data)
+
+def _window_stmt(win_start: date|None, win_end: date|None):
+    stmt = select(Booking).options(joinedload(Booking.user)).order_by(Booking.start_date)
+    if win_end:
+        stmt = stmt.where(Booking.start_date < win_end)
+    if win_start:
+        stmt = stmt.where(Booking.end_date >= win_start)
+    return stmt
+
+def _calendar_events(bookings) -> list[dict]:
     data=[]
-    for b in Booking.query.all():
+    for b in bookings:
         can_edit = b.user_id == current_user.id
         data.append({
-            "id":      b.id,
-            "title":   f"{b.user.name}{' – '+b.companions if b.companions else ''}",
-            "start":   b.start_date.isoformat(),
-            "end":    (b.end_date+timedelta(days=1)).isoformat(),
-            "allDay":  True,
+            **push.event_payload(b),       # gleiches Schema wie der SSE-Push
             "editable":can_edit,        # per-Event Drag/Resize-Lock  :contentReference[oaicite:2]{index=2}
             "extendedProps": {
                 "canEdit":   can_edit,
                 "companions":b.companions,
+                "version":   b.version,   # → If-Match
             },
-            "color":   b.user.color,
         })
-    return jsonify(data)
+    return data
+
+@booking_bp.get("/booking/stream")
+@login_required
+@limiter.exempt                     # EventSource verbindet sich regelmäßig neu
+def stream():
+    """
+    SSE: Buchungsänderungen live (created / updated / deleted, sonst
+    ``stale`` → Client lädt sein Fenster neu).  Details: ``booking/push.py``.
+    """
+    if not push.available():
+        return "", 204                  # EventSource gibt auf → Client pollt
+    last_id = request.headers.get("Last-Event-ID")
+    db.session.remove()                 # keine DB-Verbindung über die Stream-Dauer halten
+    return Response(
+        stream_with_context(push.stream(last_id)),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 @booking_bp.get("/booking/check-overlap")
 @login_required
 def check_overlap():
     try:
-        start=date.fromisoformat(request.args["start_date"])
-        end  =date.fromisoformat(request.args["end_date"])
+        start,end,excl=_overlap_args()
     except (KeyError,ValueError):
         return jsonify({"error":"bad date"}),400
-    excl=request.args.get("exclude_id",type=int)
     return jsonify({"overlap":_overlap(start,end,excl)})
 
+@async_view("booking.check_overlap")
+@login_required_async
+async def check_overlap_async():
+    """``check_overlap`` für den ASGI-Pfad (Index-Neuaufbau/SQL auf der Async-Engine)."""
+    try:
+        start,end,excl=_overlap_args()
+    except (KeyError,ValueError):
+        return jsonify({"error":"bad date"}),400
+    return jsonify({"overlap":await intervals.overlap_async(start,end,excl)})
+
+def _overlap_args() -> tuple[date, date, int|None]:
+    return (date.fromisoformat(request.args["start_date"]),
+            date.fromisoformat(request.args["end_date"]),
+            request.args.get("exclude_id",type=int))
+
+def _wants_json() -> bool:
+    return request.accept_mimetypes.best == "application/json"
+
 @booking_bp.post("/booking/new")
 @login_required
 def new_booking():
+    """Anlegen; Überschneidungs-Check IM Insert (``writes.py``) → 409 ohne Extra-Query."""
     form = BookingForm()
     force= request.form.get("force")=="1"
     if not form.validate_on_submit():
+        if _wants_json():
+            return jsonify({"error":"Form ungültig","fields":form.errors}),400
         flash("Form ungültig","danger"); return redirect(url_for(".calendar"))
-    if not force and _overlap(form.start_date.data,form.end_date.data):
+    start,end=form.start_date.data,form.end_date.data
+    companions=form.companions.data or None
+    bid=writes.insert_booking(db.session.connection(),current_user.id,
+                              start,end,companions,force=force)
+    if bid is None:
+        db.session.rollback()
+        if _wants_json():
+            return jsonify({"error":"Überschneidung"}),409
         flash("Überschneidung!","danger"); return redirect(url_for(".calendar"))
-    b=Booking(user_id=current_user.id,
-              start_date=form.start_date.data,
-              end_date=form.end_date.data,
-              companions=form.companions.data or None)
-    db.session.add(b); db.session.commit()
+    event=push.payload(bid,current_user,start,end,companions)   # vor dem Commit (expire)
+    db.session.commit()
+    push.notify("created", booking_id=bid, event=event)
+    if _wants_json():
+        return jsonify({"id":bid}),201
     flash("Buchung gespeichert.","success")
     return redirect(url_for(".calendar"))
 
+def _if_match() -> int | None:
+    """Erwartete Version aus ``If-Match: "<version>"`` (``None`` = unbedingt)."""
+    tags=request.if_match
+    if not tags or tags.star_tag:
+        return None
+    strong=tags.as_set()                      # schwache Tags matchen nie (RFC 9110)
+    if len(strong)!=1 or not (tag:=next(iter(strong))).isdigit():
+        abort(412)
+    return int(tag)
+
+def _why_not(bid:int, expected:int|None) -> int:
+    """Status für ein UPDATE/DELETE, das nichts traf (Fehlerpfad, max. 1 Query)."""
+    b=db.session.get(Booking,bid)
+    if b is None:
+        return 404
+    if b.user_id!=current_user.id:
+        return 403                            # Owner-Gate  :contentReference[oaicite:3]{index=3}
+    if expected is not None and b.version!=expected:
+        return 412
+    return 409                                # Konflikt mit gerade Committetem
+
 @booking_bp.patch("/booking/update/<int:bid>")
 @login_required
 def update(bid:int):
+    """
+    Ein ``UPDATE … WHERE id AND user_id [AND version] AND NOT EXISTS(Überschneidung)``.
+    Nur wenn es nichts trifft, wird der Grund bestimmt (404/403/412, sonst
+    409 = Überschneidung) – der Erfolgsfall liest die Buchung nie.
+    Antwort-ETag = neue Version (nur bei If-Match bekannt).
+    """
     csrf.validate_csrf(request.headers.get("X-CSRFToken",""))
-    b=Booking.query.get_or_404(bid)
-    if b.user_id!=current_user.id:
-        abort(403)                            # Owner-Gate  :contentReference[oaicite:3]{index=3}
-    data=request.get_json() or {}
-    start=date.fromisoformat(data["start_date"])
-    end  =date.fromisoformat(data["end_date"])
-    if not data.get("force") and _overlap(start,end,bid):
-        abort(409)
-    b.start_date,b.end_date=start,end
-    db.session.commit()
-    return "",204
+    expected=_if_match()
+    data=request.get_json(silent=True) or {}
+    try:
+        start=date.fromisoformat(data["start_date"])
+        end  =date.fromisoformat(data["end_date"])
+        check_stay(start,end)
+    except (KeyError,TypeError,ValueError):
+        abort(400)
+    force=bool(data.get("force"))
+    if writes.update_dates(db.session.connection(),bid,current_user.id,start,end,
+                           version=expected,force=force):
+        db.session.commit()
+        push.notify("updated", booking_id=bid)   # Clients laden ihr Fenster (ETag)
+        rv=Response(status=204)
+        if expected is not None:
+            rv.set_etag(str(expected+1))
+        return rv
+    db.session.rollback()
+    abort(_why_not(bid,expected))         # 404/403/412 vor 409 (Überschneidung)
 
 @booking_bp.delete("/booking/delete/<int:bid>")
 @login_required
 def delete(bid:int):
+    """Ein ``DELETE … WHERE id AND user_id [AND version]`` (If-Match → 412)."""
     csrf.validate_csrf(request.headers.get("X-CSRFToken",""))
-    b=Booking.query.get_or_404(bid)
-    if b.user_id!=current_user.id:
-        abort(403)
-    db.session.delete(b); db.session.commit()
-    return "",204
+    expected=_if_match()
+    if writes.delete_booking(db.session.connection(),bid,current_user.id,version=expected):
+        db.session.commit()
+        push.notify("deleted", booking_id=bid)
+        return "",204
+    db.session.rollback()
+    abort(_why_not(bid,expected))
+
+@booking_bp.post("/booking/batch")
+@login_required
+def batch():
+    """
+    Mehrere create/update/delete in EINER Transaktion (Details: ``batch.py``).
+    Antwort: ``{"results": [{index, op, status, id[, version][, error]}, …]}``
+    """
+    csrf.validate_csrf(request.headers.get("X-CSRFToken",""))
+    payload=request.get_json(silent=True) or {}
+    ops=payload.get("ops")
+    if not isinstance(ops,list) or not ops:
+        return jsonify({"error":"ops fehlt"}),400
+    if len(ops)>MAX_OPS:
+        return jsonify({"error":f"max. {MAX_OPS} Einträge"}),413
+    items=apply_batch(ops,current_user.id,force=bool(payload.get("force")))
+    done=[it for it in items if it.ok]
+    if done:
+        push.notify_many([(PUSH_OPS[it.op], it.id, it.event) for it in done])
+    return jsonify({"results":[it.as_dict() for it in items]})
+
+@booking_bp.post("/booking/import")
+@login_required
+def import_file():
+    """
+    Massen-Import eigener Buchungen: Multipart-Feld ``file`` oder roher
+    Body (``text/csv`` / ``application/x-ndjson``).  ?force=1, ?dry_run=1
+    """
+    upload = request.files.get("file")
+    stream = upload.stream if upload else request.stream
+    fmt    = request.args.get("format") or detect_format(
+        upload.filename if upload else None, request.mimetype)
+    try:
+        report = import_bookings(
+            stream,
+            fmt=fmt,
+            default_user_id=current_user.id,
+            restrict_user_id=current_user.id,
+            force=request.args.get("force") == "1",
+            dry_run=request.args.get("dry_run") == "1",
+        )
+    except ImportFormatError as exc:
+        return jsonify({"error":str(exc)}),400
+    return jsonify(report.as_dict())
@@ -0,0 +1,185 @@
+"""
+app/booking/stats.py  –  Inkrementell gepflegte Aufenthalts-Statistik
+────────────────────────────────────────────────────────────────────────────
+• Mapper-Events auf ``Booking`` (insert / update / delete) rechnen die
+  Differenz pro (user_id, Jahr) und schreiben sie per Upsert in
+  ``stay_stats`` – über dieselbe Connection, also in DERSELBEN
+  Transaktion wie die Buchung selbst (Rollback nimmt beides zurück).
+• ``apply_deltas()``  auch für Core-Bulk-Pfade (Importer).
+• ``refresh_user()``  Core-Updates ohne Altwerte (``writes.py``): die
+                      Zeilen EINES Users neu aus ``bookings``.
+• ``repair_nights()`` korrigiert ``bookings.nights`` (idempotent, Bootstrap).
+• ``rebuild()``       Voll-Neuaufbau (``flask bookings rebuild-stats``),
+                      ruft vorher ``repair_nights()``.
+
+Zuordnung: Jahr der Anreise; Nächte = (Ende − Start) + 1 (inklusiv).
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date
+from typing import Iterable, Mapping
+
+from sqlalchemy import (
+    Connection, delete, event, extract, func, insert, inspect, select, text, update,
+)
+
+from app.changes import touch_bookings
+from app.models import Booking, StayStat, db
+
+Key = tuple[int, int]                          # (user_id, year)
+
+
+def _stay(user_id: int, start: date, end: date) -> tuple[Key, int]:
+    return (user_id, start.year), (end - start).days + 1
+
+
+def deltas_for(rows: Iterable, sign: int = 1) -> dict[Key, list[int]]:
+    """Summen je (user_id, Jahr) für Rows mit ``user_id/start/end``-Attributen."""
+    out: dict[Key, list[int]] = defaultdict(lambda: [0, 0])
+    for r in rows:
+        key, nights = _stay(r.user_id, r.start, r.end)
+        out[key][0] += sign * nights
+        out[key][1] += sign
+    return out
+
+
+# ─────────────────────────────────────────────────────────────
+#  Upsert
+# ─────────────────────────────────────────────────────────────
+def apply_deltas(conn: Connection, deltas: Mapping[Key, list[int]]) -> None:
+    """Addiert ``[nights, bookings]`` je Schlüssel; legt fehlende an, räumt leere ab."""
+    rows = [
+        {"user_id": uid, "year": year, "nights": n, "bookings": c}
+        for (uid, year), (n, c) in deltas.items() if n or c
+    ]
+    if not rows:
+        return
+    table = StayStat.__table__
+    dialect = conn.dialect.name
+
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+        stmt = mysql_insert(table)
+        conn.execute(stmt.on_duplicate_key_update(
+            nights=table.c.nights + stmt.inserted.nights,
+            bookings=table.c.bookings + stmt.inserted.bookings,
+        ), rows)
+    elif dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        stmt = dialect_insert(table)
+        conn.execute(stmt.on_conflict_do_update(
+            index_elements=[table.c.user_id, table.c.year],
+            set_={
+                "nights": table.c.nights + stmt.excluded.nights,
+                "bookings": table.c.bookings + stmt.excluded.bookings,
+            },
+        ), rows)
+    else:                                       # generisch: UPDATE, sonst INSERT
+        for row in rows:
+            res = conn.execute(
+                update(table)
+                .where(table.c.user_id == row["user_id"], table.c.year == row["year"])
+                .values(nights=table.c.nights + row["nights"],
+                        bookings=table.c.bookings + row["bookings"])
+            )
+            if res.rowcount == 0:
+                conn.execute(insert(table).values(**row))
+
+    for row in rows:                            # leer gewordene Jahre entfernen
+        if row["bookings"] < 0:
+            conn.execute(delete(table).where(
+                table.c.user_id == row["user_id"], table.c.year == row["year"],
+                table.c.bookings <= 0,
+            ))
+
+
+# ─────────────────────────────────────────────────────────────
+#  Mapper-Events (ORM-Schreibpfade: new / update / delete)
+# ─────────────────────────────────────────────────────────────
+def _old(state, attr: str):
+    hist = state.attrs[attr].history
+    return hist.deleted[0] if hist.deleted else getattr(state.obj(), attr)
+
+
+@event.listens_for(Booking, "after_insert")
+def _booking_inserted(mapper, connection, target: Booking) -> None:   # noqa: ARG001
+    key, nights = _stay(target.user_id, target.start_date, target.end_date)
+    apply_deltas(connection, {key: [nights, 1]})
+
+
+@event.listens_for(Booking, "after_update")
+def _booking_updated(mapper, connection, target: Booking) -> None:    # noqa: ARG001
+    state = inspect(target)
+    old_key, old_n = _stay(_old(state, "user_id"), _old(state, "start_date"),
+                           _old(state, "end_date"))
+    new_key, new_n = _stay(target.user_id, target.start_date, target.end_date)
+    if (old_key, old_n) == (new_key, new_n):
+        return
+    deltas: dict[Key, list[int]] = defaultdict(lambda: [0, 0])
+    deltas[old_key][0] -= old_n
+    deltas[old_key][1] -= 1
+    deltas[new_key][0] += new_n
+    deltas[new_key][1] += 1
+    apply_deltas(connection, deltas)
+
+
+@event.listens_for(Booking, "after_delete")
+def _booking_deleted(mapper, connection, target: Booking) -> None:    # noqa: ARG001
+    key, nights = _stay(target.user_id, target.start_date, target.end_date)
+    apply_deltas(connection, {key: [-nights, -1]})
+
+
+def _aggregate():
+    year = extract("year", Booking.start_date)
+    return select(
+        Booking.user_id, year.label("year"),
+        func.sum(Booking.nights).label("nights"), func.count().label("bookings"),
+    ).group_by(Booking.user_id, year)
+
+
+def refresh_user(conn: Connection, user_id: int) -> None:
+    """Stats eines Users neu berechnen (2 Statements, O(Buchungen des Users))."""
+    table = StayStat.__table__
+    conn.execute(delete(table).where(table.c.user_id == user_id))
+    conn.execute(insert(table).from_select(
+        ["user_id", "year", "nights", "bookings"],
+        _aggregate().where(Booking.user_id == user_id),
+    ))
+
+
+# ─────────────────────────────────────────────────────────────
+#  Voll-Neuaufbau
+# ─────────────────────────────────────────────────────────────
+_NIGHTS_SQL = {
+    "mysql": "DATEDIFF(end_date, start_date) + 1",
+    "sqlite": "CAST(julianday(end_date) - julianday(start_date) AS INTEGER) + 1",
+    "postgresql": "(end_date - start_date) + 1",
+}
+
+
+def repair_nights(conn: Connection) -> int:
+    """Setzt abweichende ``bookings.nights`` neu; Anzahl korrigierter Zeilen."""
+    if not (expr := _NIGHTS_SQL.get(conn.dialect.name)):
+        return 0
+    return conn.execute(text(
+        f"UPDATE bookings SET nights = {expr} WHERE nights <> {expr}"
+    )).rowcount
+
+
+def rebuild() -> dict:
+    """Setzt ``bookings.nights`` neu und baut ``stay_stats`` aus ``bookings`` auf."""
+    conn = db.session.connection()
+    fixed = repair_nights(conn)
+
+    conn.execute(delete(StayStat))
+    conn.execute(
+        insert(StayStat).from_select(["user_id", "year", "nights", "bookings"], _aggregate())
+    )
+    rows = db.session.scalar(select(func.count()).select_from(StayStat))
+    db.session.commit()
+    touch_bookings()                            # Stats-ETags verwerfen
+    return {"nights_fixed": fixed, "rows": rows}
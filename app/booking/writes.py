@@ -0,0 +1,121 @@
+"""
+app/booking/writes.py  –  Überschneidungs-geschützte Writes in EINEM Statement
+────────────────────────────────────────────────────────────────────────────
+Statt „``_overlap()`` prüfen, dann schreiben“ (zwei Round-Trips, und zwei
+gleichzeitige Bucher kommen beide durch) steckt die Prüfung im Write:
+
+    INSERT INTO bookings (…) SELECT :user, :start, … FROM DUAL
+     WHERE NOT EXISTS (SELECT 1 FROM (SELECT id FROM bookings
+                                       WHERE start_date <= :end
+                                         AND end_date >= :start) AS o)
+
+    UPDATE bookings SET start_date = :start, end_date = :end, nights = …
+     WHERE id = :id AND user_id = :user AND NOT EXISTS (… AND id <> :id)
+
+``rowcount == 0`` ⇒ Konflikt (bzw. fremd/unbekannt beim Update) – ohne
+weitere Query.  Die abgeleitete Tabelle umgeht MySQL-Fehler 1093 (Ziel-
+tabelle im Subselect).
+
+Optimistic Locking: ``version`` (If-Match) kommt als ``AND version = :v``
+in dasselbe UPDATE/DELETE, jedes UPDATE setzt ``version = version + 1``
+→ ein Round-Trip je Edit, keine verlorenen Änderungen zweier Kalender.
+
+Zuerst zieht der Write die neue Log-Version (``changelog.next_version``):
+dieses ``UPDATE sync_counters`` sperrt die Zähler-Zeile bis zum Commit →
+Booking-Writer laufen nacheinander.  Aktuell ist der Guard, weil InnoDB
+die Subquery eines INSERT … SELECT / UPDATE als Locking Read ausführt
+(neuester committeter Stand) – ein älterer Snapshot der Transaktion, etwa
+aus ``load_identity``, spielt keine Rolle.  Stats und Änderungs-Log folgen
+in derselben Transaktion (Core umgeht Mapper-Events).
+"""
+from __future__ import annotations
+
+from datetime import date, datetime
+
+from sqlalchemy import Connection, delete, exists, insert, literal, select, update
+
+from app.models import Booking
+from . import changelog, stats
+from .stats import Key
+
+
+def _nights(start: date, end: date) -> int:
+    return (end - start).days + 1
+
+
+def _free(start: date, end: date, exclude: int | None = None):
+    """``NOT EXISTS`` überlappende Buchung (als abgeleitete Tabelle)."""
+    other = select(Booking.id).where(Booking.start_date <= end, Booking.end_date >= start)
+    if exclude is not None:
+        other = other.where(Booking.id != exclude)
+    return ~exists(select(literal(1)).select_from(other.subquery("o")))
+
+
+def insert_booking(conn: Connection, user_id: int, start: date, end: date,
+                   companions: str | None = None, *, force: bool = False) -> int | None:
+    """Neue Buchung anlegen; ``None`` bei Überschneidung (außer ``force``)."""
+    version = changelog.next_version(conn)                 # Schreibsperre
+    values = {"user_id": user_id, "start_date": start, "end_date": end,
+              "companions": companions, "nights": _nights(start, end),
+              "created_at": datetime.utcnow()}
+    table = Booking.__table__
+    if force:
+        stmt = insert(table).values(**values)
+    else:
+        stmt = insert(table).from_select(
+            list(values),
+            select(*(literal(v, table.c[k].type) for k, v in values.items()))
+            .where(_free(start, end)),
+        )
+    res = conn.execute(stmt)
+    if res.rowcount == 0:
+        return None
+
+    booking_id = res.lastrowid
+    key: Key = (user_id, start.year)
+    stats.apply_deltas(conn, {key: [values["nights"], 1]})
+    changelog.record(conn, booking_id, "upsert", version)
+    return booking_id
+
+
+def update_dates(conn: Connection, booking_id: int, user_id: int, start: date, end: date,
+                 *, version: int | None = None, force: bool = False) -> bool:
+    """
+    Daten einer EIGENEN Buchung setzen (nur in ``version``, falls gegeben).
+    ``False`` = nichts geändert (unbekannt, fremd, veraltet oder
+    Überschneidung) – Unterscheidung beim Aufrufer.
+    """
+    log_version = changelog.next_version(conn)             # Schreibsperre
+    table = Booking.__table__
+    stmt = (
+        update(table)
+        .where(table.c.id == booking_id, table.c.user_id == user_id)
+        .values(start_date=start, end_date=end, nights=_nights(start, end),
+                version=table.c.version + 1)
+    )
+    if version is not None:
+        stmt = stmt.where(table.c.version == version)
+    if not force:
+        stmt = stmt.where(_free(start, end, exclude=booking_id))
+    if conn.execute(stmt).rowcount == 0:
+        return False
+
+    stats.refresh_user(conn, user_id)                      # Altwerte unbekannt
+    changelog.record(conn, booking_id, "upsert", log_version)
+    return True
+
+
+def delete_booking(conn: Connection, booking_id: int, user_id: int,
+                   *, version: int | None = None) -> bool:
+    """EIGENE Buchung löschen (nur in ``version``, falls gegeben)."""
+    log_version = changelog.next_version(conn)
+    table = Booking.__table__
+    stmt = delete(table).where(table.c.id == booking_id, table.c.user_id == user_id)
+    if version is not None:
+        stmt = stmt.where(table.c.version == version)
+    if conn.execute(stmt).rowcount == 0:
+        return False
+
+    stats.refresh_user(conn, user_id)
+    changelog.record(conn, booking_id, "delete", log_version)
+    return True
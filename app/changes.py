@@ -0,0 +1,230 @@
+"""
+app/changes.py  –  Änderungsmarker + Conditional GET für die Event-Feeds
+────────────────────────────────────────────────────────────────────────────
+• Versions-Marker pro Bereich (``bookings``, ``users``) – ns-Zeitstempel der
+  letzten Änderung im geteilten ``cache`` (SimpleCache in Dev, Redis in
+  Prod → gilt für alle Worker).  ``markers()`` liest beide mit EINEM
+  ``get_many`` und merkt sie sich für den Rest des Requests.
+  ``cached_markers(max_age)`` liefert ohne I/O die zuletzt gelesenen Werte
+  dieses Prozesses (lokale ``touch()`` sofort eingerechnet) – für Hot Paths
+  wie den Overlap-Check, die fremde Writes ``max_age`` später sehen dürfen.
+• ``touch_bookings()``  wird von jedem Buchungs-Schreibpfad NACH dem Commit
+  gerufen; ``touch_after_commit(session, scope)`` bumpt erst, wenn die
+  Session committet (User-Mapper-Events in ``auth.identity``).
+• ``@conditional_feed`` beantwortet unveränderte Polls mit 304, ohne ORM
+  oder JSON-Encoder anzufassen (ETag + Last-Modified; Letzteres erst, wenn
+  die Sekunde des Markers vorbei ist – HTTP-Daten haben nur Sekunden);
+  ``@conditional_feed_async`` dasselbe für den ASGI-Pfad (``app.aio``).
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import time
+from datetime import datetime, timezone
+from functools import wraps
+from typing import Callable, Iterable
+
+from flask import current_app, g, has_app_context, make_response, request
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.aio import run_sync
+from app.extensions import cache
+
+log = logging.getLogger(__name__)
+
+BOOKINGS_KEY = "familia:bookings:marker"
+USERS_KEY    = "familia:users:marker"
+MARKER_KEYS  = {"bookings": BOOKINGS_KEY, "users": USERS_KEY}
+
+_local: tuple[float, dict[str, int]] | None = None      # (monotonic, Marker) – prozessweit
+
+
+# ───────── Marker ─────────
+def markers(*, fresh: bool = False) -> dict[str, int] | None:
+    """
+    Aktuelle Marker aller Bereiche (ein Roundtrip, pro Request gemerkt;
+    ``fresh=True`` liest trotzdem neu – lang laufende Streams).
+    Fehlt ein Schlüssel (Cache-Neustart), wird ein frischer gesetzt → alle
+    alten ETags/Einträge verfallen.  ``None``, wenn das Backend nicht
+    erreichbar ist.
+    """
+    if not fresh and has_app_context() and "_familia_markers" in g:
+        return g._familia_markers
+    try:
+        values = dict(zip(MARKER_KEYS, cache.get_many(*MARKER_KEYS.values())))
+        for scope, value in values.items():
+            if value is None:
+                cache.add(MARKER_KEYS[scope], time.time_ns(), timeout=0)
+                values[scope] = cache.get(MARKER_KEYS[scope])
+    except Exception:                                    # noqa: BLE001
+        log.warning("Änderungsmarker nicht lesbar", exc_info=True)
+        return None
+    if any(v is None for v in values.values()):
+        return None
+    result = {scope: int(v) for scope, v in values.items()}
+    global _local
+    _local = (time.monotonic(), result)
+    if has_app_context():
+        g._familia_markers = result
+    return result
+
+
+def cached_markers(max_age: float) -> dict[str, int] | None:
+    """Zuletzt gelesene Marker dieses Prozesses, wenn jünger als ``max_age`` s (kein I/O)."""
+    local = _local
+    if local is not None and time.monotonic() - local[0] < max_age:
+        return local[1]
+    return None
+
+
+def booking_marker(*, fresh: bool = False) -> int | None:
+    """Aktueller Marker der Buchungs-Tabelle (``None`` = Cache weg)."""
+    current = markers(fresh=fresh)
+    return current["bookings"] if current else None
+
+
+def touch(scope: str) -> int:
+    """Markiert einen Bereich als geändert (nach dem Commit!)."""
+    marker = time.time_ns()
+    try:
+        cache.set(MARKER_KEYS[scope], marker, timeout=0)
+    except Exception:                                    # noqa: BLE001
+        log.warning("Marker %s nicht schreibbar", scope, exc_info=True)
+    global _local
+    if (local := _local) is not None:                    # eigener Prozess sieht's sofort
+        _local = (local[0], {**local[1], scope: marker})
+    if has_app_context():
+        g.pop("_familia_markers", None)                  # eigener Request sieht's sofort
+    return marker
+
+
+def touch_bookings() -> int:
+    """Markiert die Buchungs-Tabelle als geändert (nach jedem Commit)."""
+    return touch("bookings")
+
+
+def touch_users() -> int:
+    """Markiert die User-Tabelle als geändert (Namen, Farben, Roster)."""
+    return touch("users")
+
+
+def touch_after_commit(session: Session | None, scope: str) -> None:
+    """Bump für ``scope`` vormerken – ausgeführt nach erfolgreichem Commit."""
+    if session is not None:
+        session.info.setdefault("familia_touch", set()).add(scope)
+
+
+@event.listens_for(Session, "after_commit")
+def _touch_pending(session: Session) -> None:
+    for scope in session.info.pop("familia_touch", ()):
+        touch(scope)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_pending(session: Session) -> None:
+    session.info.pop("familia_touch", None)
+
+
+# ───────── Conditional GET ─────────
+def _etag(marker: str, parts: Iterable) -> str:
+    raw = "|".join([request.endpoint or "", marker, *map(str, parts)])
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+_ENCODINGS = ("br", "zstd", "gzip", "deflate")   # Flask-Compress hängt ":<algo>" an
+
+
+def _not_modified(etag: str, modified: datetime | None) -> str | None:
+    """Passender Client-Tag (ggf. mit Encoding-Suffix) oder ``None``."""
+    # If-None-Match hat Vorrang vor If-Modified-Since (RFC 9110 §13.2.2)
+    if request.if_none_match:
+        for tag in (etag, *(f"{etag}:{enc}" for enc in _ENCODINGS)):
+            if request.if_none_match.contains_weak(tag):
+                return tag
+        return None
+    if modified and request.if_modified_since and modified <= request.if_modified_since:
+        return etag
+    return None
+
+
+def _feed_state(parts: Iterable) -> tuple[str, datetime | None] | None:
+    """
+    ``(ETag, Last-Modified)`` des Feeds – ``None``, wenn die Marker fehlen.
+    Last-Modified ist ``None``, solange die Sekunde des Markers (+1 s für
+    Uhr-Versatz zwischen Hosts) läuft: ein zweiter Write darin hätte
+    dasselbe Datum → falsches 304 für Clients nur mit If-Modified-Since.
+    """
+    current = markers()
+    if current is None:
+        return None
+    etag    = _etag(f"{current['bookings']}.{current['users']}", parts)
+    seconds = max(current.values()) // 1_000_000_000
+    if seconds + 1 >= time.time_ns() // 1_000_000_000:
+        return etag, None
+    return etag, datetime.fromtimestamp(seconds, timezone.utc)
+
+
+def _revalidate(rv, modified: datetime | None):
+    if modified is not None:
+        rv.last_modified = modified
+    rv.cache_control.private  = True
+    rv.cache_control.no_cache = True                      # immer revalidieren
+    return rv
+
+
+def _cached_or_none(etag: str, modified: datetime | None):
+    """304 für den passenden Client-Tag, sonst ``None`` (View ausführen)."""
+    matched = _not_modified(etag, modified)
+    if not matched:
+        return None
+    rv = current_app.response_class(status=304)
+    rv.set_etag(matched)                                  # Encoding-Variante bestätigen
+    rv.vary.add("Accept-Encoding")
+    return _revalidate(rv, modified)
+
+
+def _validated(rv, etag: str, modified: datetime | None):
+    if rv.status_code != 200:
+        return rv
+    rv.set_etag(etag)
+    return _revalidate(rv, modified)
+
+
+def conditional_feed(variant: Callable[[], Iterable]):
+    """
+    Decorator für JSON-Feeds: starker ETag aus Endpoint, Booking-/User-Marker
+    und ``variant()`` (alles, was die Antwort sonst beeinflusst – User,
+    Query-String, Datum …).  Treffer → 304 ohne View-Aufruf.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            state = _feed_state(variant())
+            if state is None:
+                return view(*args, **kwargs)
+            etag, modified = state
+            if (rv := _cached_or_none(etag, modified)) is not None:
+                return rv
+            g.feed_etag = etag                            # → FeedCompress-Cache
+            return _validated(make_response(view(*args, **kwargs)), etag, modified)
+        return wrapper
+    return decorator
+
+
+def conditional_feed_async(variant: Callable[[], Iterable]):
+    """``conditional_feed`` für Async-Views (``app.aio``) – gleiche ETags."""
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(*args, **kwargs):
+            state = await run_sync(lambda: _feed_state(variant()))   # Marker: Redis
+            if state is None:
+                return await view(*args, **kwargs)
+            etag, modified = state
+            if (rv := _cached_or_none(etag, modified)) is not None:
+                return rv
+            g.feed_etag = etag
+            return _validated(make_response(await view(*args, **kwargs)), etag, modified)
+        return wrapper
+    return decorator
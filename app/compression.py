@@ -0,0 +1,142 @@
+"""
+app/compression.py  –  Antwort-Kompression (br / zstd / gzip)
+────────────────────────────────────────────────────────────────────────────
+• Dynamisch: Flask-Compress handelt ``Accept-Encoding`` aus (Reihenfolge
+  ``COMPRESS_ALGORITHM``).  ``FeedCompress`` legt komprimierte Feed-Bodies
+  neben ihrem ETag im ``tiered``-Cache ab → ein wiederholter 200er kostet
+  keine CPU (Schlüssel = ETag aus ``@conditional_feed`` + Algorithmus).
+• Statisch: ``serve_precompressed()`` ersetzt die ``static``-View; zu jeder
+  Datei wird EINMAL ``.br`` / ``.zst`` / ``.gz`` (höchste Stufe) daneben
+  geschrieben – beim ersten Request oder vorab per
+
+      flask precompress-static
+
+  Danach liefert ``send_from_directory`` die fertige Datei aus (inkl.
+  ETag/Range), Flask-Compress fasst sie nicht mehr an.
+• Streams (SSE, ``/api/events?stream=1``) bleiben unkomprimiert
+  (``COMPRESS_STREAMS = False``) – sonst würde der Body gepuffert.
+"""
+from __future__ import annotations
+
+import gzip
+import logging
+import mimetypes
+import os
+from pathlib import Path
+
+import click
+from flask import Flask, g, request, send_from_directory
+from flask_compress import Compress
+from flask_compress.flask_compress import _choose_algorithm
+from werkzeug.security import safe_join
+
+from app.tiered_cache import tiered
+
+log = logging.getLogger(__name__)
+
+SUFFIX = {"br": ".br", "zstd": ".zst", "gzip": ".gz"}
+ENCODINGS = ("br", "zstd", "gzip", "deflate")     # mögliche ETag-Suffixe
+
+
+def _compress_max(data: bytes, algorithm: str) -> bytes:
+    """Höchste Stufe – nur für statische Dateien (einmalig)."""
+    if algorithm == "br":
+        import brotli
+        return brotli.compress(data, quality=11)
+    if algorithm == "zstd":
+        import pyzstd
+        return pyzstd.compress(data, 19)
+    return gzip.compress(data, 9, mtime=0)
+
+
+# ─────────────────────────────────────────────────────────────
+#  Dynamisch: komprimierte Feeds neben dem ETag cachen
+# ─────────────────────────────────────────────────────────────
+class FeedCompress(Compress):
+    """Flask-Compress + Cache für Antworten mit Feed-ETag (``g.feed_etag``)."""
+
+    def compress(self, app, response, algorithm):
+        compress = super().compress
+        etag = g.get("feed_etag")
+        if not etag:
+            return compress(app, response, algorithm)
+        return tiered.get_or_set(
+            f"compressed:{algorithm}:{etag}",
+            lambda: compress(app, response, algorithm),
+            scopes=(),                        # ETag enthält die Marker bereits
+        )
+
+
+# ─────────────────────────────────────────────────────────────
+#  Statisch: vorkomprimierte Geschwister-Dateien
+# ─────────────────────────────────────────────────────────────
+def ensure_precompressed(folder: str, filename: str, algorithm: str,
+                         min_size: int = 500) -> str | None:
+    """
+    Relativer Pfad der ``algorithm``-Variante (bei Bedarf erzeugt) oder
+    ``None`` (zu klein, Quelle fehlt, Ordner nicht beschreibbar).
+    """
+    src = safe_join(folder, filename)
+    if src is None or not os.path.isfile(src):
+        return None
+    target = src + SUFFIX[algorithm]
+    try:
+        st = os.stat(src)
+        if st.st_size < min_size:
+            return None
+        if not os.path.exists(target) or os.stat(target).st_mtime < st.st_mtime:
+            data = _compress_max(Path(src).read_bytes(), algorithm)
+            tmp = f"{target}.{os.getpid()}.tmp"
+            Path(tmp).write_bytes(data)
+            os.replace(tmp, target)                      # atomar (mehrere Worker)
+    except OSError:
+        log.warning("Vorkomprimieren fehlgeschlagen: %s", src, exc_info=True)
+        return None
+    return filename + SUFFIX[algorithm]
+
+
+def serve_precompressed(app: Flask) -> None:
+    """Ersetzt die ``static``-View durch eine, die vorkomprimierte Dateien liefert."""
+    original = app.view_functions["static"]
+    folder = app.static_folder
+    algorithms = tuple(a for a in app.config["COMPRESS_ALGORITHM"] if a in SUFFIX)
+    mimetypes_ok = set(app.config["COMPRESS_MIMETYPES"])
+    min_size = app.config["COMPRESS_MIN_SIZE"]
+
+    def static(filename: str):
+        algorithm = _choose_algorithm(algorithms, request.headers.get("Accept-Encoding", ""))
+        mimetype = mimetypes.guess_type(filename)[0]
+        if algorithm and mimetype in mimetypes_ok:
+            variant = ensure_precompressed(folder, filename, algorithm, min_size)
+            if variant:
+                rv = send_from_directory(folder, variant, mimetype=mimetype,
+                                         max_age=app.get_send_file_max_age(filename))
+                rv.headers["Content-Encoding"] = algorithm
+                rv.vary.add("Accept-Encoding")
+                return rv
+        return original(filename=filename)
+
+    app.view_functions["static"] = static
+
+
+@click.command("precompress-static")
+@click.option("--force", is_flag=True, help="Auch aktuelle Varianten neu schreiben.")
+def precompress_command(force: bool) -> None:
+    """Schreibt .br/.zst/.gz neben alle komprimierbaren Static-Dateien."""
+    from flask import current_app
+
+    folder = current_app.static_folder
+    mimetypes_ok = set(current_app.config["COMPRESS_MIMETYPES"])
+    count = 0
+    for path in Path(folder).rglob("*"):
+        if not path.is_file() or path.suffix in SUFFIX.values():
+            continue
+        if mimetypes.guess_type(path.name)[0] not in mimetypes_ok:
+            continue
+        rel = path.relative_to(folder).as_posix()
+        for algorithm in SUFFIX:
+            if force:
+                Path(str(path) + SUFFIX[algorithm]).unlink(missing_ok=True)
+            if ensure_precompressed(folder, rel, algorithm, current_app.config["COMPRESS_MIN_SIZE"]):
+                count += 1
+    click.echo(f"✓ {count} vorkomprimierte Varianten in {folder}")
@@ -0,0 +1,76 @@
+"""
+app/extensions.py  –  Flask-Extensions ohne App-Bindung
+────────────────────────────────────────────────────────────
+Die Objekte werden hier nur instanziiert; ``create_app()`` bindet sie
+per ``init_app``.  So können Blueprints & Helfer (z. B. ``app.changes``)
+``cache`` importieren, ohne einen Zirkel-Import über ``app/__init__``.
+
+``cache`` braucht jeder Prozess (Änderungsmarker); Limiter, Talisman,
+Compress, Assets, Babel und Migrate entstehen erst beim ersten Zugriff (PEP 562) – CLI &
+Skripte importieren flask_limiter (→ rich, pygments), Web-Worker
+flask_migrate (→ alembic, mako) damit gar nicht.
+"""
+
+from __future__ import annotations
+
+from flask_caching import Cache
+
+cache = Cache(with_jinja2_ext=False)        # {% cache %}: app.templating (tiered)
+
+
+def _assets():
+    from flask_assets import Environment
+    return Environment()
+
+
+def _babel():
+    from flask_babel import Babel
+    return Babel()
+
+
+def _migrate():
+    from flask_migrate import Migrate
+    return Migrate()
+
+
+def _limiter():
+    from flask_limiter import Limiter
+    from flask_limiter.util import get_remote_address
+    return Limiter(
+        key_func=get_remote_address,
+        default_limits=["200/day", "50/hour"],
+        # Storage setzt create_app() (RATELIMIT_STORAGE_URI): Default ist eine
+        # SQLite-WAL-Datei im privaten Instance-Ordner, von allen Workern des
+        # Hosts geteilt – s. app/ratelimit_storage.py
+    )
+
+
+def _compress():
+    from .compression import FeedCompress             # Flask-Compress + Feed-Cache
+    return FeedCompress()
+
+
+def _talisman():
+    from flask_talisman import Talisman
+    return Talisman(
+        content_security_policy_nonce_in=["script"],   # ▶ fügt Nonce in <script>
+        force_https=True,
+    )
+
+
+_LAZY = {
+    "assets": _assets,
+    "babel": _babel,
+    "compress": _compress,
+    "limiter": _limiter,
+    "migrate": _migrate,
+    "talisman": _talisman,
+}
+
+
+def __getattr__(name: str):
+    factory = _LAZY.get(name)
+    if factory is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = globals()[name] = factory()          # einmalig, danach normales Attribut
+    return value
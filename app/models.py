@@ -3,10 +3,13 @@
 app/models.py  –  Zentrales Datenmodell der Beach-House-App
 ────────────────────────────────────────────────────────────────────────────
 Enthält:
-• SQLAlchemy-Basiskonfiguration (db, migrate, login_manager)
-• Models: Family, User, Booking, Invitation
+• SQLAlchemy-Basiskonfiguration (db, login_manager; migrate → app/extensions.py)
+• Models: Family, User, Booking, Invitation, StayStat, BookingChange, SyncCounter
 • Hilfs- und Validierungsmethoden (overlaps, set_password, check_password)
 Nur behutsame Erweiterung: Booking.nights + Booking.duration
+Booking.nights wird bei jedem ORM-Insert/-Update aus den Daten gesetzt;
+StayStat pflegt ``app.booking.stats`` inkrementell mit, BookingChange
+``app.booking.changelog`` (Versionen für ``/api/events?since=``).
 """
 from __future__ import annotations
 
@@ -15,14 +18,12 @@ from typing import Dict
 
 from flask_login import LoginManager, UserMixin
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
-from sqlalchemy import CheckConstraint, Index, UniqueConstraint
+from sqlalchemy import CheckConstraint, Index, UniqueConstraint, event
 from werkzeug.security import generate_password_hash, check_password_hash
 
 # ──────────────────────────────────────────────────────────────────────────
 # Basis-Objekte für App-Factory
 db = SQLAlchemy()
-migrate = Migrate()
 login_manager = LoginManager()
 login_manager.login_view = "auth.login"   # Endpunkt für @login_required-Redirect
 
@@ -84,9 +85,14 @@ class Booking(db.Model):
     companions = db.Column(db.String(255))          # optionale Begleitpersonen
     nights     = db.Column(db.Integer, nullable=False, default=1, server_default="1")  # NEU
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    version    = db.Column(db.Integer, nullable=False, server_default="1")  # Optimistic Locking
 
     user = db.relationship("User", backref="bookings")
 
+    # ORM-Updates/Deletes prüfen & erhöhen ``version`` selbst (StaleDataError);
+    # Core-Writes (app/booking/writes.py) setzen ``version = version + 1``.
+    __mapper_args__ = {"version_id_col": version}
+
     __table_args__ = (
         CheckConstraint("end_date >= start_date", name="ck_booking_date_order"),
         Index("ix_booking_timerange", "start_date", "end_date"),
@@ -111,6 +117,63 @@ class Booking(db.Model):
         return (self.end_date - self.start_date).days + 1
 
 
+@event.listens_for(Booking, "before_insert")
+@event.listens_for(Booking, "before_update")
+def _sync_nights(mapper, connection, target: Booking) -> None:   # noqa: ARG001
+    """``nights`` folgt immer den Daten – kein Schreibpfad muss daran denken."""
+    if target.start_date and target.end_date:
+        target.nights = target.duration
+
+
+class StayStat(db.Model):
+    """
+    Vorberechnete Aufenthalts-Summen pro User & Jahr (Jahr der Anreise).
+
+    Familien-Summen entstehen beim Lesen per JOIN auf ``users`` – ein
+    Familienwechsel verschiebt die Statistik damit automatisch mit.
+    """
+    __tablename__ = "stay_stats"
+
+    user_id  = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"),
+                         primary_key=True)
+    year     = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    nights   = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    bookings = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+
+    __table_args__ = (
+        Index("ix_stay_stats_year", "year"),
+    )
+
+
+class BookingChange(db.Model):
+    """
+    Änderungs-Log der Buchungen, kompakt: EINE Zeile je Buchung mit ihrer
+    letzten Version (``upsert`` oder Tombstone ``delete``).  Kein FK – die
+    Zeile überlebt das Löschen der Buchung.
+    """
+    __tablename__ = "booking_changes"
+
+    booking_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    version    = db.Column(db.BigInteger, nullable=False)
+    op         = db.Column(db.String(6), nullable=False)          # upsert | delete
+    changed_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index("ix_booking_changes_version", "version"),
+    )
+
+
+class SyncCounter(db.Model):
+    """
+    Monoton steigende Zähler (``name`` → ``value``).  Das UPDATE sperrt die
+    Zeile bis zum Commit → Versionen werden in Commit-Reihenfolge vergeben.
+    """
+    __tablename__ = "sync_counters"
+
+    name  = db.Column(db.String(32), primary_key=True)
+    value = db.Column(db.BigInteger, nullable=False, default=0, server_default="0")
+
+
 class Invitation(db.Model):
     __tablename__ = "invitations"
 
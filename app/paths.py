@@ -0,0 +1,21 @@
+"""
+app/paths.py  –  Private Verzeichnisse für Laufzeitdateien
+────────────────────────────────────────────────────────────────────────────
+Jinja-Bytecode und Rate-Limit-Zähler liegen als Dateien auf der lokalen
+Platte.  Wer sie vorab anlegen oder verlinken kann, führt Code aus bzw.
+setzt Limits zurück – das Verzeichnis muss daher uns allein gehören.
+"""
+from __future__ import annotations
+
+import os
+import stat
+
+
+def private_dir(directory: str) -> str:
+    """``directory`` (0700) anlegen; fremder Besitzer, Symlink oder Rechte für andere → ``OSError``."""
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    if os.name == "posix":
+        st = os.lstat(directory)
+        if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o077:
+            raise OSError(f"Verzeichnis nicht privat: {directory}")
+    return directory
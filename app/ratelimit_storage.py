@@ -0,0 +1,159 @@
+"""
+app/ratelimit_storage.py  –  Flask-Limiter-Storage über SQLite (WAL)
+────────────────────────────────────────────────────────────────────────────
+``memory://`` zählt pro Gunicorn-Worker → bei N Workern gilt faktisch das
+N-fache Limit.  Diese Storage legt die Zähler in EINE lokale SQLite-Datei
+(WAL, ``synchronous=OFF``), die sich alle Worker-Prozesse eines Hosts
+teilen – ohne Redis, ohne Netzwerk-Hop.
+
+• Default (``storage_url()``): ``<instance>/ratelimit/counters.sqlite`` –
+  Verzeichnis 0700, Besitzer geprüft (``app.paths.private_dir``), denn wer
+  die Datei vorab anlegen oder verlinken kann, setzt Limits zurück oder
+  sperrt sie.  Ist es nicht nutzbar: ``memory://`` mit Warnung.
+• ``RATELIMIT_STORAGE_URL`` (``sqlite:///pfad``, ``memory://``, ``redis://…``)
+  überschreibt den Default.  Eine SQLite-Datei wird mit 0600 angelegt bzw.
+  abgelehnt, wenn sie ein Symlink ist, fremd gehört oder für andere
+  schreibbar ist.
+
+• ``incr`` ist EIN Statement (UPSERT … RETURNING, SQLite ≥ 3.35): Ablauf,
+  Neustart des Fensters und Inkrement atomar – typisch < 0,1 ms.
+• Eine Verbindung pro Thread & Prozess (nach ``fork`` neu aufgebaut).
+• Abgelaufene Zähler räumt gelegentlich ein ``DELETE`` ab.
+• Unterstützt die Strategie ``fixed-window`` (Flask-Limiter-Default).
+
+Registriert das Schema ``sqlite`` beim Import (``limits``-Registry).
+"""
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import stat
+import threading
+import time
+
+from flask import Flask
+from limits.storage import Storage
+
+from app.paths import private_dir
+
+log = logging.getLogger(__name__)
+
+_PURGE_EVERY = 60.0                  # Sekunden zwischen Aufräum-Läufen (pro Prozess)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS counters (
+    key    TEXT PRIMARY KEY,
+    value  INTEGER NOT NULL,
+    expiry REAL    NOT NULL
+) WITHOUT ROWID
+"""
+
+_INCR = """
+INSERT INTO counters (key, value, expiry) VALUES (:key, :amount, :now + :expiry)
+ON CONFLICT (key) DO UPDATE SET
+    value  = CASE WHEN counters.expiry <= :now THEN excluded.value
+                  ELSE counters.value + excluded.value END,
+    expiry = CASE WHEN counters.expiry <= :now THEN excluded.expiry
+                  ELSE counters.expiry END
+RETURNING value
+"""
+
+
+def storage_url(app: Flask) -> str:
+    """``RATELIMIT_STORAGE_URL`` oder die SQLite-Datei im Instance-Ordner (privat)."""
+    if (url := os.getenv("RATELIMIT_STORAGE_URL")):
+        return url
+    try:
+        directory = private_dir(os.path.join(app.instance_path, "ratelimit"))
+    except OSError:
+        log.warning("Rate-Limit-Verzeichnis nicht nutzbar → memory://", exc_info=True)
+        return "memory://"
+    return f"sqlite:///{os.path.join(directory, 'counters.sqlite')}"
+
+
+def _own_file(path: str) -> None:
+    """Datei mit 0600 anlegen bzw. prüfen: kein Symlink, eigener Besitzer, nur für uns schreibbar."""
+    flags = os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, "O_NOFOLLOW", 0)
+    try:
+        os.close(os.open(path, flags, 0o600))
+    except FileExistsError:
+        pass
+    if os.name == "posix":
+        st = os.lstat(path)
+        if not stat.S_ISREG(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o022:
+            raise OSError(f"Rate-Limit-Datei nicht privat: {path}")
+
+
+class SQLiteStorage(Storage):
+    """Prozess-übergreifende Zähler in einer SQLite-Datei (``sqlite:///pfad``)."""
+
+    STORAGE_SCHEME = ["sqlite"]
+
+    def __init__(self, uri: str, wrap_exceptions: bool = False, **options):
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        self.path = uri.split("://", 1)[1][1:] or ":memory:"    # sqlite:///<pfad>
+        if self.path != ":memory:":
+            _own_file(self.path)
+        self.timeout = float(options.get("timeout", 1.0))
+        self._local = threading.local()
+        self._next_purge = 0.0
+        self._conn()                                            # Schema sofort anlegen
+
+    @property
+    def base_exceptions(self) -> type[Exception]:
+        return sqlite3.Error
+
+    # ── Verbindung ───────────────────────────────────────────
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        conn = sqlite3.connect(self.path, timeout=self.timeout,
+                               isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=OFF")          # Zähler, keine Buchhaltung
+        conn.execute(_SCHEMA)
+        self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def _maybe_purge(self, now: float) -> None:
+        if now < self._next_purge:
+            return
+        self._next_purge = now + _PURGE_EVERY
+        self._conn().execute("DELETE FROM counters WHERE expiry <= ?", (now,))
+
+    # ── Storage-API ──────────────────────────────────────────
+    def incr(self, key: str, expiry: float, amount: int = 1) -> int:
+        now = time.time()
+        self._maybe_purge(now)
+        row = self._conn().execute(
+            _INCR, {"key": key, "amount": amount, "now": now, "expiry": expiry}
+        ).fetchone()
+        return row[0]
+
+    def get(self, key: str) -> int:
+        row = self._conn().execute(
+            "SELECT value FROM counters WHERE key = ? AND expiry > ?", (key, time.time())
+        ).fetchone()
+        return row[0] if row else 0
+
+    def get_expiry(self, key: str) -> float:
+        now = time.time()
+        row = self._conn().execute(
+            "SELECT expiry FROM counters WHERE key = ? AND expiry > ?", (key, now)
+        ).fetchone()
+        return row[0] if row else now
+
+    def check(self) -> bool:
+        try:
+            self._conn().execute("SELECT 1")
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self) -> int | None:
+        return self._conn().execute("DELETE FROM counters").rowcount
+
+    def clear(self, key: str) -> None:
+        self._conn().execute("DELETE FROM counters WHERE key = ?", (key,))
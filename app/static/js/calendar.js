@@ -16,6 +16,7 @@
       DELETE: [40, 60, 40],
     },
     TITLE_MIN_PX: 10,              // Schrumpf‑Untergrenze
+    BATCH_DELAY: 400,              // ms: Moves sammeln → EIN /booking/batch
   };
 
   /* ── Utility‑Funktionen ─────────────────────────────────────────── */
@@ -24,6 +25,16 @@
       .toISOString()
       .slice(0, 10);
 
+  /* FullCalendar‑Event → {start_date, end_date} (Ende inklusiv) */
+  const span = (ev) => {
+    const endInc = ev.end ? new Date(ev.end) : new Date(ev.start);
+    if (ev.end) endInc.setDate(endInc.getDate() - 1);
+    return { start_date: iso(ev.start), end_date: iso(endInc) };
+  };
+
+  /* Optimistic Locking: gespeicherte Version als If‑Match (→ 412) */
+  const ifMatch = (version) => (version ? { 'If-Match': `"${version}"` } : {});
+
   const csrf = () =>
     document.querySelector('meta[name="csrf-token"]')?.content ?? '';
 
@@ -125,6 +136,48 @@
 
     calendar.render();
 
+    /* ── Live‑Updates (Server‑Sent Events, sonst Polling) ────────── */
+    const ME = Number(calEl.dataset.userId);
+    let live = false;
+
+    function applyPush(msg) {
+      const existing = calendar.getEventById(String(msg.id));
+      if (msg.op === 'deleted') return existing?.remove();
+      if (!msg.event) return calendar.refetchEvents();   // Core‑Write ohne Payload
+      const canEdit = msg.event.user_id === ME;
+      existing?.remove();
+      calendar.addEvent(
+        {
+          ...msg.event,
+          editable: canEdit,
+          extendedProps: {
+            canEdit,
+            companions: msg.event.companions,
+            version: msg.event.version,
+          },
+        },
+        calendar.getEventSources()[0]          // Refetch ersetzt statt dupliziert
+      );
+    }
+
+    if ('EventSource' in window && calEl.dataset.stream) {
+      const es = new EventSource(calEl.dataset.stream);
+      es.addEventListener('hello', () => (live = true));
+      es.addEventListener('booking', (ev) => applyPush(JSON.parse(ev.data)));
+      es.addEventListener('stale', () => {       // anderer Worker / Import
+        live = true;
+        calendar.refetchEvents();                // ETag → meist 304
+      });
+      es.onerror = () => (live = false);         // reconnect – oder CLOSED (204)
+    }
+
+    /* Ohne Stream (Sync‑Worker, Limit erreicht, 204): ETag‑Polling */
+    const POLL_MS = 30000;
+    setInterval(() => live || document.hidden || calendar.refetchEvents(), POLL_MS);
+
+    /* Nach eigenen Writes: Push abwarten, sonst Fenster neu laden */
+    const afterWrite = () => live || calendar.refetchEvents();
+
     /* ── Modal & Formular ────────────────────────────────────────── */
     const modalEl = document.getElementById('bookingModal');
     const bsModal = modalEl
@@ -139,6 +192,7 @@
       openModal({
         id: e.id,
         canEdit: e.extendedProps.canEdit,
+        version: e.extendedProps.version,
         start: iso(e.start),
         end: iso(endInc),
         companions: e.extendedProps.companions ?? '',
@@ -149,6 +203,7 @@
     function openModal(data) {
       if (!form || !bsModal) return;
       form.dataset.id = data.id ?? '';
+      form.dataset.version = data.version ?? '';
       form.start_date.value = data.start;
       form.end_date.value = data.end;
       if (form.companions) form.companions.value = data.companions;
@@ -162,90 +217,123 @@
     }
 
     /* -------- Submit ------------ */
+    /* Überschneidung prüft der Server IM Write → 409, dann ggf. mit force */
+    async function save(id, fd) {
+      return id
+        ? fetch(`/booking/update/${id}`, {
+            method: 'PATCH',
+            headers: {
+              'Content-Type': 'application/json',
+              'X-CSRFToken': csrf(),
+              ...ifMatch(form.dataset.version),
+            },
+            body: JSON.stringify(Object.fromEntries(fd)),
+          })
+        : fetch('/booking/new', {
+            method: 'POST',
+            headers: { Accept: 'application/json' },
+            body: fd,
+          });
+    }
+
     form?.addEventListener('submit', async (evt) => {
       evt.preventDefault();
       const fd = new FormData(form);
       const id = form.dataset.id;
-      const chk = await fetchJSON(
-        '/booking/check-overlap?' +
-          new URLSearchParams({
-            start_date: fd.get('start_date'),
-            end_date: fd.get('end_date'),
-            exclude_id: id || '',
-          })
-      );
-      if (chk.overlap && !confirm('Überschneidung – trotzdem speichern?'))
-        return;
-      if (chk.overlap) fd.append('force', '1');
-
-      if (id) {
-        const res = await fetch(`/booking/update/${id}`, {
-          method: 'PATCH',
-          headers: {
-            'Content-Type': 'application/json',
-            'X-CSRFToken': csrf(),
-          },
-          body: JSON.stringify(Object.fromEntries(fd)),
-        });
-        if (!res.ok) return alert(`Fehler ${res.status}`);
-      } else {
-        await fetch('/booking/new', { method: 'POST', body: fd });
+      let res = await save(id, fd);
+      if (res.status === 409) {
+        if (!confirm('Überschneidung – trotzdem speichern?')) return;
+        fd.append('force', '1');
+        res = await save(id, fd);
       }
+      if (res.status === 412) return staleEdit();
+      if (!res.ok) return alert(`Fehler ${res.status}`);
       vibe(CONF.HAPTIC.SUCCESS);
-      location.reload();
+      bsModal?.hide();
+      afterWrite();
     });
 
+    /* Jemand anderes (anderer Tab) hat inzwischen geändert */
+    function staleEdit() {
+      alert('Inzwischen geändert – bitte erneut bearbeiten.');
+      bsModal?.hide();
+      calendar.refetchEvents();
+    }
+
     /* -------- Delete ------------ */
     delBtn?.addEventListener('click', async () => {
       const id = form?.dataset.id;
       if (!id || !confirm('Eintrag endgültig löschen?')) return;
-      await fetch(`/booking/delete/${id}`, {
+      const res = await fetch(`/booking/delete/${id}`, {
         method: 'DELETE',
-        headers: { 'X-CSRFToken': csrf() },
+        headers: { 'X-CSRFToken': csrf(), ...ifMatch(form.dataset.version) },
       });
+      if (res.status === 412) return staleEdit();
       vibe(CONF.HAPTIC.DELETE);
-      location.reload();
+      bsModal?.hide();
+      afterWrite();
     });
 
-    /* -------- Move / Resize Handler ---- */
-    async function handleMoveResize(info) {
+    /* -------- Move / Resize (gebündelt) ---- */
+    const pending = new Map();                 // id → erstes info (revert → Ursprung)
+    let flushTimer = null;
+
+    function handleMoveResize(info) {
       if (!info.event.extendedProps.canEdit) return info.revert();
-      const endInc = info.event.end
-        ? new Date(info.event.end)
-        : new Date(info.event.start);
-      if (info.event.end) endInc.setDate(endInc.getDate() - 1);
-      const body = {
-        start_date: iso(info.event.start),
-        end_date: iso(endInc),
-      };
-
-      const chk = await fetchJSON(
-        '/booking/check-overlap?' +
-          new URLSearchParams({ ...body, exclude_id: info.event.id })
-      );
-      if (chk.overlap && !confirm('Kollision – trotzdem übernehmen?'))
-        return info.revert();
-      if (chk.overlap) body.force = 1;
-
-      const res = await fetch(`/booking/update/${info.event.id}`, {
-        method: 'PATCH',
-        headers: {
-          'Content-Type': 'application/json',
-          'X-CSRFToken': csrf(),
-        },
-        body: JSON.stringify(body),
+      if (!pending.has(info.event.id)) pending.set(info.event.id, info);
+      clearTimeout(flushTimer);
+      flushTimer = setTimeout(flushMoves, CONF.BATCH_DELAY);
+    }
+
+    async function flushMoves(force = false, batch = null) {
+      clearTimeout(flushTimer);
+      if (!batch) {
+        batch = [...pending.values()];
+        pending.clear();
+      }
+      if (!batch.length) return;
+      const ops = batch.map((info) => ({
+        op: 'update',
+        id: Number(info.event.id),
+        version: info.event.extendedProps.version,
+        ...span(info.event),                   // aktuelle (letzte) Position
+      }));
+      const res = await postBatch(ops, force);
+      if (!res) return batch.forEach((info) => info.revert());
+
+      const conflicts = [];
+      let stale = false;
+      res.results.forEach((r, k) => {
+        if (r.status === 409) conflicts.push(batch[k]);
+        else if (r.status >= 300) {
+          batch[k].revert();
+          stale ||= r.status === 412;
+        } else batch[k].event.setExtendedProp('version', r.version);
       });
-      if (!res.ok) return info.revert();
-      vibe(CONF.HAPTIC.TAP);
+      if (stale) calendar.refetchEvents();     // veraltete Versionen nachladen
+      if (!conflicts.length) return vibe(CONF.HAPTIC.TAP);
+      if (!force && confirm(`Kollision (${conflicts.length}) – trotzdem übernehmen?`))
+        return flushMoves(true, conflicts);
+      conflicts.forEach((info) => info.revert());
     }
 
-    /* -------- Helper ------------ */
-    async function fetchJSON(url, init = {}) {
+    /* Tab schließt mit offenen Moves → noch senden (keepalive) */
+    addEventListener('pagehide', () => pending.size && flushMoves());
+
+    async function postBatch(ops, force = false) {
       try {
-        const r = await fetch(url, init);
-        return await r.json();
+        const r = await fetch('/booking/batch', {
+          method: 'POST',
+          keepalive: true,
+          headers: {
+            'Content-Type': 'application/json',
+            'X-CSRFToken': csrf(),
+          },
+          body: JSON.stringify({ ops, force }),
+        });
+        return r.ok ? await r.json() : null;
       } catch {
-        return {};
+        return null;
       }
     }
 
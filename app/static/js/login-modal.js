@@ -1,6 +1,7 @@
 /* ============================================================
-   login-modal.js – Muestra el modal de login al cargar la página
+   login-modal.js – Muestra el modal de login al cargar la página
    Cumple CSP: se carga desde 'self' y lleva nonce en la etiqueta
+   Autocompletado: /auth/users?q=<prefijo> → top de coincidencias
    ============================================================ */
 document.addEventListener('DOMContentLoaded', () => {
   const modalEl = document.getElementById('loginModal');
@@ -8,4 +9,43 @@ document.addEventListener('DOMContentLoaded', () => {
     new bootstrap.Modal(modalEl, { backdrop: 'static', keyboard: false })
       .show();                                     // abre justo al cargar
   }
+
+  /* ---------- Autocompletado ---------------------------------- */
+  const input = document.querySelector('#loginForm [data-search]');
+  const list  = document.getElementById('loginMatches');
+  if (!input || !list) return;
+
+  let timer = null;
+  let inflight = null;
+
+  const render = users => {
+    list.replaceChildren(...(users.length ? users.map(u => {
+      const btn = document.createElement('button');
+      btn.type = 'submit';
+      btn.name = 'user';
+      btn.value = u.id;
+      btn.className = 'list-group-item list-group-item-action';
+      btn.textContent = u.name;                    // sin innerHTML (XSS)
+      return btn;
+    }) : [Object.assign(document.createElement('div'), {
+      className: 'list-group-item text-muted', textContent: 'Sin resultados'
+    })]));
+  };
+
+  const lookup = async () => {
+    inflight?.abort();                             // respuesta vieja descartada
+    inflight = new AbortController();
+    const url = `${input.dataset.search}?q=${encodeURIComponent(input.value)}`;
+    try {
+      const res = await fetch(url, { signal: inflight.signal });
+      if (res.ok) render(await res.json());
+    } catch (err) {
+      if (err.name !== 'AbortError') console.warn(err);
+    }
+  };
+
+  input.addEventListener('input', () => {
+    clearTimeout(timer);
+    timer = setTimeout(lookup, 150);               // debounce
+  });
 });
@@ -0,0 +1,86 @@
+"""
+app/templating.py  –  Jinja: Bytecode-Cache auf Platte + ``{% cache %}``-Fragmente
+────────────────────────────────────────────────────────────────────────────
+• ``FileSystemBytecodeCache``: kompilierte Templates liegen als Dateien auf
+  der lokalen Platte (von allen Workern des Hosts geteilt) → ein neuer
+  Worker / Neustart lädt Bytecode statt zu kompilieren.  Schlüssel =
+  Template-Name + Quell-Checksumme, veraltete Einträge entstehen also nie.
+  Bytecode wird ungeprüft ausgeführt – das Verzeichnis darf nur uns
+  gehören: ohne ``JINJA_BYTECODE_CACHE_DIR`` nimmt Jinja sein eigenes
+  ``$TMPDIR/_jinja2-cache-<uid>`` (0700, Besitzer geprüft); ein gesetztes
+  Verzeichnis wird mit 0700 angelegt und bei fremdem Besitzer oder
+  Gruppen-/Welt-Rechten abgelehnt.
+• ``{% cache "name"[, weitere Werte …] %} … {% endcache %}`` rendert den
+  Block einmal und legt das HTML im ``tiered``-Cache ab (Worker-LRU vor
+  Redis).  Der Schlüssel enthält immer
+      User · Locale · Tag (Countdown!) · Booking-/User-Marker · Template-Hash
+  plus die optionalen Werte.  Ein Buchungs-Write oder eine Namensänderung
+  bumpt den Marker, eine Template-Änderung den Hash → nie veraltet.
+  Nicht in Fragmente gehören: CSRF-Token, CSP-Nonces, Cookie-Abhängiges.
+
+    {% cache "navbar" %}{{ current_user.name }} …{% endcache %}
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+from datetime import date
+from pathlib import Path
+
+from flask import Flask
+from jinja2 import FileSystemBytecodeCache, nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+
+from app.paths import private_dir
+from app.tiered_cache import tiered
+
+log = logging.getLogger(__name__)
+
+FRAGMENT_SCOPES = ("bookings", "users")
+
+
+def _source_hash(filename: str | None) -> str:
+    try:
+        return hashlib.sha1(Path(filename).read_bytes()).hexdigest()[:12] if filename else ""
+    except OSError:
+        return ""
+
+
+class FragmentCacheExtension(Extension):
+    """``{% cache "name", … %}`` – HTML-Fragment im ``tiered``-Cache."""
+
+    tags = {"cache"}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        parts = [parser.parse_expression()]
+        while parser.stream.skip_if("comma"):
+            parts.append(parser.parse_expression())
+        body = parser.parse_statements(("name:endcache",), drop_needle=True)
+        # Template-Version in den Schlüssel: Quelle geändert → neuer Hash
+        origin = nodes.Const(f"{parser.name}:{lineno}:{_source_hash(parser.filename)}")
+        return nodes.CallBlock(
+            self.call_method("_render", [origin, nodes.List(parts)]), [], [], body,
+        ).set_lineno(lineno)
+
+    def _render(self, origin: str, parts: list, caller) -> Markup:
+        from flask_babel import get_locale
+        from flask_login import current_user
+
+        user = current_user.get_id() if current_user.is_authenticated else "-"
+        key = ":".join(["fragment", origin, user, str(get_locale()),
+                        date.today().isoformat(), *map(str, parts)])
+        return tiered.get_or_set(key, lambda: Markup(caller()), scopes=FRAGMENT_SCOPES)
+
+
+def init_templating(app: Flask) -> None:
+    """Bytecode-Cache (``JINJA_BYTECODE_CACHE_DIR``) und ``{% cache %}`` registrieren."""
+    directory = app.config.get("JINJA_BYTECODE_CACHE_DIR")
+    if directory != "":                              # "" → aus, None → Jinja-Default
+        try:
+            app.jinja_env.bytecode_cache = FileSystemBytecodeCache(
+                private_dir(directory) if directory else None)
+        except OSError:
+            log.warning("Jinja-Bytecode-Cache nicht nutzbar: %s", directory, exc_info=True)
+    app.jinja_env.add_extension(FragmentCacheExtension)
@@ -0,0 +1,139 @@
+"""
+app/tiered_cache.py  –  Zwei-Ebenen-Cache: Worker-LRU vor dem geteilten ``cache``
+────────────────────────────────────────────────────────────────────────────
+• Ebene 1: begrenzter LRU im Prozess (kein Netzwerk, kein Pickle).
+• Ebene 2: ``app.extensions.cache`` (SimpleCache in Dev, Redis in Prod).
+• Schlüssel enthalten die Versions-Marker der betroffenen Bereiche
+  (``app.changes.markers()``) – ein Schreibpfad bumpt den Marker, alle
+  Worker bilden ab dem nächsten Request neue Schlüssel; alte Einträge
+  verdrängt der LRU bzw. die TTL.  Mehr als EINE Versionsprüfung (pro
+  Request) liegt zwischen Write und frischem Read also nie.
+• Werte werden geteilt zurückgegeben → Aufrufer dürfen sie nicht mutieren.
+
+    payload = tiered.get_or_set("api:events:…", build, scopes=("bookings", "users"))
+    payload = await tiered.get_or_set_async(…)     # ASGI-Pfad, ``build`` async
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Iterable
+
+from app.aio import run_sync
+from app.changes import markers
+from app.extensions import cache
+
+log = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class TieredCache:
+    """Per-Worker-LRU (``maxsize`` Einträge) vor dem geteilten Cache-Backend."""
+
+    def __init__(self, maxsize: int = 256, timeout: int = 300):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self._local: OrderedDict[str, Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits_local = self.hits_shared = self.misses = 0
+
+    # ── Ebene 1 ──────────────────────────────────────────────
+    def _local_get(self, key: str) -> Any:
+        with self._lock:
+            value = self._local.get(key, _MISSING)
+            if value is not _MISSING:
+                self._local.move_to_end(key)
+                self.hits_local += 1
+            return value
+
+    def _local_set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._local[key] = value
+            self._local.move_to_end(key)
+            while len(self._local) > self.maxsize:
+                self._local.popitem(last=False)
+
+    # ── Ebene 2 ──────────────────────────────────────────────
+    def _lookup(self, key: str, scopes: Iterable[str]) -> tuple[str | None, Any]:
+        """``(voller Schlüssel, Wert | _MISSING)`` – Schlüssel ``None`` ohne Marker."""
+        current = markers()
+        if current is None:
+            return None, _MISSING
+        full = f"familia:tiered:{key}@" + ".".join(str(current[s]) for s in scopes)
+
+        value = self._local_get(full)
+        if value is not _MISSING:
+            return full, value
+
+        try:
+            value = cache.get(full)
+        except Exception:                                # noqa: BLE001
+            log.warning("Shared-Cache nicht lesbar", exc_info=True)
+            value = None
+        if value is None:
+            self.misses += 1
+            return full, _MISSING
+        self.hits_shared += 1
+        self._local_set(full, value)
+        return full, value
+
+    def _store(self, full: str, value: Any, timeout: int | None) -> None:
+        try:
+            cache.set(full, value, timeout=timeout or self.timeout)
+        except Exception:                                # noqa: BLE001
+            log.warning("Shared-Cache nicht schreibbar", exc_info=True)
+        self._local_set(full, value)
+
+    # ── API ──────────────────────────────────────────────────
+    def get_or_set(self, key: str, compute: Callable[[], Any], *,
+                   scopes: Iterable[str] = ("bookings",),
+                   timeout: int | None = None) -> Any:
+        """
+        Wert für ``key`` in der aktuellen Version von ``scopes`` – aus dem
+        LRU, sonst aus dem geteilten Cache, sonst ``compute()`` (und in beide
+        Ebenen schreiben).  Ohne Marker (Backend weg) wird nur berechnet.
+        """
+        full, value = self._lookup(key, scopes)
+        if value is _MISSING:
+            value = compute()
+            if full is not None:
+                self._store(full, value, timeout)
+        return value
+
+    async def get_or_set_async(self, key: str, compute: Callable[[], Awaitable[Any]], *,
+                               scopes: Iterable[str] = ("bookings",),
+                               timeout: int | None = None) -> Any:
+        """
+        ``get_or_set`` für den ASGI-Pfad: ``compute`` ist eine Coroutine-
+        Funktion, Backend-Zugriffe (Redis) laufen im Thread (``run_sync``).
+        """
+        full, value = await run_sync(self._lookup, key, tuple(scopes))
+        if value is _MISSING:
+            value = await compute()
+            if full is not None:
+                await run_sync(self._store, full, value, timeout)
+        return value
+
+    def clear_local(self) -> None:
+        with self._lock:
+            self._local.clear()
+
+    def stats(self) -> dict:
+        """Trefferquoten DIESES Workers (→ /ping/cache, mit ``PING_STATS``)."""
+        with self._lock:
+            size = len(self._local)
+        total = self.hits_local + self.hits_shared + self.misses
+        return {
+            "size": size,
+            "maxsize": self.maxsize,
+            "hits_local": self.hits_local,
+            "hits_shared": self.hits_shared,
+            "misses": self.misses,
+            "hit_ratio": round((self.hits_local + self.hits_shared) / total, 3) if total else 0.0,
+        }
+
+
+tiered = TieredCache(maxsize=int(os.getenv("LOCAL_CACHE_SIZE", "256")))
@@ -0,0 +1,97 @@
+"""
+app/warmup.py  –  Worker-Warm-up: der erste Request so schnell wie jeder weitere
+────────────────────────────────────────────────────────────────────────────
+Ohne Warm-up zahlt der erste Request nach Dyno-Neustart bzw. Worker-Recycling:
+  • Connect + Auth zur Remote-MySQL (je Pool-Verbindung),
+  • die Jinja-Kompilierung von ``base.html`` und der Seiten-Templates,
+  • Babel: CLDR-Daten und Kataloge je Sprache.
+
+``warm_up(app)`` erledigt das vorab.  Unter Gunicorn (``gunicorn.conf.py``):
+  • Master (``preload_app``): Templates + Babel EINMAL – die Worker erben sie
+    per Copy-on-Write,
+  • ``post_fork``: ``reset_after_fork()`` verwirft den geerbten Pool, danach
+    öffnet ``warm_up(app, connections=n)`` eigene Verbindungen; Templates und
+    Babel sind dann Cache-Treffer.
+
+Fehler sind nie fatal – ein Worker ohne Warm-up ist nur langsamer.
+"""
+from __future__ import annotations
+
+import logging
+import time
+
+from flask import Flask
+
+from app.models import db
+
+log = logging.getLogger(__name__)
+
+WARM_TEMPLATES = (
+    "base.html",
+    "booking/booking_modal.html",         # Include von base.html
+    "booking/calendar.html",
+    "auth/login.html",
+)
+LANGUAGES = ("de", "es", "en")            # wie der Babel-Locale-Selector
+
+
+def reset_after_fork(app: Flask) -> None:
+    """Geerbte Pools verwerfen (Sockets gehören dem Elternprozess, nicht schließen)."""
+    with app.app_context():
+        db.engine.dispose(close=False)
+    if (engine := app.extensions.get("familia.async_engine")) is not None:
+        engine.sync_engine.dispose(close=False)
+
+
+def _open_connections(app: Flask, count: int) -> int:
+    """``count`` Verbindungen gleichzeitig öffnen → bleiben danach im Pool."""
+    opened = []
+    with app.app_context():
+        try:
+            for _ in range(count):
+                conn = db.engine.connect()
+                opened.append(conn)
+                conn.exec_driver_sql("SELECT 1")
+        finally:
+            for conn in opened:
+                conn.close()                                # zurück in den Pool
+    return len(opened)
+
+
+def _compile_templates(app: Flask) -> int:
+    for name in WARM_TEMPLATES:
+        app.jinja_env.get_template(name)                    # Jinja-Cache des Prozesses
+    return len(WARM_TEMPLATES)
+
+
+def _load_babel(app: Flask) -> int:
+    from flask_babel import force_locale, get_locale, get_translations
+
+    with app.test_request_context():
+        for lang in LANGUAGES:
+            with force_locale(lang):
+                get_translations()
+                get_locale().display_name                   # lädt die CLDR-Daten
+    return len(LANGUAGES)
+
+
+def warm_up(app: Flask, *, connections: int = 0) -> dict:
+    """
+    Templates kompilieren, Babel laden und ``connections`` Pool-Verbindungen
+    öffnen.  Gibt die Schritte mit Dauer zurück (auch im Log).
+    """
+    report: dict = {}
+    steps = [("templates", _compile_templates), ("locales", _load_babel)]
+    if connections:
+        steps.insert(0, ("connections", lambda a: _open_connections(a, connections)))
+
+    t0 = time.perf_counter()
+    for name, step in steps:
+        try:
+            report[name] = step(app)
+        except Exception:                                   # noqa: BLE001
+            log.warning("Warm-up %s fehlgeschlagen", name, exc_info=True)
+            report[name] = 0
+    report["ms"] = round((time.perf_counter() - t0) * 1000, 1)
+    log.info("warm-up %s", report)
+    return report
@@ -0,0 +1,19 @@
+#!/usr/bin/env python
+"""
+asgi.py  –  ASGI-Einstiegspunkt neben ``run.py:app``
+
+✓ Gleiche App (``run.py`` lädt .flaskenv/.env, Logging, ``create_app()``).
+✓ ``api.events``, ``booking.events`` und ``check_overlap`` laufen als
+  Coroutinen auf der Async-Engine (aiomysql / lokal aiosqlite) → ein
+  Prozess hält hunderte gleichzeitige Feed-Polls, ohne Worker nachzulegen.
+✓ Alle übrigen Routen laufen unverändert über ``WsgiToAsgi`` (Details:
+  ``app/aio.py``).
+
+    uvicorn asgi:app --host 0.0.0.0 --port $PORT
+    gunicorn asgi:app -k uvicorn.workers.UvicornWorker
+"""
+
+from app.aio import FeedASGI
+from run import app as flask_app
+
+app = FeedASGI(flask_app)
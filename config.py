@@ -2,7 +2,12 @@
 Centralised Flask configuration for the Beach-House booking app.
 
 • Imports `get_database_uri()` from db_config.py so Dev/Prod both
-  resolve the correct SQLAlchemy URL.
+  resolve the correct SQLAlchemy URL – lazily: the URL is a property and
+  is only resolved for the config create_app() actually instantiates
+  (an incomplete prod env no longer breaks dev/CLI imports).
+• Engine/pool options (`SQLALCHEMY_ENGINE_OPTIONS`) come from the DB_POOL_*
+  environment via `get_engine_options()`; the async read path (asgi.py)
+  uses the same database through `ASYNC_DATABASE_URI`.
 • Loads `.env` before anything else, keeping Heroku and local identical.
 • Offers a simple `config_map` so create_app() can pick the right config.
 """
@@ -10,7 +15,12 @@ Centralised Flask configuration for the Beach-House booking app.
 from pathlib import Path
 from dotenv import load_dotenv
 import os
-from db_config import get_database_uri
+from db_config import (
+    get_async_database_uri,
+    get_async_engine_options,
+    get_database_uri,
+    get_engine_options,
+)
 
 BASE_DIR = Path(__file__).resolve().parent
 load_dotenv(BASE_DIR / ".env", override=False)
@@ -31,13 +41,57 @@ class BaseConfig:
 
     JSON_SORT_KEYS: bool = False
 
+    # Compression (Flask-Compress, see app/compression.py)
+    COMPRESS_ALGORITHM: list = ["br", "zstd", "gzip"]   # server preference
+    COMPRESS_BR_LEVEL: int = 5
+    COMPRESS_MIN_SIZE: int = 500
+    COMPRESS_STREAMS: bool = False                      # SSE must not be buffered
+
+    # Asset bundles (Flask-Assets, see app/assets.py)
+    ASSETS_AUTO_BUILD: bool = False                     # built once at startup
+    ASSETS_VERSIONS: str = "hash"                       # gen/site.<hash>.css
+    ASSETS_MANIFEST: str = "file"
+    ASSETS_URL_EXPIRE: bool = False                     # hash in name, no ?query
+    ASSETS_CACHE: bool = False
+
+    # Templates (see app/templating.py): compiled bytecode on local disk in a
+    # private (0700, owner-checked) dir; unset = Jinja's per-user temp dir, "" = off
+    JINJA_BYTECODE_CACHE_DIR: str | None = os.getenv("JINJA_BYTECODE_CACHE_DIR")
+
+    # Live calendar (see app/booking/push.py): concurrent SSE streams per worker,
+    # each one pins a thread; 0 = calendars poll (gunicorn.conf.py sets it for gthread)
+    SSE_MAX_STREAMS: int = int(os.getenv("SSE_MAX_STREAMS", "0"))
+
+    # Diagnostics: /ping/pool + /ping/cache expose worker internals – off unless enabled
+    PING_STATS: bool = os.getenv("PING_STATS", "").strip().lower() in {"1", "true", "yes", "on"}
+
+    # Database (resolved on access, see module docstring)
+    _sqlite_fallback: bool = True
+
+    @property
+    def SQLALCHEMY_DATABASE_URI(self) -> str:
+        return get_database_uri(allow_sqlite_fallback=self._sqlite_fallback)
+
+    @property
+    def SQLALCHEMY_ENGINE_OPTIONS(self) -> dict:
+        return get_engine_options(self.SQLALCHEMY_DATABASE_URI)
+
+    @property
+    def ASYNC_DATABASE_URI(self) -> str:
+        return get_async_database_uri(self.SQLALCHEMY_DATABASE_URI)
+
+    @property
+    def ASYNC_ENGINE_OPTIONS(self) -> dict:
+        return get_async_engine_options(self.ASYNC_DATABASE_URI)
+
 
 class DevConfig(BaseConfig):
     """Local development + tests."""
     ENV: str = "development"
     DEBUG: bool = True
     SQLALCHEMY_ECHO: bool = False
-    SQLALCHEMY_DATABASE_URI: str = get_database_uri(allow_sqlite_fallback=True)
+    ASSETS_AUTO_BUILD: bool = True                      # rebuild on source change
+    PING_STATS: bool = True
 
 
 class ProdConfig(BaseConfig):
@@ -45,7 +99,7 @@ class ProdConfig(BaseConfig):
     ENV: str = "production"
     DEBUG: bool = False
     TESTING: bool = False
-    SQLALCHEMY_DATABASE_URI: str = get_database_uri(allow_sqlite_fallback=False)
+    _sqlite_fallback: bool = False
 
     # Secure cookies over HTTPS on Heroku
     SESSION_COOKIE_SECURE: bool = True
@@ -53,7 +107,7 @@ class ProdConfig(BaseConfig):
     PREFERRED_URL_SCHEME: str = "https"
 
 
-# Mapping used by create_app()
+# Mapping used by create_app() (instantiated there → properties resolve)
 config_map = {
     "development": DevConfig,
     "production": ProdConfig,
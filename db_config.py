@@ -18,16 +18,27 @@ Beispiel Verwendung (config.py):
     from db_config import get_database_uri
     SQLALCHEMY_DATABASE_URI = get_database_uri()
 
-Optional – Pool-Größe:
+Pool-Einstellungen:
 SQLAlchemy-Pooling wird **nicht** über die URL, sondern über
-``SQLALCHEMY_ENGINE_OPTIONS`` gesetzt.  Wenn du `DB_POOL_SIZE`
-definieren willst, kannst du sie dort weiterreichen.
+``SQLALCHEMY_ENGINE_OPTIONS`` gesetzt – ``get_engine_options()`` baut sie
+aus der Umgebung (DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_RECYCLE,
+DB_POOL_TIMEOUT, DB_POOL_PRE_PING, DB_CONNECT_TIMEOUT, DB_READ_TIMEOUT,
+DB_WRITE_TIMEOUT).
+``TimedQueuePool`` misst zusätzlich Checkouts & Wartezeiten (→ /ping/pool, mit ``PING_STATS``).
+
+Async-Lesepfad (``asgi.py``): ``get_async_database_uri()`` tauscht nur den
+Treiber (aiomysql / aiosqlite), ``get_async_engine_options()`` liest
+DB_ASYNC_POOL_SIZE / DB_ASYNC_MAX_OVERFLOW, sonst dieselben Werte.
 """
 
 from pathlib import Path
 import os
+import threading
+import time
 from urllib.parse import quote_plus, urlparse, uses_netloc
 from dotenv import load_dotenv
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool
 
 # ─────────────────────────────────────────────────────────────
 #  Dotenv laden (erst .flaskenv, dann .env → Overrides möglich)
@@ -36,7 +47,7 @@ load_dotenv(BASE_DIR / ".flaskenv", override=False)
 load_dotenv(BASE_DIR / ".env",       override=False)
 
 #  urllib kennt unser mysql-Schema
-uses_netloc.extend(["mysql", "mysql+pymysql"])
+uses_netloc.extend(["mysql", "mysql+pymysql", "mysql+aiomysql"])
 
 
 # ─────────────────────────────────────────────────────────────
@@ -71,7 +82,7 @@ def get_database_uri(*, allow_sqlite_fallback: bool = True) -> str:
     Liefert eine SQLAlchemy-kompatible Verbindungs-URL.
 
     Reihenfolge:
-      1.  $DATABASE_URL             (direkter Override)
+      1.  $DATABASE_URL             (direkter Override, auch sqlite:///…)
       2.  Einzelne DB_* Variablen   (selbst zusammengesetzt)
       3.  sqlite:///dev.db          (nur wenn erlaubt)
 
@@ -87,6 +98,8 @@ def get_database_uri(*, allow_sqlite_fallback: bool = True) -> str:
         parsed = urlparse(raw)
         if parsed.scheme and parsed.netloc:
             return raw
+        if parsed.scheme.startswith("sqlite"):          # sqlite:///pfad.db (Tests, Benchmarks)
+            return raw
 
     # 2. Aus Einzelwerten bauen
     assembled = _build_from_parts()
@@ -98,3 +111,166 @@ def get_database_uri(*, allow_sqlite_fallback: bool = True) -> str:
         return f"sqlite:///{BASE_DIR / 'dev.db'}"
 
     raise RuntimeError("No database configuration found in environment.")
+
+
+# ─────────────────────────────────────────────────────────────
+#  Engine-/Pool-Optionen
+# ─────────────────────────────────────────────────────────────
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    return int(raw) if raw not in (None, "") else default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    raw = os.getenv(name)
+    if raw in (None, ""):
+        return default
+    return raw.strip().lower() in {"1", "true", "yes", "on"}
+
+
+class TimedQueuePool(QueuePool):
+    """
+    ``QueuePool`` mit Kennzahlen pro Worker-Prozess: Checkouts, Wartezeit
+    auf eine freie Verbindung (ohne Connect-Zeit), Timeouts, Neuverbindungen.
+
+    Verbindungen zählen die Pool-Events ``connect`` / ``invalidate`` /
+    ``soft_invalidate`` – damit auch Reconnects nach gescheitertem Pre-Ping
+    oder ``pool_recycle``, die SQLAlchemy am Pool vorbei im Connection-Record
+    aufbaut.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self._local      = threading.local()
+        self.checkouts   = 0
+        self.timeouts    = 0
+        self.connects    = 0
+        self.invalidated = 0
+        self.soft_invalidated = 0
+        self.wait_total  = 0.0
+        self.wait_max    = 0.0
+        self.connect_total = 0.0
+        event.listen(self, "connect", self._on_connect)
+        event.listen(self, "invalidate", self._on_invalidate)
+        event.listen(self, "soft_invalidate", self._on_soft_invalidate)
+
+    def _on_connect(self, dbapi_connection, record):
+        started = getattr(record, "starttime", None)       # gesetzt direkt vor dem Connect
+        dt = max(time.time() - started, 0.0) if started else 0.0
+        self._local.connect = getattr(self._local, "connect", 0.0) + dt
+        with self._stats_lock:
+            self.connects += 1
+            self.connect_total += dt
+
+    def _on_invalidate(self, dbapi_connection, record, exception):
+        with self._stats_lock:
+            self.invalidated += 1
+
+    def _on_soft_invalidate(self, dbapi_connection, record, exception):
+        with self._stats_lock:
+            self.soft_invalidated += 1
+
+    def _do_get(self):
+        self._local.connect = 0.0
+        t0 = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            wait = max(time.perf_counter() - t0 - self._local.connect, 0.0)
+            with self._stats_lock:
+                self.checkouts += 1
+                self.wait_total += wait
+                self.wait_max = max(self.wait_max, wait)
+
+    def stats(self) -> dict:
+        """Momentaufnahme für Monitoring / Pool-Sizing."""
+        with self._stats_lock:
+            return {
+                "size": self.size(),
+                "max_overflow": self._max_overflow,
+                "checked_out": self.checkedout(),
+                "checked_in": self.checkedin(),
+                "overflow": max(self.overflow(), 0),
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "connects": self.connects,
+                "invalidated": self.invalidated,
+                "soft_invalidated": self.soft_invalidated,
+                "wait_ms_total": round(self.wait_total * 1000, 3),
+                "wait_ms_avg": round(self.wait_total * 1000 / self.checkouts, 3)
+                if self.checkouts else 0.0,
+                "wait_ms_max": round(self.wait_max * 1000, 3),
+                "connect_ms_total": round(self.connect_total * 1000, 3),
+            }
+
+
+def get_engine_options(uri: str) -> dict:
+    """
+    ``SQLALCHEMY_ENGINE_OPTIONS`` passend zur URL.
+
+    MySQL: Pool-Größe/Overflow/Timeout aus ENV, ``pool_recycle`` unter dem
+    Server-``wait_timeout`` (Remote-MySQL kappt Idle-Verbindungen) und
+    ``pool_pre_ping``.  SQLite in-memory behält die Flask-SQLAlchemy-Defaults.
+    """
+    scheme = urlparse(uri).scheme
+    if scheme.startswith("sqlite") and (":memory:" in uri or uri.rstrip("/") == "sqlite:"):
+        return {}
+
+    options: dict = {
+        "poolclass":     TimedQueuePool,
+        "pool_size":     _env_int("DB_POOL_SIZE", 5),
+        "max_overflow":  _env_int("DB_MAX_OVERFLOW", 10),
+        "pool_timeout":  _env_int("DB_POOL_TIMEOUT", 10),
+        "pool_recycle":  _env_int("DB_POOL_RECYCLE", 280),
+        "pool_pre_ping": _env_bool("DB_POOL_PRE_PING", True),
+    }
+    if scheme.startswith("mysql"):
+        options["connect_args"] = {
+            "connect_timeout": _env_int("DB_CONNECT_TIMEOUT", 5),
+            "read_timeout":    _env_int("DB_READ_TIMEOUT", 30),
+            "write_timeout":   _env_int("DB_WRITE_TIMEOUT", 30),
+        }
+    return options
+
+
+# ─────────────────────────────────────────────────────────────
+#  Async-Engine (ASGI-Lesepfad, app/aio.py)
+# ─────────────────────────────────────────────────────────────
+_ASYNC_DRIVERS = {
+    "mysql":         "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "sqlite":        "sqlite+aiosqlite",
+}
+
+
+def get_async_database_uri(uri: str) -> str:
+    """Gleiche Datenbank, asynchroner Treiber (``mysql+aiomysql`` / ``sqlite+aiosqlite``)."""
+    scheme, sep, rest = uri.partition("://")
+    return f"{_ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+
+def get_async_engine_options(uri: str) -> dict:
+    """
+    Optionen für ``create_async_engine``.  Wartende Requests blockieren hier
+    keinen Thread – der Pool darf kleiner sein als die Zahl gleichzeitiger
+    Polls (die meisten enden ohnehin im Cache oder als 304).
+    """
+    scheme = urlparse(uri).scheme
+    if scheme.startswith("sqlite") and (":memory:" in uri or uri.rstrip("/") == "sqlite:"):
+        return {}
+
+    options: dict = {
+        "pool_size":     _env_int("DB_ASYNC_POOL_SIZE", 10),
+        "max_overflow":  _env_int("DB_ASYNC_MAX_OVERFLOW", 10),
+        "pool_timeout":  _env_int("DB_POOL_TIMEOUT", 10),
+        "pool_recycle":  _env_int("DB_POOL_RECYCLE", 280),
+        "pool_pre_ping": _env_bool("DB_POOL_PRE_PING", True),
+    }
+    if scheme.startswith("mysql"):
+        options["connect_args"] = {"connect_timeout": _env_int("DB_CONNECT_TIMEOUT", 5)}
+    return options
@@ -0,0 +1,66 @@
+"""
+gunicorn.conf.py  –  Gunicorn für Heroku-Dynos (``Procfile``)
+────────────────────────────────────────────────────────────────────────────
+✓ ``preload_app``: die App wird EINMAL im Master gebaut (Imports, Bundles,
+  Templates, Babel) – die Worker erben sie per Copy-on-Write, statt sie
+  jeder für sich aufzubauen.  ``gc.freeze()`` hält die geerbten Objekte
+  aus dem Garbage-Collector (sonst kopiert jeder GC-Lauf die Seiten).
+✓ ``post_fork``: geerbten DB-Pool verwerfen, eigene Verbindungen öffnen
+  (``app/warmup.py``) → der erste Request zahlt keinen Connect.
+✓ ``max_requests`` + Jitter: Worker werden gestaffelt recycelt (Speicher-
+  Drift), nie alle gleichzeitig.
+✓ ``gthread`` (Default 4 Threads): ein langsamer Request oder SSE-Stream
+  blockiert nur einen Thread, nicht den Worker.  Höchstens die Hälfte der
+  Threads darf Streams halten (``SSE_MAX_STREAMS``), Streams enden vor dem
+  ``timeout``.  Uvicorn-Worker (``asgi:app``) bleiben beim Polling.
+
+ENV:  WEB_CONCURRENCY (setzt Heroku je Dyno-Größe), GUNICORN_THREADS,
+      GUNICORN_WORKER_CLASS, SSE_MAX_STREAMS,
+      GUNICORN_MAX_REQUESTS, GUNICORN_MAX_REQUESTS_JITTER,
+      GUNICORN_APP=asgi:app  → Async-Feeds (Uvicorn-Worker, ``asgi.py``)
+"""
+
+import gc
+import os
+
+wsgi_app = os.getenv("GUNICORN_APP", "run:app")
+bind     = f"0.0.0.0:{os.getenv('PORT', '7878')}"
+
+workers  = int(os.getenv("WEB_CONCURRENCY", "2"))
+threads  = int(os.getenv("GUNICORN_THREADS", "4"))
+worker_class = os.getenv("GUNICORN_WORKER_CLASS") or (
+    "uvicorn.workers.UvicornWorker" if wsgi_app.startswith("asgi:") else "gthread"
+)
+threaded = worker_class in ("gthread", "sync") and threads > 1   # sync + threads → gthread
+
+preload_app = True
+
+max_requests        = int(os.getenv("GUNICORN_MAX_REQUESTS", "1000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "100"))
+
+timeout = 30                                # = Heroku-Router-Timeout, > push.MAX_SECONDS
+
+
+# ─────────────────────────────────────────────────────────────
+#  Hooks
+# ─────────────────────────────────────────────────────────────
+def when_ready(server):
+    """Master, nach dem Preload: Templates + Babel einmal für alle Worker."""
+    from app.warmup import warm_up
+    from run import app
+
+    warm_up(app)
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    """Worker: eigener Pool (Verbindungen je Thread), SSE-Limit, Rest ist geerbt."""
+    from app.booking.push import MAX_SECONDS
+    from app.warmup import reset_after_fork, warm_up
+    from run import app
+
+    streams = int(os.getenv("SSE_MAX_STREAMS", threads // 2))
+    app.config["SSE_MAX_STREAMS"] = streams if threaded and MAX_SECONDS < timeout else 0
+
+    reset_after_fork(app)
+    warm_up(app, connections=threads if threaded else 1)
@@ -0,0 +1,297 @@
+#!/usr/bin/env python
+"""
+utils/bench_endpoints.py  –  Endpoint-Benchmarks mit geseedeter SQLite-DB
+────────────────────────────────────────────────────────────────────────────
+• Bootet ``create_app()`` gegen eine lokale SQLite-Datei (DATABASE_URL),
+  seedet konfigurierbare Mengen (User / Buchungen) per Bulk-Insert.
+• Misst pro Endpoint: Latenz-Perzentile (p50/p90/p99), SQL-Queries pro
+  Request und Peak-Speicher (tracemalloc, separater Durchlauf).
+• Nach dem ersten Request sind die Feeds Cache-Treffer (Marker-Caches,
+  0 Queries).  ``--cold`` misst jedes Szenario zusätzlich kalt: vor jedem
+  Request werden alle Änderungsmarker gebumpt und der Worker-LRU geleert
+  (wie nach einem fremden Write) – Ergebnis getrennt als ``<name>:cold``.
+• Speichert das Ergebnis als JSON; ``--compare alt.json`` zeigt die
+  Differenz und endet mit Exit-Code 1 bei Regressionen > ``--threshold``.
+
+Aufruf:
+    python utils/bench_endpoints.py --users 100 --bookings 100000 --out bench.json
+    python utils/bench_endpoints.py --bookings 100000 --reuse --compare bench.json
+    python utils/bench_endpoints.py --reuse --cold --endpoints events_window api_events_all
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.append(str(BASE_DIR))
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)-8s | %(message)s",
+    datefmt="%Y-%m-%dT%H:%M:%S",
+)
+log = logging.getLogger("bench")
+
+HTTPS = {"base_url": "https://localhost"}     # Talisman erzwingt HTTPS
+EPOCH = date(2015, 1, 1)
+
+
+# ─── Seeding ───────────────────────────────────────────────────────
+def _seed(db, n_users: int, n_bookings: int, years: int, rnd: random.Random) -> None:
+    from sqlalchemy import insert
+    from app.models import Booking, Family, User
+
+    db.drop_all()
+    db.create_all()
+    now = datetime.utcnow()
+    families = ["Lahiguera", "Tonev", "Habegger"]
+    db.session.execute(insert(Family), [{"name": n, "created_at": now} for n in families])
+    db.session.execute(insert(User), [
+        {
+            "username": f"user{i}", "password_hash": "!",
+            "first_name": f"Vorname{i}", "last_name": f"Nachname{i}",
+            "color": f"#{rnd.randrange(0x1000000):06X}",
+            "family_id": i % len(families) + 1, "created_at": now,
+        }
+        for i in range(1, n_users + 1)
+    ])
+
+    span = years * 365
+    chunk = 10_000
+    for lo in range(0, n_bookings, chunk):
+        rows = []
+        for _ in range(min(chunk, n_bookings - lo)):
+            start = EPOCH + timedelta(days=rnd.randrange(span))
+            nights = rnd.randint(1, 14)
+            rows.append({
+                "user_id": rnd.randint(1, n_users),
+                "start_date": start,
+                "end_date": start + timedelta(days=nights - 1),
+                "companions": rnd.choice([None, "Max", "Julia, Tom"]),
+                "nights": nights,
+                "created_at": now,
+            })
+        db.session.execute(insert(Booking), rows)
+    db.session.commit()
+
+
+# ─── Messung ───────────────────────────────────────────────────────
+class _QueryCounter:
+    def __init__(self, engine):
+        from sqlalchemy import event
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._hit)
+
+    def _hit(self, *_):
+        self.count += 1
+
+
+def _percentile(sorted_ms: list[float], pct: float) -> float:
+    idx = min(len(sorted_ms) - 1, max(0, round(pct / 100 * len(sorted_ms)) - 1))
+    return round(sorted_ms[idx], 3)
+
+
+def _cold(app) -> Callable[[], None]:
+    """Vor jedem Request: alle Marker bumpen + Worker-LRU leeren (ohne SQL)."""
+    from app.changes import MARKER_KEYS, touch
+    from app.tiered_cache import tiered
+
+    def prepare() -> None:
+        with app.app_context():
+            for scope in MARKER_KEYS:
+                touch(scope)
+        tiered.clear_local()
+    return prepare
+
+
+def _run(call: Callable, n: int, counter: _QueryCounter, mem_runs: int,
+         prepare: Callable[[], None] = lambda: None) -> dict:
+    call()                                             # Warm-up (Templates, Index)
+    lat: list[float] = []
+    statuses: dict[int, int] = {}
+    q0 = counter.count
+    for _ in range(n):
+        prepare()                                      # nicht gemessen
+        t = time.perf_counter()
+        resp = call()
+        lat.append((time.perf_counter() - t) * 1000)
+        statuses[resp.status_code] = statuses.get(resp.status_code, 0) + 1
+    queries = (counter.count - q0) / n
+
+    tracemalloc.start()
+    for _ in range(mem_runs):
+        prepare()
+        call()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    lat.sort()
+    return {
+        "requests": n,
+        "status": statuses,
+        "p50_ms": _percentile(lat, 50),
+        "p90_ms": _percentile(lat, 90),
+        "p99_ms": _percentile(lat, 99),
+        "mean_ms": round(statistics.fmean(lat), 3),
+        "max_ms": round(lat[-1], 3),
+        "queries_per_req": round(queries, 2),
+        "peak_mem_kb": round(peak / 1024, 1),
+    }
+
+
+def _scenarios(client, rnd: random.Random, years: int, last_day: date) -> dict[str, Callable]:
+    span = years * 365
+    mid = EPOCH + timedelta(days=span // 2)
+    win_start, win_end = mid, mid + timedelta(days=42)     # ~ Monatsansicht
+    free_day = [last_day + timedelta(days=2)]               # hinter allen Daten (auch bei --reuse)
+
+    def check_overlap():
+        s = EPOCH + timedelta(days=rnd.randrange(span))
+        return client.get("/booking/check-overlap", query_string={
+            "start_date": s.isoformat(),
+            "end_date": (s + timedelta(days=7)).isoformat(),
+        }, **HTTPS)
+
+    def new_booking():
+        s = free_day[0]
+        free_day[0] = s + timedelta(days=3)
+        return client.post("/booking/new", data={
+            "start_date": s.isoformat(),
+            "end_date": (s + timedelta(days=1)).isoformat(),
+            "companions": "",
+        }, **HTTPS)
+
+    return {
+        "events_window": lambda: client.get("/events", query_string={
+            "start": win_start.isoformat(), "end": win_end.isoformat()}, **HTTPS),
+        "api_events_range": lambda: client.get("/api/events", query_string={
+            "from": win_start.isoformat(), "to": win_end.isoformat()}, **HTTPS),
+        "api_events_all": lambda: client.get("/api/events", **HTTPS),
+        "check_overlap": check_overlap,
+        "booking_new": new_booking,
+    }
+
+
+# ─── Vergleich ─────────────────────────────────────────────────────
+def compare(old: dict, new: dict, threshold: float) -> bool:
+    """Druckt die Differenz; True, wenn eine Regression > threshold % vorliegt."""
+    regressed = False
+    print(f"\n{'Endpoint':<22} {'Metrik':<16} {'alt':>10} {'neu':>10} {'Δ %':>8}")
+    for name, res in new["results"].items():
+        base = old.get("results", {}).get(name)
+        if not base:
+            continue
+        for metric in ("p50_ms", "p90_ms", "queries_per_req", "peak_mem_kb"):
+            a, b = base[metric], res[metric]
+            delta = ((b - a) / a * 100) if a else (0.0 if b == a else float("inf"))
+            flag = ""
+            if delta > threshold and (b - a) > 0.05:
+                flag, regressed = "  ✗", True
+            print(f"{name:<22} {metric:<16} {a:>10} {b:>10} {delta:>7.1f}%{flag}")
+    return regressed
+
+
+# ─── Main ──────────────────────────────────────────────────────────
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmarks für Feed-/Booking-Endpoints.")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--bookings", type=int, default=10_000)
+    parser.add_argument("--years", type=int, default=10, help="Zeitraum der Seed-Buchungen.")
+    parser.add_argument("--requests", type=int, default=200, help="Requests pro Endpoint.")
+    parser.add_argument("--mem-runs", type=int, default=5, help="Requests im tracemalloc-Lauf.")
+    parser.add_argument("--endpoints", nargs="*", help="Nur diese Szenarien.")
+    parser.add_argument("--db", type=Path, default=Path(tempfile.gettempdir()) / "familia-bench.db")
+    parser.add_argument("--reuse", action="store_true", help="Vorhandene Seed-DB weiterverwenden.")
+    parser.add_argument("--cold", action="store_true",
+                        help="Zusätzlich ohne Cache-Treffer messen (<name>:cold).")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", type=Path, help="Ergebnis als JSON speichern.")
+    parser.add_argument("--compare", type=Path, help="Mit früherem JSON-Ergebnis vergleichen.")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Regressions-Schwelle in %%.")
+    args = parser.parse_args()
+
+    os.environ["FLASK_ENV"] = "development"
+    os.environ["DATABASE_URL"] = f"sqlite:///{args.db}"
+    os.environ.setdefault("RATELIMIT_STORAGE_URL", "memory://")
+    logging.getLogger("app").setLevel(logging.WARNING)
+
+    from sqlalchemy import func, select
+    from app import create_app
+    from app.extensions import limiter
+    from app.models import Booking, db
+
+    app = create_app()
+    app.config.update(WTF_CSRF_ENABLED=False, TESTING=True)
+    limiter.enabled = False                    # Config-Flag greift erst bei init_app
+    rnd = random.Random(args.seed)
+    params = {"users": args.users, "bookings": args.bookings,
+              "years": args.years, "seed": args.seed}
+
+    meta_file = args.db.with_suffix(".meta.json")
+    with app.app_context():
+        reuse = (args.reuse and args.db.exists() and meta_file.exists()
+                 and json.loads(meta_file.read_text()) == params)
+        if not reuse:
+            t = time.perf_counter()
+            _seed(db, args.users, args.bookings, args.years, rnd)
+            meta_file.write_text(json.dumps(params))
+            log.info("✓ Seed: %d User, %d Buchungen in %.1f s",
+                     args.users, args.bookings, time.perf_counter() - t)
+        else:
+            log.info("✓ Seed-DB wiederverwendet (%s)", args.db)
+        last_day = db.session.scalar(select(func.max(Booking.end_date))) or EPOCH
+        counter = _QueryCounter(db.engine)
+
+    client = app.test_client()
+    client.get("/auth/login?as=1", **HTTPS)
+    modes = {"": lambda: None, **({":cold": _cold(app)} if args.cold else {})}
+    results = {}
+    for name, call in _scenarios(client, rnd, args.years, last_day).items():
+        if args.endpoints and name not in args.endpoints:
+            continue
+        for suffix, prepare in modes.items():
+            r = results[name + suffix] = _run(call, args.requests, counter, args.mem_runs,
+                                              prepare)
+            log.info("%-22s p50 %8.2f ms  p99 %8.2f ms  %5.1f q/req  %8.1f KiB",
+                     name + suffix, r["p50_ms"], r["p99_ms"], r["queries_per_req"],
+                     r["peak_mem_kb"])
+
+    try:
+        rev = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR,
+                             capture_output=True, text=True, check=False).stdout.strip()
+    except OSError:
+        rev = ""
+    report = {
+        "meta": {**params, "requests": args.requests, "cold": args.cold, "git": rev,
+                 "python": platform.python_version(),
+                 "time": datetime.utcnow().isoformat(timespec="seconds")},
+        "results": results,
+    }
+    if args.out:
+        args.out.write_text(json.dumps(report, indent=2))
+        log.info("→ %s", args.out)
+    if args.compare:
+        old = json.loads(args.compare.read_text())
+        if old.get("meta", {}).get("bookings") != args.bookings:
+            log.warning("Vergleich mit anderem Datenvolumen (%s vs %s Buchungen)",
+                        old.get("meta", {}).get("bookings"), args.bookings)
+        if compare(old, report, args.threshold):
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
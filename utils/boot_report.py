@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+"""
+utils/boot_report.py  –  Import-/Boot-Report der App-Factory
+────────────────────────────────────────────────────────────────────────────
+• Startet pro Modus einen frischen Interpreter mit ``-X importtime``
+  (kein warmer Modul-Cache) und misst:
+    – Import-Zeit von ``app`` und Laufzeit von ``create_app()``
+    – Peak-RSS des Prozesses
+    – Top-Pakete nach eigener Import-Zeit (Summe aller Submodule)
+• Modi:  full  (Web-Worker)  ·  minimal  (CLI/Skripte, nur DB + Cache)
+Aufruf:
+    python utils/boot_report.py [--top 15] [--json report.json]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+
+_CHILD = r"""
+import json, os, resource, sys, time
+sys.path.insert(0, {base!r})
+t0 = time.perf_counter()
+from app import create_app
+t1 = time.perf_counter()
+create_app(minimal={minimal})
+t2 = time.perf_counter()
+print("BOOT-REPORT " + json.dumps({{
+    "import_ms": round((t1 - t0) * 1000, 1),
+    "create_app_ms": round((t2 - t1) * 1000, 1),
+    "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    "modules": len(sys.modules),
+}}))
+"""
+
+
+def _parse_importtime(stderr: str) -> dict[str, int]:
+    """Eigene Import-Zeit (µs, ``self``) summiert je Top-Level-Paket."""
+    per_pkg: dict[str, int] = defaultdict(int)
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        per_pkg[name.strip().split(".")[0]] += int(self_us)
+    return dict(per_pkg)
+
+
+def measure(minimal: bool) -> dict:
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "0"}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c",
+         _CHILD.format(base=str(BASE_DIR), minimal=minimal)],
+        capture_output=True, text=True, env=env, cwd=BASE_DIR, check=False,
+    )
+    line = next((l for l in proc.stdout.splitlines() if l.startswith("BOOT-REPORT ")), None)
+    if proc.returncode or line is None:
+        raise SystemExit(f"Boot fehlgeschlagen (minimal={minimal}):\n{proc.stderr[-2000:]}")
+    report = json.loads(line.split(" ", 1)[1])
+    report["imports_us"] = _parse_importtime(proc.stderr)
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import-/Boot-Report für create_app().")
+    parser.add_argument("--top", type=int, default=15, help="Anzahl Pakete im Report.")
+    parser.add_argument("--json", type=Path, help="Ergebnis zusätzlich als JSON speichern.")
+    args = parser.parse_args()
+
+    results = {mode: measure(mode == "minimal") for mode in ("full", "minimal")}
+
+    for mode, rep in results.items():
+        print(f"\n── {mode} ─────────────────────────────────────────────")
+        print(f"  import app      {rep['import_ms']:8.1f} ms")
+        print(f"  create_app()    {rep['create_app_ms']:8.1f} ms")
+        print(f"  peak RSS        {rep['peak_rss_mb']:8.1f} MB")
+        print(f"  Module geladen  {rep['modules']:8d}")
+        print("  Top-Importe (Summe self-Zeit je Paket):")
+        top = sorted(rep["imports_us"].items(), key=lambda kv: kv[1], reverse=True)
+        for name, us in top[: args.top]:
+            print(f"    {us / 1000:8.1f} ms  {name}")
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+        print(f"\n→ {args.json}")
+
+
+if __name__ == "__main__":
+    main()
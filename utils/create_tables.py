@@ -4,11 +4,19 @@ utils/create_tables.py –  Datenbank-Bootstrap ohne Alembic
 ────────────────────────────────────────────────────────────────────────────
 • Legt alle Tabellen an (db.create_all()).
 • Rüstet fehlende Spalten in 'users' UND 'bookings' nach (username, password_hash,
-  companions, nights, FK family_id …).
+  companions, nights, version, FK family_id …).
 • Füllt nights rückwirkend für bestehende Buchungen (= end_date - start_date + 1).
+• Korrigiert bei JEDEM Lauf abweichende bookings.nights (Altbestand mit
+  Default 1) und baut stay_stats (Nächte pro User & Jahr) neu auf, wenn
+  dabei etwas korrigiert wurde oder die Tabelle leer ist.
+• Legt den Sync-Zähler für booking_changes (/api/events?since=) an.
 • Seedet drei Families (Lahiguera, Tonev, Habegger).
 Dieses Skript ist idempotent – erneutes Ausführen prüft zuerst,
 ob Änderungen überhaupt noch nötig sind.
+
+Deploy:  python utils/create_tables.py  nach jedem Release (Heroku:
+``release``-Phase).  Stats danach verdächtig (z. B. nach manuellen
+SQL-Eingriffen)?  →  flask bookings rebuild-stats
 """
 from __future__ import annotations
 
@@ -34,10 +42,10 @@ log = logging.getLogger("create_tables")
 # ─── App-Import NACH ENV & Logger ─────────────────────────────────────────
 sys.path.append(str(BASE_DIR))
 from app import create_app               # noqa: E402
-from app.models import db, Family        # noqa: E402
+from app.models import db, Family, StayStat, SyncCounter   # noqa: E402
 
 FAMILY_NAMES = ["Lahiguera", "Tonev", "Habegger"]
-app = create_app()
+app = create_app(minimal=True)
 
 # ──────────────────────────────────────────────────────────────────────────
 # Hilfsfunktionen für Migrations-Snippets
@@ -112,6 +120,18 @@ def _ensure_nights_column(inspector) -> None:
     log.info("✓ bookings.nights angelegt & rückwirkend befüllt.")
 
 
+def _ensure_version_column(inspector) -> None:
+    cols = {c["name"] for c in inspector.get_columns("bookings")}
+    if "version" in cols:
+        return
+    db.session.execute(text(
+        "ALTER TABLE bookings "
+        "ADD COLUMN version INT NOT NULL DEFAULT 1 AFTER created_at;"
+    ))
+    db.session.commit()
+    log.info("✓ bookings.version angelegt (Optimistic Locking, If-Match).")
+
+
 # ──────────────────────────────────────────────────────────────────────────
 # Haupt-Bootstrap
 # ──────────────────────────────────────────────────────────────────────────
@@ -164,8 +184,25 @@ with app.app_context():
     else:
         log.info("✓ bookings.companions bereits vorhanden.")
 
-    # nights-Spalte sicherstellen
+    # nights- & version-Spalte sicherstellen
     _ensure_nights_column(insp)
+    _ensure_version_column(insp)
+
+    # bookings.nights reparieren (idempotent), stay_stats bei Bedarf neu
+    from app.booking.stats import rebuild, repair_nights
+    fixed = repair_nights(db.session.connection())
+    if fixed or not db.session.scalar(db.select(StayStat.user_id).limit(1)):
+        log.info("✓ %d× bookings.nights korrigiert, stay_stats aufgebaut (%s).",
+                 fixed, rebuild())
+    else:
+        db.session.commit()
+        log.info("✓ bookings.nights & stay_stats aktuell.")
+
+    # Sync-Zähler für das Änderungs-Log (booking_changes) anlegen
+    if not db.session.get(SyncCounter, "bookings"):
+        db.session.add(SyncCounter(name="bookings", value=0))
+        db.session.commit()
+        log.info("✓ sync_counters initialisiert.")
 
     # Families seeden
     new_fams = [
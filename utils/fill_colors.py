@@ -31,6 +31,8 @@ load_dotenv(BASE_DIR / ".env",       override=False)
 sys.path.append(str(BASE_DIR))
 from app import create_app          # pylint: disable=wrong-import-position
 from app.models import db, User     # pylint: disable=wrong-import-position
+from app.auth.identity import invalidate_identity  # pylint: disable=wrong-import-position
+from app.changes import touch_users                # pylint: disable=wrong-import-position
 
 # ─── Logging ────────────────────────────────────────────────────────
 logging.basicConfig(
@@ -69,7 +71,7 @@ def _users_needing_color(session: Session) -> list[User]:
 
 # ─── Main ──────────────────────────────────────────────────────────
 def main(*, dry_run: bool = False) -> None:
-    app = create_app()
+    app = create_app(minimal=True)
     with app.app_context():
         session: Session = db.session
 
@@ -92,6 +94,8 @@ def main(*, dry_run: bool = False) -> None:
 
         session.bulk_update_mappings(User, updates)
         session.commit()
+        invalidate_identity(*(u["id"] for u in updates))   # Bulk → keine Mapper-Events
+        touch_users()                                        # Roster / Feeds neu bauen
         log.info("✓ %d Farben erfolgreich vergeben.", len(updates))
 
 
@@ -86,7 +86,7 @@ sys.path.append(str(BASE_DIR))
 from app import create_app                      # noqa: E402
 from app.models import db, User, Family         # noqa: E402
 
-app = create_app()
+app = create_app(minimal=True)
 new, skipped, no_family = 0, 0, 0
 
 with app.app_context():